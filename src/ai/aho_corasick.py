@@ -0,0 +1,72 @@
+"""
+Автомат Ахо-Корасик для поиска всех вхождений набора шаблонов за один проход по тексту.
+Работает с любыми последовательностями хешируемых элементов: строками (символы)
+или кортежами (например, токены слов).
+"""
+
+from collections import deque
+from typing import Dict, Hashable, Iterator, List, Sequence, Tuple
+
+
+class AhoCorasick:
+    def __init__(self, patterns: Sequence[Sequence[Hashable]]):
+        """
+        Args:
+            patterns: шаблоны; в результатах поиска шаблон обозначается своим индексом
+        """
+        self.patterns = list(patterns)
+        self._lengths = [len(pattern) for pattern in self.patterns]
+        self._goto: List[Dict[Hashable, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for index, pattern in enumerate(self.patterns):
+            if len(pattern) == 0:
+                continue
+            state = 0
+            for symbol in pattern:
+                next_state = self._goto[state].get(symbol)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][symbol] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(index)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        """Строит суффиксные ссылки обходом в ширину"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for symbol, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and symbol not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(symbol, 0)
+                if self._fail[next_state] == next_state:
+                    self._fail[next_state] = 0
+                # Шаблоны, оканчивающиеся в суффиксе, тоже найдены в этом состоянии
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: Sequence[Hashable]) -> Iterator[Tuple[int, int, int]]:
+        """Возвращает все вхождения в виде (индекс шаблона, начало, конец)"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        lengths = self._lengths
+
+        state = 0
+        for position, symbol in enumerate(text):
+            while state and symbol not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(symbol, 0)
+            for index in output[state]:
+                yield index, position + 1 - lengths[index], position + 1
+
+    def __len__(self) -> int:
+        return len(self.patterns)
@@ -0,0 +1,97 @@
+"""
+Векторизованное сопоставление навыков для больших блоков описаний.
+Блок описаний превращается в разреженную матрицу "документ x n-грамма основ",
+которая умножается на заранее построенную матрицу "n-грамма x навык" -
+совпадения для всего блока находятся одним матричным произведением.
+Семантика совпадений та же, что у морфологического режима SimpleSkillExtractor.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from morphology import tokenize
+from skill_catalog import SKILL_KINDS, SkillCatalog
+
+
+class BatchSkillMatcher:
+    def __init__(self, catalog: SkillCatalog, limit: int = 10):
+        """
+        Args:
+            catalog: каталог навыков
+            limit: максимальное число навыков каждого типа в ответе
+        """
+        self.catalog = catalog
+        self.limit = limit
+
+        # Словарь n-грамм: форма навыка (кортеж основ) -> номер столбца
+        self.vocabulary: Dict[Tuple[str, ...], int] = {}
+        rows, cols = [], []
+        for skill_id, (_, skill) in enumerate(catalog.entries):
+            form = tuple(token.stem for token in tokenize(skill))
+            if not form:
+                continue
+            rows.append(self.vocabulary.setdefault(form, len(self.vocabulary)))
+            cols.append(skill_id)
+
+        # Разные навыки могут иметь одну форму ("работа в команде" / "работать в команде")
+        self.skill_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(self.vocabulary), len(catalog.entries))
+        )
+        self.ngram_lengths = sorted({len(form) for form in self.vocabulary})
+
+        # Столбцы результата, относящиеся к каждому типу навыков
+        self.kind_ranges: Dict[str, Tuple[int, int]] = {}
+        start = 0
+        for kind in SKILL_KINDS:
+            self.kind_ranges[kind] = (start, start + len(catalog.skills[kind]))
+            start += len(catalog.skills[kind])
+
+    def vectorize(self, descriptions: List[str]) -> sparse.csr_matrix:
+        """Разреженная матрица вхождений n-грамм словаря в описания"""
+        vocabulary = self.vocabulary
+        indptr = [0]
+        indices: List[int] = []
+
+        for description in descriptions:
+            stems = [token.stem for token in tokenize(description)]
+            for n in self.ngram_lengths:
+                for position in range(len(stems) - n + 1):
+                    column = vocabulary.get(tuple(stems[position:position + n]))
+                    if column is not None:
+                        indices.append(column)
+            indptr.append(len(indices))
+
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), indices, indptr),
+            shape=(len(descriptions), len(vocabulary))
+        )
+        # Повторы n-граммы в одном документе складываются в счетчик
+        matrix.sum_duplicates()
+        return matrix
+
+    def score(self, descriptions: List[str]) -> sparse.csr_matrix:
+        """Матрица "описание x навык": ненулевой элемент - навык найден в описании"""
+        return self.vectorize(descriptions) @ self.skill_matrix
+
+    def match_block(self, descriptions: List[str], skill_type: str = None) -> List[Dict[str, List[str]]]:
+        """Навыки для каждого описания блока в порядке каталога (как SimpleSkillExtractor.extract_skills)"""
+        hits = self.score(descriptions).tocsr()
+        hits.sort_indices()
+
+        results = []
+        for row in range(hits.shape[0]):
+            columns = hits.indices[hits.indptr[row]:hits.indptr[row + 1]]
+            result = {"soft": [], "hard": []}
+            for kind in SKILL_KINDS:
+                if skill_type is not None and skill_type != kind:
+                    continue
+                start, end = self.kind_ranges[kind]
+                skills = self.catalog.skills[kind]
+                found = columns[(columns >= start) & (columns < end)][:self.limit]
+                result[kind] = [skills[column - start] for column in found]
+            results.append(result)
+
+        return results
@@ -0,0 +1,111 @@
+"""
+Планировщик динамических микро-батчей для генерации навыков.
+Собирает параллельные запросы в течение короткого окна и отдает их модели одним батчем.
+Генерация выполняется в отдельном потоке, очередь ограничена по размеру.
+"""
+
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+
+class QueueFullError(Exception):
+    """Очередь запросов заполнена, клиенту стоит повторить позже"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Очередь запросов заполнена, повторите через {retry_after} с")
+        self.retry_after = retry_after
+
+
+class BatchItem(NamedTuple):
+    description: str
+    skill_type: Optional[str]
+    future: Future
+
+
+class BatchScheduler:
+    def __init__(
+        self,
+        process_batch: Callable[[List[Tuple[str, Optional[str]]]], List[Dict[str, List[str]]]],
+        window_ms: float = 20,
+        max_batch_size: int = 8,
+        max_queue_size: int = 64
+    ):
+        self.process_batch = process_batch
+        self.window_ms = window_ms
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_queue_size = max_queue_size
+        self.batches_processed = 0
+        self.items_processed = 0
+        self.items_rejected = 0
+        self.avg_batch_seconds = 0.0
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = threading.Thread(target=self._run, name="qwen-batch-scheduler", daemon=True)
+        self._thread.start()
+
+    def submit(self, description: str, skill_type: str = None) -> Future:
+        """Ставит запрос в очередь и возвращает Future с результатом"""
+        future = Future()
+        try:
+            self._queue.put_nowait(BatchItem(description, skill_type, future))
+        except queue.Full:
+            self.items_rejected += 1
+            raise QueueFullError(self.retry_after())
+        return future
+
+    def retry_after(self) -> int:
+        """Оценка времени (в секундах), за которое очередь успеет разгрузиться"""
+        pending_batches = math.ceil(self.queue_size() / self.max_batch_size)
+        return max(1, math.ceil(pending_batches * self.avg_batch_seconds))
+
+    def queue_size(self) -> int:
+        """Количество запросов, ожидающих обработки"""
+        return self._queue.qsize()
+
+    def _collect_batch(self) -> List[BatchItem]:
+        """Ждет первый запрос и добирает остальные в пределах окна"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window_ms / 1000
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        """Основной цикл потока: собирает батчи и раздает результаты"""
+        while True:
+            batch = [item for item in self._collect_batch() if item.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            started = time.monotonic()
+            try:
+                results = self.process_batch([(item.description, item.skill_type) for item in batch])
+            except Exception as e:
+                print(f"Ошибка при обработке батча из {len(batch)} запросов: {e}")
+                for item in batch:
+                    item.future.set_exception(e)
+                continue
+
+            for item, result in zip(batch, results):
+                item.future.set_result(result)
+
+            # Скользящее среднее времени батча для оценки Retry-After
+            elapsed = time.monotonic() - started
+            if self.batches_processed == 0:
+                self.avg_batch_seconds = elapsed
+            else:
+                self.avg_batch_seconds = 0.8 * self.avg_batch_seconds + 0.2 * elapsed
+
+            self.batches_processed += 1
+            self.items_processed += len(batch)
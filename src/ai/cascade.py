@@ -0,0 +1,103 @@
+"""
+Каскадная маршрутизация запросов: сначала дешевый матчер по ключевым словам,
+LLM - только для типов навыков, где дешевый результат ненадежен.
+Ответ считается надежным, если число найденных навыков попадает в ожидаемый
+диапазон промта и описание достаточно покрыто найденными навыками.
+"""
+
+import threading
+from typing import Dict, List, NamedTuple, Tuple
+
+from keyword_extractor import SimpleSkillExtractor
+from skill_catalog import SKILL_KINDS
+
+
+class CascadeDecision(NamedTuple):
+    skills: Dict[str, List[str]]   # результат дешевого матчера для принятых типов навыков
+    escalate: List[str]            # типы навыков, которые нужно извлечь моделью
+    confidence: float
+
+
+class CascadeRouter:
+    def __init__(
+        self,
+        extractor: SimpleSkillExtractor,
+        skill_ranges: Dict[str, Tuple[int, int]],
+        min_confidence: float = 0.02
+    ):
+        """
+        Args:
+            extractor: дешевый матчер навыков
+            skill_ranges: ожидаемое число навыков каждого типа (min, max) включительно
+            min_confidence: минимальная доля символов описания, покрытая найденными навыками
+        """
+        self.extractor = extractor
+        self.skill_ranges = dict(skill_ranges)
+        self.min_confidence = min_confidence
+        self._lock = threading.Lock()
+        self.counters = {
+            "matcher": 0,             # ответ целиком от дешевого матчера
+            "partial": 0,             # часть типов навыков от матчера, часть от модели
+            "llm": 0,                 # ответ целиком от модели
+            "low_confidence": 0,      # эскалации из-за низкого покрытия описания
+            "out_of_range_soft": 0,   # эскалации софт-скиллов из-за числа навыков
+            "out_of_range_hard": 0    # эскалации хард-скиллов из-за числа навыков
+        }
+
+    def _confidence(self, description: str, matches: Dict[str, List[Tuple[int, int, int]]]) -> float:
+        """Доля символов описания (без пробелов и пунктуации), покрытая найденными навыками"""
+        spans = sorted((start, end) for kind in SKILL_KINDS for _, start, end in matches[kind])
+        covered = 0
+        position = 0
+        for start, end in spans:
+            start = max(start, position)
+            if end > start:
+                covered += sum(char.isalnum() for char in description[start:end])
+                position = end
+        letters = sum(char.isalnum() for char in description)
+        return covered / letters if letters else 0.0
+
+    def route(self, description: str, skill_type: str = None) -> CascadeDecision:
+        """Решает, какие типы навыков можно отдать от матчера, а какие - эскалировать"""
+        kinds = [kind for kind in SKILL_KINDS if skill_type is None or skill_type == kind]
+        matches = self.extractor.match_indexes(description, skill_type)
+        confidence = self._confidence(description, matches)
+
+        skills = {"soft": [], "hard": []}
+        escalate = []
+        with self._lock:
+            if confidence < self.min_confidence:
+                self.counters["low_confidence"] += 1
+                escalate = kinds
+            else:
+                for kind in kinds:
+                    # Навыки в порядке каталога, без повторов
+                    catalog_skills = self.extractor.catalog.skills[kind]
+                    found = [catalog_skills[index] for index in sorted({index for index, _, _ in matches[kind]})]
+                    low, high = self.skill_ranges[kind]
+                    if low <= len(found) <= high:
+                        skills[kind] = found
+                    else:
+                        self.counters[f"out_of_range_{kind}"] += 1
+                        escalate.append(kind)
+
+            if not escalate:
+                self.counters["matcher"] += 1
+            elif len(escalate) == len(kinds):
+                self.counters["llm"] += 1
+            else:
+                self.counters["partial"] += 1
+
+        return CascadeDecision(skills, escalate, confidence)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self.counters)
+        total = counters["matcher"] + counters["partial"] + counters["llm"]
+        return {
+            "min_confidence": self.min_confidence,
+            "skill_ranges": {kind: list(bounds) for kind, bounds in self.skill_ranges.items()},
+            "requests": total,
+            **counters,
+            "matcher_ratio": round(counters["matcher"] / total, 3) if total else 0.0
+        }
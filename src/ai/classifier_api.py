@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+API извлечения навыков дистиллированным классификатором (TF-IDF + линейная модель).
+Модель обучается скриптом src/bot/train_classifier.py на ответах Qwen.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import List
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+import uvicorn
+
+from skill_catalog import load_catalog
+from skill_classifier import MODEL_PATH, SkillClassifier
+
+CLASSIFIER_MODEL_PATH = Path(os.getenv("CLASSIFIER_MODEL_PATH", str(MODEL_PATH)))
+# Порог вероятности навыка; по умолчанию - подобранный при обучении
+CLASSIFIER_THRESHOLD = float(os.getenv("CLASSIFIER_THRESHOLD", "0")) or None
+# Сколько описаний bulk-запроса классифицируется за один вызов модели
+BULK_BLOCK_SIZE = int(os.getenv("CLASSIFIER_BULK_BLOCK_SIZE", "256"))
+
+
+# Pydantic модели
+class VacancyRequest(BaseModel):
+    body: str
+    skill: str = None  # 'hard', 'soft' или None для обоих
+
+
+class SkillsResponse(BaseModel):
+    soft: List[str]
+    hard: List[str]
+
+
+class BulkVacancyItem(BaseModel):
+    id: int
+    body: str
+    skill: str = None  # 'hard', 'soft' или None для обоих
+
+
+class ClassifierSkillExtractor:
+    def __init__(self, model_path: Path = CLASSIFIER_MODEL_PATH):
+        self.model_path = model_path
+        self.classifier = SkillClassifier.load(model_path)
+        print(f"✅ Классификатор загружен: {len(self.classifier.labels)} навыков, порог {self.classifier.threshold}")
+
+        catalog = load_catalog()
+        if catalog.version != self.classifier.catalog_version:
+            print("⚠️ Каталог навыков изменился после обучения - переобучите модель")
+
+    def extract_skills_batch(self, descriptions: List[str], skill_type: str = None) -> List[dict]:
+        return self.classifier.predict(descriptions, skill_type, threshold=CLASSIFIER_THRESHOLD)
+
+    def extract_skills(self, description: str, skill_type: str = None) -> dict:
+        return self.extract_skills_batch([description], skill_type)[0]
+
+
+# Инициализируем экстрактор
+skill_extractor = ClassifierSkillExtractor()
+
+# Создаем FastAPI приложение
+app = FastAPI(
+    title="Classifier Vacancy Skills Extractor API",
+    description="API для извлечения навыков классификатором, обученным на ответах Qwen. Поддерживает селективный поиск hard/soft навыков.",
+    version="1.0.0"
+)
+
+
+@app.get("/")
+async def root():
+    """Проверка работоспособности API"""
+    return {"message": "Classifier Vacancy Skills Extractor API работает"}
+
+
+@app.post("/api/vacancy", response_model=SkillsResponse)
+def extract_vacancy_skills(request: VacancyRequest):
+    """Извлекает навыки из описания вакансии"""
+    if not request.body.strip():
+        raise HTTPException(status_code=400, detail="Описание вакансии не может быть пустым")
+
+    # Валидация параметра skill
+    if request.skill and request.skill not in ["hard", "soft"]:
+        raise HTTPException(status_code=400, detail="Параметр skill должен быть 'hard', 'soft' или не указан")
+
+    try:
+        skills = skill_extractor.extract_skills(request.body, request.skill)
+
+        return SkillsResponse(
+            soft=skills.get("soft", []),
+            hard=skills.get("hard", [])
+        )
+
+    except Exception as e:
+        print(f"Ошибка при обработке вакансии: {e}")
+        raise HTTPException(status_code=500, detail=f"Ошибка обработки: {str(e)}")
+
+
+@app.post("/api/vacancies")
+def extract_vacancies_skills(items: List[BulkVacancyItem]):
+    """Извлекает навыки для списка вакансий, результаты отдаются потоком NDJSON"""
+    def stream_results():
+        for start in range(0, len(items), BULK_BLOCK_SIZE):
+            block = items[start:start + BULK_BLOCK_SIZE]
+            results = [None] * len(block)
+            valid = []
+            for position, item in enumerate(block):
+                if not item.body.strip():
+                    results[position] = {"id": item.id, "error": "Описание вакансии не может быть пустым"}
+                elif item.skill and item.skill not in ["hard", "soft"]:
+                    results[position] = {"id": item.id, "error": "Параметр skill должен быть 'hard', 'soft' или не указан"}
+                else:
+                    valid.append(position)
+
+            # Блок классифицируется одним вызовом модели; skill применяется к каждому ответу
+            try:
+                predictions = skill_extractor.extract_skills_batch([block[position].body for position in valid])
+            except Exception as e:
+                # Сбой блока не обрывает поток: его вакансии получают ошибку, следующие блоки обрабатываются
+                print(f"Ошибка при обработке блока вакансий: {e}")
+                predictions = None
+                for position in valid:
+                    results[position] = {"id": block[position].id, "error": f"Ошибка обработки: {str(e)}"}
+            for position, skills in zip(valid, predictions or []):
+                item = block[position]
+                results[position] = {
+                    "id": item.id,
+                    "soft": skills["soft"] if item.skill != "hard" else [],
+                    "hard": skills["hard"] if item.skill != "soft" else []
+                }
+
+            for result in results:
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@app.get("/health")
+async def health_check():
+    """Проверка состояния API"""
+    classifier = skill_extractor.classifier
+    return {
+        "status": "healthy",
+        "model_type": "distilled_classifier",
+        "model_path": str(skill_extractor.model_path),
+        "catalog_version": classifier.catalog_version,
+        "threshold": CLASSIFIER_THRESHOLD or classifier.threshold,
+        "labels_count": len(classifier.labels)
+    }
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Готовность к обработке запросов: классификатор загружен до запуска сервера"""
+    return {"status": "ready"}
+
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "classifier_api:app",
+        host="0.0.0.0",
+        port=6381,
+        reload=True
+    )
@@ -0,0 +1,190 @@
+"""
+Ограниченное декодирование ответа модели по каталогу навыков.
+Префиксное дерево токенов гарантирует, что модель выдаст валидный JSON
+вида {"soft": [...], "hard": [...]}, где каждый элемент - точное название из каталога.
+"""
+
+import json
+from typing import Dict, List, Optional
+
+import torch
+from transformers import LogitsProcessor
+
+
+class TrieNode:
+    __slots__ = ("children", "skill", "_allowed")
+
+    def __init__(self):
+        self.children: Dict[int, "TrieNode"] = {}
+        self.skill: Optional[str] = None
+        self._allowed: Optional[List[int]] = None
+
+    def allowed(self) -> List[int]:
+        """Токены, которыми можно продолжить путь из этого узла"""
+        if self._allowed is None:
+            self._allowed = list(self.children)
+        return self._allowed
+
+
+class SkillTrie:
+    def __init__(self, tokenizer, skills: List[str]):
+        self.root = TrieNode()
+        if not skills:
+            return
+
+        # Каждый элемент массива - JSON-строка вместе с кавычками
+        encoded = tokenizer([json.dumps(skill, ensure_ascii=False) for skill in skills], add_special_tokens=False).input_ids
+        for skill, token_ids in zip(skills, encoded):
+            node = self.root
+            for token_id in token_ids:
+                node = node.children.setdefault(token_id, TrieNode())
+            node.skill = skill
+
+
+class DecodingState:
+    __slots__ = ("list_index", "mode", "literal", "literal_pos", "after_literal", "node", "used")
+
+    def __init__(self):
+        self.list_index = 0
+        self.mode = "literal"
+        self.literal: List[int] = []
+        self.literal_pos = 0
+        self.after_literal = "list_start"
+        self.node: Optional[TrieNode] = None
+        self.used: List[str] = []
+
+
+class CatalogGrammar:
+    """Грамматика ответа: {"soft": [<навык>, ...], "hard": [<навык>, ...]}"""
+
+    def __init__(self, tokenizer, soft_skills: List[str], hard_skills: List[str], max_soft: int, max_hard: int):
+        def encode(text: str) -> List[int]:
+            return tokenizer(text, add_special_tokens=False).input_ids
+
+        self.eos_token_id = tokenizer.eos_token_id
+        self.open_ids = encode('{"soft": [')
+        self.separator_ids = encode(", ")
+        self.lists = [
+            (SkillTrie(tokenizer, soft_skills), max_soft if soft_skills else 0, encode('], "hard": [')),
+            (SkillTrie(tokenizer, hard_skills), max_hard if hard_skills else 0, encode("]}"))
+        ]
+
+    def initial_state(self) -> DecodingState:
+        state = DecodingState()
+        state.literal = self.open_ids
+        return state
+
+    def _start_literal(self, state: DecodingState, literal: List[int], after: str):
+        state.mode = "literal"
+        state.literal = literal
+        state.literal_pos = 0
+        state.after_literal = after
+
+    def _close_list(self, state: DecodingState):
+        _, _, close_ids = self.lists[state.list_index]
+        after = "list_start" if state.list_index + 1 < len(self.lists) else "eos"
+        self._start_literal(state, close_ids, after)
+        state.list_index += 1
+        state.used = []
+
+    def _item_finished(self, state: DecodingState) -> bool:
+        """Можно ли закончить текущий элемент (навык целиком и еще не встречался)"""
+        return state.node.skill is not None and state.node.skill not in state.used
+
+    def advance(self, state: DecodingState, token_id: int):
+        """Продвигает состояние на один сгенерированный токен"""
+        if state.mode == "eos":
+            return
+
+        if state.mode == "literal":
+            state.literal_pos += 1
+            if state.literal_pos >= len(state.literal):
+                state.mode = state.after_literal
+            return
+
+        trie, max_items, close_ids = self.lists[state.list_index]
+
+        if state.mode in ("list_start", "item_start"):
+            if token_id in trie.root.children:
+                state.mode = "item"
+                state.node = trie.root.children[token_id]
+            elif state.mode == "list_start" and close_ids and token_id == close_ids[0]:
+                self._close_list(state)
+                self._skip_first(state)
+            else:
+                state.mode = "eos"
+            return
+
+        # mode == "item"
+        if token_id in state.node.children:
+            state.node = state.node.children[token_id]
+            return
+
+        if state.node.skill is not None:
+            state.used.append(state.node.skill)
+
+        if token_id == self.separator_ids[0]:
+            self._start_literal(state, self.separator_ids, "item_start")
+            self._skip_first(state)
+        elif token_id == close_ids[0]:
+            self._close_list(state)
+            self._skip_first(state)
+        else:
+            state.mode = "eos"
+
+    def _skip_first(self, state: DecodingState):
+        """Учитывает уже сгенерированный первый токен литерала"""
+        self.advance(state, state.literal[0])
+
+    def allowed_tokens(self, state: DecodingState) -> List[int]:
+        """Список токенов, допустимых на следующем шаге"""
+        if state.mode == "eos":
+            return [self.eos_token_id]
+
+        if state.mode == "literal":
+            return [state.literal[state.literal_pos]]
+
+        trie, max_items, close_ids = self.lists[state.list_index]
+
+        if state.mode == "list_start":
+            allowed = [close_ids[0]]
+            if max_items > 0:
+                allowed = trie.root.allowed() + allowed
+            return allowed
+
+        if state.mode == "item_start":
+            return trie.root.allowed()
+
+        allowed = list(state.node.allowed())
+        if self._item_finished(state) or not allowed:
+            # Тупиковый повтор навыка тоже закрываем - дубликат уберет валидация
+            if len(state.used) + 1 < max_items:
+                allowed.append(self.separator_ids[0])
+            allowed.append(close_ids[0])
+        return allowed
+
+
+class CatalogJsonLogitsProcessor(LogitsProcessor):
+    """Маскирует логиты так, чтобы ответ соответствовал грамматике каталога"""
+
+    def __init__(self, grammars: List[CatalogGrammar], prompt_length: int):
+        """
+        Args:
+            grammars: грамматика для каждой строки батча (может быть общей)
+            prompt_length: длина промта с паддингом
+        """
+        self.grammars = grammars
+        self.consumed = prompt_length
+        self.states = [grammar.initial_state() for grammar in grammars]
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        new_tokens = input_ids[:, self.consumed:].tolist()
+        self.consumed = input_ids.shape[1]
+
+        mask = torch.full_like(scores, float("-inf"))
+        for row, (grammar, state) in enumerate(zip(self.grammars, self.states)):
+            for token_id in new_tokens[row]:
+                grammar.advance(state, token_id)
+            mask[row, grammar.allowed_tokens(state)] = 0
+
+        return scores + mask
@@ -0,0 +1,79 @@
+"""
+Извлечение навыков по ключевым словам каталога (без модели).
+Используется упрощенным API и как дешевая первая ступень каскада в qwen.py.
+"""
+
+import os
+from typing import List, Dict, Tuple
+
+from aho_corasick import AhoCorasick
+from morphology import MorphologyIndex, build_indexes, tokenize
+from skill_catalog import SKILL_KINDS, load_catalog
+
+# Режим сопоставления: "morph" - по основам слов, "substring" - по подстрокам
+MATCH_MODE = os.getenv("SIMPLE_MATCH_MODE", "morph")
+
+
+class SimpleSkillExtractor:
+    def __init__(self, match_mode: str = MATCH_MODE):
+        self.catalog = None
+        self.match_mode = match_mode
+        self.soft_skills = []
+        self.hard_skills = []
+        self.automata: Dict[str, AhoCorasick] = {}
+        self.morphology: Dict[str, MorphologyIndex] = {}
+        self._load_skills()
+        
+    def _load_skills(self):
+        """Загружает навыки из общего каталога и компилирует их в индексы поиска"""
+        self.catalog = load_catalog()
+        self.soft_skills = self.catalog.soft_skills
+        self.hard_skills = self.catalog.hard_skills
+        
+        if self.match_mode == "morph":
+            # Индекс основ слов: словоформы совпадают, совпадения только по границам слов
+            self.morphology = build_indexes(self.catalog.skills)
+        else:
+            # Один автомат на тип навыков: все совпадения находятся за один проход по тексту
+            for kind in SKILL_KINDS:
+                self.automata[kind] = AhoCorasick([skill.lower() for skill in self.catalog.skills[kind]])
+    
+    def match_indexes(self, description: str, skill_type: str = None) -> Dict[str, List[Tuple[int, int, int]]]:
+        """Вхождения навыков по типам: (индекс в каталоге, начало, конец)"""
+        # Описание нормализуется один раз для обоих типов навыков
+        if self.match_mode == "morph":
+            tokens = tokenize(description)
+        else:
+            description_lower = description.lower()
+        
+        result = {"soft": [], "hard": []}
+        for kind in SKILL_KINDS:
+            if skill_type is not None and skill_type != kind:
+                continue
+            if self.match_mode == "morph":
+                result[kind] = self.morphology[kind].match_tokens(tokens)
+            else:
+                result[kind] = list(self.automata[kind].iter_matches(description_lower))
+        
+        return result
+    
+    def find_matches(self, description: str, skill_type: str = None) -> Dict[str, List[Tuple[str, int, int]]]:
+        """Находит все вхождения навыков в описании с позициями (навык, начало, конец)"""
+        matches = self.match_indexes(description, skill_type)
+        return {
+            kind: [(self.catalog.skills[kind][index], start, end) for index, start, end in matches[kind]]
+            for kind in SKILL_KINDS
+        }
+    
+    def extract_skills(self, description: str, skill_type: str = None, limit: int = 10) -> Dict[str, List[str]]:
+        """Простое извлечение навыков на основе ключевых слов"""
+        matches = self.match_indexes(description, skill_type)
+        
+        result = {"soft": [], "hard": []}
+        for kind in SKILL_KINDS:
+            # Навыки в порядке каталога, без повторов
+            skills = self.catalog.skills[kind]
+            found_indexes = sorted({index for index, _, _ in matches[kind]})
+            result[kind] = [skills[index] for index in found_indexes][:limit]  # Ограничиваем количество
+        
+        return result
@@ -0,0 +1,182 @@
+"""
+Морфологически устойчивый поиск навыков в тексте вакансии.
+Слова приводятся к основам стеммером Портера (Snowball) для русского языка,
+навыки каталога заранее компилируются в автомат над последовательностями основ,
+поэтому совпадения учитывают словоформы и границы слов.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from aho_corasick import AhoCorasick
+
+VOWELS = "аеиоуыэюя"
+
+PERFECTIVE_GERUND = (
+    ("в", "вши", "вшись"),
+    ("ив", "ивши", "ившись", "ыв", "ывши", "ывшись")
+)
+ADJECTIVE = (
+    "ее", "ие", "ые", "ое", "ими", "ыми", "ей", "ий", "ый", "ой", "ем", "им", "ым", "ом",
+    "его", "ого", "ему", "ому", "их", "ых", "ую", "юю", "ая", "яя", "ою", "ею"
+)
+PARTICIPLE = (
+    ("ем", "нн", "вш", "ющ", "щ"),
+    ("ивш", "ывш", "ующ")
+)
+REFLEXIVE = ("ся", "сь")
+VERB = (
+    ("ла", "на", "ете", "йте", "ли", "й", "л", "ем", "н", "ло", "но", "ет", "ют", "ны", "ть", "ешь", "нно"),
+    ("ила", "ыла", "ена", "ейте", "уйте", "ите", "или", "ыли", "ей", "уй", "ил", "ыл", "им", "ым", "ен",
+     "ило", "ыло", "ено", "ят", "ует", "уют", "ит", "ыт", "ены", "ить", "ыть", "ишь", "ую", "ю")
+)
+NOUN = (
+    "а", "ев", "ов", "ие", "ье", "е", "иями", "ями", "ами", "еи", "ии", "и", "ией", "ей", "ой", "ий", "й",
+    "иям", "ям", "ием", "ем", "ам", "ом", "о", "у", "ах", "иях", "ях", "ы", "ь", "ию", "ью", "ю", "ия", "ья", "я"
+)
+SUPERLATIVE = ("ейше", "ейш")
+DERIVATIONAL = ("ость", "ост")
+
+# Служебные слова не участвуют в сопоставлении ни в навыках, ни в тексте
+STOP_WORDS = {"и", "в", "во", "на", "с", "со", "к", "ко", "по", "о", "об", "от", "для", "или", "а", "the", "of", "and"}
+
+TOKEN_RE = re.compile(r"[0-9a-zа-яё]+[+#]*")
+CYRILLIC_RE = re.compile(r"[а-яё]")
+
+
+def _remove_ending(rv: str, endings: Sequence[str]) -> Tuple[str, bool]:
+    """Удаляет самое длинное окончание из списка"""
+    for ending in sorted(endings, key=len, reverse=True):
+        if rv.endswith(ending):
+            return rv[:-len(ending)], True
+    return rv, False
+
+
+def _remove_grouped_ending(rv: str, groups: Tuple[Sequence[str], Sequence[str]]) -> Tuple[str, bool]:
+    """Удаляет окончание; окончания первой группы должны идти после 'а' или 'я'"""
+    candidates = [(ending, True) for ending in groups[0]] + [(ending, False) for ending in groups[1]]
+    for ending, needs_a in sorted(candidates, key=lambda item: len(item[0]), reverse=True):
+        if not rv.endswith(ending):
+            continue
+        stem = rv[:-len(ending)]
+        if needs_a and not stem.endswith(("а", "я")):
+            continue
+        return stem, True
+    return rv, False
+
+
+def _regions(word: str) -> Tuple[int, int]:
+    """Начала областей RV и R2 по правилам Snowball"""
+    rv = len(word)
+    for index, char in enumerate(word):
+        if char in VOWELS:
+            rv = index + 1
+            break
+
+    def next_region(start: int) -> int:
+        for index in range(start + 1, len(word)):
+            if word[index] not in VOWELS and word[index - 1] in VOWELS:
+                return index + 1
+        return len(word)
+
+    r1 = next_region(0)
+    r2 = next_region(r1)
+    return rv, r2
+
+
+@lru_cache(maxsize=200000)
+def stem_russian(word: str) -> str:
+    """Основа русского слова (Snowball Russian stemmer)"""
+    word = word.replace("ё", "е")
+    rv_start, r2_start = _regions(word)
+    prefix, rv = word[:rv_start], word[rv_start:]
+
+    # Шаг 1: деепричастия, иначе возвратность + прилагательные / глаголы / существительные
+    rv, removed = _remove_grouped_ending(rv, PERFECTIVE_GERUND)
+    if not removed:
+        rv, _ = _remove_ending(rv, REFLEXIVE)
+        rv, removed = _remove_ending(rv, ADJECTIVE)
+        if removed:
+            rv, _ = _remove_grouped_ending(rv, PARTICIPLE)
+        else:
+            rv, removed = _remove_grouped_ending(rv, VERB)
+            if not removed:
+                rv, _ = _remove_ending(rv, NOUN)
+
+    # Шаг 2
+    if rv.endswith("и"):
+        rv = rv[:-1]
+
+    # Шаг 3: словообразовательные окончания в R2
+    for ending in DERIVATIONAL:
+        if rv.endswith(ending) and len(prefix) + len(rv) - len(ending) >= r2_start:
+            rv = rv[:-len(ending)]
+            break
+
+    # Шаг 4
+    if rv.endswith("нн"):
+        rv = rv[:-1]
+    else:
+        rv, removed = _remove_ending(rv, SUPERLATIVE)
+        if removed and rv.endswith("нн"):
+            rv = rv[:-1]
+        elif rv.endswith("ь"):
+            rv = rv[:-1]
+
+    return prefix + rv
+
+
+def normalize_word(word: str) -> str:
+    """Нормальная форма слова для сопоставления"""
+    if not CYRILLIC_RE.search(word):
+        # Латиница и цифры (Python, C++, 1С) сравниваются как есть
+        return word
+    stem = stem_russian(word)
+    # Глагол и существительное одного корня дают основы "работа" / "работ" - выравниваем
+    if len(stem) > 3 and stem[-1] in VOWELS:
+        stem = stem[:-1]
+    return stem
+
+
+class Token(NamedTuple):
+    stem: str
+    start: int
+    end: int
+
+
+def tokenize(text: str) -> List[Token]:
+    """Разбивает текст на основы слов с позициями в исходной строке"""
+    tokens = []
+    for match in TOKEN_RE.finditer(text.lower()):
+        word = match.group()
+        if word in STOP_WORDS:
+            continue
+        tokens.append(Token(normalize_word(word), match.start(), match.end()))
+    return tokens
+
+
+class MorphologyIndex:
+    """Индекс навыков по последовательностям основ слов"""
+
+    def __init__(self, skills: List[str]):
+        self.skills = skills
+        self.forms = [tuple(token.stem for token in tokenize(skill)) for skill in skills]
+        self.automaton = AhoCorasick(self.forms)
+
+    def match_tokens(self, tokens: List[Token]) -> List[Tuple[int, int, int]]:
+        """Вхождения навыков в уже нормализованный текст: (индекс навыка, начало, конец) в символах"""
+        stems = [token.stem for token in tokens]
+        return [
+            (index, tokens[first].start, tokens[last - 1].end)
+            for index, first, last in self.automaton.iter_matches(stems)
+        ]
+
+    def match(self, text: str) -> List[Tuple[int, int, int]]:
+        """Нормализует текст и ищет в нем навыки"""
+        return self.match_tokens(tokenize(text))
+
+
+def build_indexes(skills_by_kind: Dict[str, List[str]]) -> Dict[str, MorphologyIndex]:
+    """Строит индексы для каждого типа навыков"""
+    return {kind: MorphologyIndex(skills) for kind, skills in skills_by_kind.items()}
@@ -0,0 +1,62 @@
+"""
+Кеш past_key_values для статического префикса промта (каталог навыков).
+Префикс считается один раз для каждого варианта skill_type и переиспользуется всеми запросами.
+"""
+
+import copy
+import threading
+from typing import Dict, List, NamedTuple
+
+import torch
+from transformers import DynamicCache
+
+
+class PrefixEntry(NamedTuple):
+    token_ids: List[int]
+    past_key_values: DynamicCache
+
+
+class PrefixKVCache:
+    def __init__(self):
+        self._entries: Dict[str, PrefixEntry] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, key: str, token_ids: List[int], model) -> DynamicCache:
+        """Возвращает кеш префикса, вычисляя его при первом обращении или смене токенов"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.token_ids == token_ids:
+                self.hits += 1
+                return entry.past_key_values
+
+            print(f"🧮 Вычисляем KV-кеш префикса '{key}' ({len(token_ids)} токенов)...")
+            input_ids = torch.tensor([token_ids], device=model.device)
+            with torch.no_grad():
+                outputs = model(input_ids=input_ids, past_key_values=DynamicCache(), use_cache=True)
+
+            self._entries[key] = PrefixEntry(token_ids, outputs.past_key_values)
+            self.builds += 1
+            return outputs.past_key_values
+
+    @staticmethod
+    def expand(past_key_values: DynamicCache, batch_size: int) -> DynamicCache:
+        """Создает независимую копию кеша, размноженную на размер батча"""
+        expanded = copy.deepcopy(past_key_values)
+        if batch_size > 1:
+            expanded.batch_repeat_interleave(batch_size)
+        return expanded
+
+    def clear(self):
+        """Сбрасывает все вычисленные префиксы"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Статистика использования кеша"""
+        return {
+            "variants": len(self._entries),
+            "hits": self.hits,
+            "builds": self.builds
+        }
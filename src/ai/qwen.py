@@ -1,17 +1,96 @@
+import asyncio
+import hashlib
 import json
 import os
+import re
+import threading
+import time
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 import torch
-from transformers import AutoTokenizer, AutoModelForCausalLM
+from transformers import AutoTokenizer, AutoModelForCausalLM, LogitsProcessorList, StoppingCriteriaList
 import uvicorn
 
+from batching import BatchScheduler, QueueFullError
+from cascade import CascadeRouter
+from constrained import CatalogGrammar, CatalogJsonLogitsProcessor
+from keyword_extractor import SimpleSkillExtractor
+from prefix_cache import PrefixKVCache
+from result_cache import ResultCache
+from shortlist import CandidateShortlister
+from skill_catalog import SKILL_KINDS, load_catalog
+from stopping import JsonCompleteStoppingCriteria
+
 # Константа для кеша модели
 CACHE_DIR = "/mnt/kernai_storage02/s.v.sharifulin/model_cache"
 
+# Режим CPU: включается явно или автоматически при отсутствии CUDA
+CPU_MODE = os.getenv("QWEN_DEVICE", "auto") == "cpu" or not torch.cuda.is_available()
+# Квантизация весов для CPU: "int8" (динамическая квантизация Linear-слоев) или "none"
+CPU_QUANTIZATION = os.getenv("QWEN_CPU_QUANTIZATION", "int8")
+CPU_THREADS = int(os.getenv("QWEN_CPU_THREADS", str(os.cpu_count() or 1)))
+
+# Модель для извлечения навыков (на CPU по умолчанию берем облегченный чекпоинт)
+if CPU_MODE:
+    MODEL_NAME = os.getenv("QWEN_CPU_MODEL", "Qwen/Qwen3-1.7B")
+else:
+    MODEL_NAME = os.getenv("QWEN_MODEL", "Qwen/Qwen3-8B")
+
+# Параметры динамического батчинга запросов
+BATCH_WINDOW_MS = float(os.getenv("QWEN_BATCH_WINDOW_MS", "20"))
+BATCH_MAX_SIZE = int(os.getenv("QWEN_BATCH_MAX_SIZE", "8"))
+# Максимум запросов, ожидающих генерации; сверх него сервер отвечает 503
+QUEUE_MAX_SIZE = int(os.getenv("QWEN_QUEUE_MAX_SIZE", "64"))
+
+# Переиспользование KV-кеша статического префикса промта (каталога навыков)
+PREFIX_CACHE_ENABLED = os.getenv("QWEN_PREFIX_CACHE", "1") == "1"
+
+# Ограниченное декодирование: модель может выдать только навыки из каталога
+CONSTRAINED_DECODING_ENABLED = os.getenv("QWEN_CONSTRAINED_DECODING", "1") == "1"
+
+# Диапазоны количества навыков по умолчанию, если в промте их найти не удалось
+DEFAULT_SKILL_RANGES = {"soft": (2, 14), "hard": (10, 30)}
+# Предел генерации и запас токенов на скобки, ключи и разметку вокруг навыков
+MAX_NEW_TOKENS_LIMIT = 1000
+ANSWER_OVERHEAD_TOKENS = 24
+ITEM_OVERHEAD_TOKENS = 4
+
+# Отбор кандидатов: в промт попадают только top-K навыков каждого типа (0 - весь каталог).
+# Промт становится уникальным для каждого описания, поэтому KV-кеш каталога не используется
+SHORTLIST_K_SOFT = int(os.getenv("QWEN_SHORTLIST_K_SOFT", "0"))
+SHORTLIST_K_HARD = int(os.getenv("QWEN_SHORTLIST_K_HARD", "0"))
+SHORTLIST_ENABLED = SHORTLIST_K_SOFT > 0 or SHORTLIST_K_HARD > 0
+
+# Сколько ждать между попытками поставить элемент bulk-запроса в заполненную очередь
+BULK_QUEUE_RETRY_SECONDS = 0.5
+
+# Кеш готовых ответов по содержимому описания
+RESULT_CACHE_PATH = os.getenv("QWEN_RESULT_CACHE_PATH", str(Path(CACHE_DIR) / "vacancy_results.sqlite3"))
+RESULT_CACHE_MEMORY_SIZE = int(os.getenv("QWEN_RESULT_CACHE_MEMORY_SIZE", "10000"))
+
+# Каскад: сначала матчер по ключевым словам, модель - только для ненадежных результатов.
+# Диапазоны вида "2-14" (по умолчанию - из промта), уверенность - доля описания, покрытая навыками
+CASCADE_ENABLED = os.getenv("QWEN_CASCADE", "0") == "1"
+CASCADE_MIN_CONFIDENCE = float(os.getenv("QWEN_CASCADE_MIN_CONFIDENCE", "0.02"))
+CASCADE_SOFT_RANGE = os.getenv("QWEN_CASCADE_SOFT_RANGE")
+CASCADE_HARD_RANGE = os.getenv("QWEN_CASCADE_HARD_RANGE")
+
+# Прогрев после загрузки: генерации на описаниях типичной длины (в символах)
+WARMUP_ENABLED = os.getenv("QWEN_WARMUP", "1") == "1"
+WARMUP_LENGTHS = (400, 1500, 4000)
+WARMUP_DESCRIPTION = (
+    "Ищем Python разработчика в команду платформы данных. Обязанности: разработка и поддержка "
+    "сервисов на FastAPI и Django, проектирование схем баз данных PostgreSQL, написание SQL-запросов, "
+    "участие в код-ревью, взаимодействие с аналитиками и тестировщиками. Требования: опыт коммерческой "
+    "разработки от 3 лет, знание Docker и Linux, понимание принципов REST, умение работать в команде, "
+    "ответственность, аналитическое мышление. Условия: официальное трудоустройство, гибкий график, "
+    "обучение за счет компании. "
+)
+
 # Pydantic модели для request/response
 class VacancyRequest(BaseModel):
     body: str
@@ -23,33 +102,71 @@ class SkillsResponse(BaseModel):
     hard: List[str]
 
 
+class BulkVacancyItem(BaseModel):
+    id: int
+    body: str
+    skill: str = None  # 'hard', 'soft' или None для обоих
+
+
 class QwenSkillExtractor:
     def __init__(self):
         self.model = None
         self.tokenizer = None
+        self.catalog = None
+        self.shortlister = None
         self.soft_skills = []
         self.hard_skills = []
         self.prompt_template = ""
+        self.prefix_cache = PrefixKVCache()
+        self._prompt_parts: Dict[str, Tuple[List[int], str]] = {}
+        self._grammars: Dict[str, CatalogGrammar] = {}
+        self._max_new_tokens: Dict[str, int] = {}
+        self._token_text_cache: Dict[int, str] = {}
+        self.skill_ranges = dict(DEFAULT_SKILL_RANGES)
+        self._load_lock = threading.Lock()
+        self.ready = False
+        self.startup_error = None
+        self.warmup_seconds = None
+        self.generated_requests = 0
+        self.generated_tokens = 0
+        self.generation_seconds = 0.0
         self._load_skills_and_prompt()
         
     def _load_skills_and_prompt(self):
         """Загружает навыки и промт из файлов"""
         base_path = Path(__file__).parent.parent
         
-        # Загружаем софт-скиллы
-        soft_path = base_path / "disco" / "skils" / "soft.txt"
-        with open(soft_path, 'r', encoding='utf-8') as f:
-            self.soft_skills = [line.strip() for line in f.readlines() if line.strip()]
-            
-        # Загружаем хард-скиллы
-        hard_path = base_path / "disco" / "skils" / "hard.txt"
-        with open(hard_path, 'r', encoding='utf-8') as f:
-            self.hard_skills = [line.strip() for line in f.readlines() if line.strip()]
+        # Загружаем общий каталог навыков
+        self.catalog = load_catalog()
+        self.soft_skills = self.catalog.soft_skills
+        self.hard_skills = self.catalog.hard_skills
+        if SHORTLIST_ENABLED:
+            self.shortlister = CandidateShortlister(self.catalog)
             
         # Загружаем промт
         prompt_path = base_path / "ai" / "promt.txt"
         with open(prompt_path, 'r', encoding='utf-8') as f:
             self.prompt_template = f.read().strip()
+        
+        # Запрошенные в промте диапазоны ("от 2 до 14 софт-скиллов")
+        for kind, word in (("soft", "софт"), ("hard", "хард")):
+            match = re.search(rf"от (\d+) до (\d+) {word}", self.prompt_template)
+            if match:
+                self.skill_ranges[kind] = (int(match.group(1)), int(match.group(2)))
+    
+    def cache_namespace(self) -> str:
+        """Версия каталога, промта и модели для ключей кеша результатов"""
+        digest = hashlib.sha256()
+        for part in (
+            self.catalog.version,
+            self.prompt_template,
+            MODEL_NAME,
+            f"constrained={CONSTRAINED_DECODING_ENABLED}",
+            f"shortlist={SHORTLIST_K_SOFT}/{SHORTLIST_K_HARD}" if SHORTLIST_ENABLED else ""
+        ):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()[:16]
     
     def _print_cuda_diagnostics(self):
         """Выводит диагностическую информацию о CUDA"""
@@ -190,10 +307,18 @@ class QwenSkillExtractor:
             return f"Неизвестно (ошибка: {e})"
     
     def _load_model(self):
-        """Загружает модель Qwen3-8B"""
+        """Загружает модель один раз; параллельные вызовы ждут окончания первой загрузки"""
+        if self.model is not None:
+            return
+        
+        with self._load_lock:
+            self._load_model_once()
+    
+    def _load_model_once(self):
+        """Загружает модель Qwen (на CPU - с квантизацией весов)"""
         if self.model is None:
-            print("Загружаем модель Qwen3-8B...")
-            model_name = "Qwen/Qwen3-8B"
+            print(f"Загружаем модель {MODEL_NAME}...")
+            model_name = MODEL_NAME
             
             # Диагностика CUDA
             self._print_cuda_diagnostics()
@@ -204,24 +329,29 @@ class QwenSkillExtractor:
             print(f"Кеш модели будет сохранен в: {cache_dir}")
             
             try:
-                # Загружаем токенайзер
+                # Загружаем токенайзер (левый паддинг нужен для батчевой генерации)
                 self.tokenizer = AutoTokenizer.from_pretrained(
                     model_name,
-                    cache_dir=CACHE_DIR
+                    cache_dir=CACHE_DIR,
+                    padding_side="left"
                 )
+                if self.tokenizer.pad_token is None:
+                    self.tokenizer.pad_token = self.tokenizer.eos_token
                 
                 # Определяем device_map для принудительного использования GPU
-                if torch.cuda.is_available():
+                if not CPU_MODE:
                     print("💡 Принудительно загружаем модель на GPU...")
                     device_map = {"": 0}  # Загружаем всю модель на GPU 0
                     torch_dtype = torch.float16  # Используем float16 для экономии памяти
                 else:
-                    print("⚠️  GPU недоступна, используем CPU...")
+                    print(f"⚠️  Режим CPU: {CPU_THREADS} потоков, квантизация {CPU_QUANTIZATION}")
+                    self._configure_cpu_threads()
                     device_map = "cpu"
-                    torch_dtype = "auto"
+                    # Динамическая квантизация работает с float32 весами
+                    torch_dtype = torch.float32
                 
                 # Загружаем модель
-                self.model = AutoModelForCausalLM.from_pretrained(
+                model = AutoModelForCausalLM.from_pretrained(
                     model_name,
                     torch_dtype=torch_dtype,
                     device_map=device_map,
@@ -229,6 +359,13 @@ class QwenSkillExtractor:
                     low_cpu_mem_usage=True  # Оптимизация использования памяти
                 )
                 
+                if CPU_MODE and CPU_QUANTIZATION == "int8":
+                    print("🗜️  Квантизуем Linear-слои в int8...")
+                    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+                
+                model.eval()
+                self.model = model
+                
                 # Проверяем устройство модели
                 device_info = self._get_device_info()
                 print(f"Модель загружена успешно")
@@ -251,16 +388,67 @@ class QwenSkillExtractor:
                     print(f"❌ Ошибка при загрузке модели: {e}")
                 raise
     
-    def _format_skills_list(self, skills: List[str]) -> str:
-        """Форматирует список навыков для промта"""
-        return "\n".join(f"- {skill}" for skill in skills)
+    def warmup(self):
+        """Прогревает модель, KV-кеш префиксов и грамматики на описаниях типичной длины"""
+        started = time.monotonic()
+        for length in WARMUP_LENGTHS:
+            repeats = length // len(WARMUP_DESCRIPTION) + 1
+            description = (WARMUP_DESCRIPTION * repeats)[:length]
+            print(f"🔥 Прогрев на описании длиной {length} символов...")
+            self.extract_skills_batch([(description, None), (description, "hard"), (description, "soft")])
+        
+        self.warmup_seconds = time.monotonic() - started
+        print(f"🔥 Прогрев завершен за {self.warmup_seconds:.1f} с")
     
-    def _prepare_prompt(self, description: str, skill_type: str = None) -> str:
-        """Подготавливает промт с заменой переменных"""
-        soft_formatted = self._format_skills_list(self.soft_skills)
-        hard_formatted = self._format_skills_list(self.hard_skills)
+    def startup(self):
+        """Загружает модель и прогревает ее до приема трафика"""
+        try:
+            started = time.monotonic()
+            self._load_model()
+            print(f"⏱️  Модель загружена за {time.monotonic() - started:.1f} с")
+            if WARMUP_ENABLED:
+                self.warmup()
+            self.ready = True
+            print("✅ Сервер готов принимать запросы")
+        except Exception as e:
+            self.startup_error = str(e)
+            print(f"❌ Ошибка при запуске модели: {e}")
+    
+    def _configure_cpu_threads(self):
+        """Настраивает потоки PyTorch для инференса на CPU"""
+        torch.set_num_threads(CPU_THREADS)
+        try:
+            # Параллелизм между операциями при генерации только мешает
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Значение можно задать только до первой параллельной операции
+            pass
+    
+    def throughput(self) -> Dict:
+        """Производительность генерации с момента запуска"""
+        seconds = self.generation_seconds
+        return {
+            "device": "cpu" if CPU_MODE else "cuda",
+            "model": MODEL_NAME,
+            "quantization": CPU_QUANTIZATION if CPU_MODE else "float16",
+            "threads": CPU_THREADS if CPU_MODE else None,
+            "requests": self.generated_requests,
+            "generated_tokens": self.generated_tokens,
+            "generation_seconds": round(seconds, 1),
+            "tokens_per_second": round(self.generated_tokens / seconds, 1) if seconds else 0.0,
+            "requests_per_minute": round(self.generated_requests / seconds * 60, 1) if seconds else 0.0
+        }
+    
+    def _prepare_prompt_template(self, skill_type: str = None, shortlist: Dict[str, List[str]] = None) -> str:
+        """Подготавливает промт без описания: каталог в начале, ${description} в самом конце"""
+        if shortlist is not None:
+            soft_formatted = "\n".join(f"- {skill}" for skill in shortlist["soft"])
+            hard_formatted = "\n".join(f"- {skill}" for skill in shortlist["hard"])
+        else:
+            soft_formatted = self.catalog.prompt_block("soft")
+            hard_formatted = self.catalog.prompt_block("hard")
         
-        prompt = self.prompt_template.replace("${description}", description)
+        prompt = self.prompt_template
         
         # Модифицируем промт в зависимости от типа навыков
         if skill_type == "hard":
@@ -268,20 +456,79 @@ class QwenSkillExtractor:
             prompt = prompt.replace("${soft}", "")
             prompt = prompt.replace("${hard}", hard_formatted)
             # Добавляем инструкцию для поиска только hard skills
-            prompt += "\n\nВАЖНО: Найди только технические (hard) навыки. Игнорируй мягкие навыки."
+            prompt = prompt.replace("${focus}", "\nВАЖНО: Найди только технические (hard) навыки. Игнорируй мягкие навыки.\n")
         elif skill_type == "soft":
             # Только мягкие навыки
             prompt = prompt.replace("${soft}", soft_formatted)
             prompt = prompt.replace("${hard}", "")
             # Добавляем инструкцию для поиска только soft skills
-            prompt += "\n\nВАЖНО: Найди только мягкие (soft) навыки. Игнорируй технические навыки."
+            prompt = prompt.replace("${focus}", "\nВАЖНО: Найди только мягкие (soft) навыки. Игнорируй технические навыки.\n")
         else:
             # Оба типа навыков
             prompt = prompt.replace("${soft}", soft_formatted)
             prompt = prompt.replace("${hard}", hard_formatted)
+            prompt = prompt.replace("${focus}", "")
         
         return prompt
     
+    def _prepare_prompt(self, description: str, skill_type: str = None, shortlist: Dict[str, List[str]] = None) -> str:
+        """Подготавливает промт с заменой переменных"""
+        return self._prepare_prompt_template(skill_type, shortlist).replace("${description}", description)
+    
+    def _get_prompt_parts(self, skill_type: str = None) -> Tuple[List[int], str]:
+        """Возвращает токены статического префикса и текст, который идет после описания"""
+        key = skill_type or "both"
+        if key not in self._prompt_parts:
+            # Применяем шаблон чата к промту с незамененным ${description}
+            text = self.tokenizer.apply_chat_template(
+                [{"role": "user", "content": self._prepare_prompt_template(skill_type)}],
+                tokenize=False,
+                add_generation_prompt=True,
+                enable_thinking=False  # Отключаем thinking mode для простоты
+            )
+            prefix_text, suffix_text = text.split("${description}", 1)
+            prefix_ids = self.tokenizer(prefix_text, add_special_tokens=False).input_ids
+            self._prompt_parts[key] = (prefix_ids, suffix_text)
+        
+        return self._prompt_parts[key]
+    
+    def _get_grammar(self, skill_type: str = None) -> CatalogGrammar:
+        """Возвращает грамматику ответа для типа навыков (строится один раз)"""
+        key = skill_type or "both"
+        if key not in self._grammars:
+            self._grammars[key] = self._build_grammar(skill_type, self.soft_skills, self.hard_skills)
+        
+        return self._grammars[key]
+    
+    def _build_grammar(self, skill_type: str, soft_skills: List[str], hard_skills: List[str]) -> CatalogGrammar:
+        """Строит грамматику ответа по спискам допустимых навыков"""
+        return CatalogGrammar(
+            self.tokenizer,
+            soft_skills=soft_skills if skill_type != "hard" else [],
+            hard_skills=hard_skills if skill_type != "soft" else [],
+            max_soft=self.skill_ranges["soft"][1],
+            max_hard=self.skill_ranges["hard"][1]
+        )
+    
+    def _get_max_new_tokens(self, skill_type: str = None) -> int:
+        """Бюджет генерации из диапазонов промта и длины навыков каталога в токенах"""
+        key = skill_type or "both"
+        if key not in self._max_new_tokens:
+            budget = ANSWER_OVERHEAD_TOKENS
+            for kind in ("soft", "hard"):
+                if skill_type and skill_type != kind:
+                    continue
+                skills = self.catalog.skills[kind]
+                if not skills:
+                    continue
+                # 95-й перцентиль длины навыка: самые длинные названия редки
+                lengths = sorted(len(ids) for ids in self.tokenizer(skills, add_special_tokens=False).input_ids)
+                typical_length = lengths[int(len(lengths) * 0.95) - 1] if len(lengths) > 1 else lengths[0]
+                budget += self.skill_ranges[kind][1] * (typical_length + ITEM_OVERHEAD_TOKENS)
+            self._max_new_tokens[key] = min(budget, MAX_NEW_TOKENS_LIMIT)
+        
+        return self._max_new_tokens[key]
+    
     def _parse_model_response(self, response: str) -> Dict[str, List[str]]:
         """Парсит ответ модели и извлекает JSON"""
         try:
@@ -314,33 +561,14 @@ class QwenSkillExtractor:
     def _validate_and_filter_skills(self, result: Dict[str, List[str]]) -> Dict[str, List[str]]:
         """Валидирует и фильтрует навыки, оставляя только существующие и уникальные"""
         
-        def normalize_skill(skill: str) -> str:
-            """Нормализует навык для сравнения"""
-            return skill.strip().lower()
-        
-        def find_exact_skill(skill_to_find: str, skills_list: List[str]) -> str:
-            """Находит точное соответствие навыка в списке"""
-            normalized_to_find = normalize_skill(skill_to_find)
-            for original_skill in skills_list:
-                if normalize_skill(original_skill) == normalized_to_find:
-                    return original_skill
-            return None
-        
         def remove_duplicates(skills_list: List[str]) -> List[str]:
-            """Удаляет дубликаты, сохраняя порядок и оригинальный регистр"""
-            seen = set()
-            unique_skills = []
-            for skill in skills_list:
-                normalized = normalize_skill(skill)
-                if normalized not in seen:
-                    seen.add(normalized)
-                    unique_skills.append(skill)
-            return unique_skills
+            """Удаляет дубликаты, сохраняя порядок (названия уже приведены к каталогу)"""
+            return list(dict.fromkeys(skills_list))
         
         # Фильтруем софт-скиллы
         filtered_soft = []
         for skill in result.get('soft', []):
-            exact_skill = find_exact_skill(skill, self.soft_skills)
+            exact_skill = self.catalog.find("soft", skill)
             if exact_skill:
                 filtered_soft.append(exact_skill)
             else:
@@ -349,7 +577,7 @@ class QwenSkillExtractor:
         # Фильтруем хард-скиллы
         filtered_hard = []
         for skill in result.get('hard', []):
-            exact_skill = find_exact_skill(skill, self.hard_skills)
+            exact_skill = self.catalog.find("hard", skill)
             if exact_skill:
                 filtered_hard.append(exact_skill)
             else:
@@ -380,66 +608,226 @@ class QwenSkillExtractor:
     
     def extract_skills(self, description: str, skill_type: str = None) -> Dict[str, List[str]]:
         """Извлекает навыки из описания вакансии"""
+        return self.extract_skills_batch([(description, skill_type)])[0]
+    
+    def extract_skills_batch(self, requests: List[Tuple[str, Optional[str]]]) -> List[Dict[str, List[str]]]:
+        """Извлекает навыки для нескольких вакансий, по одному вызову generate на тип навыков"""
         self._load_model()
         
-        # Подготавливаем промт с учетом типа навыков
-        prompt = self._prepare_prompt(description, skill_type)
+        # Запросы с одинаковым skill_type делят общий префикс промта
+        groups: Dict[Optional[str], List[int]] = {}
+        for index, (_, skill_type) in enumerate(requests):
+            groups.setdefault(skill_type, []).append(index)
+        
+        results: List[Dict[str, List[str]]] = [None] * len(requests)
+        for skill_type, indices in groups.items():
+            descriptions = [requests[index][0] for index in indices]
+            for index, result in zip(indices, self._generate_group(descriptions, skill_type)):
+                results[index] = result
         
-        # Формируем сообщения для чата
-        messages = [
-            {"role": "user", "content": prompt}
+        return results
+    
+    def _generate_group(self, descriptions: List[str], skill_type: str = None) -> List[Dict[str, List[str]]]:
+        """Генерирует ответы для батча описаний с одинаковым префиксом промта"""
+        pad_id = self.tokenizer.pad_token_id
+        
+        if SHORTLIST_ENABLED:
+            # Свой короткий список кандидатов для каждого описания - общего префикса нет
+            shortlists = [
+                self.shortlister.shortlist(description, skill_type, SHORTLIST_K_SOFT, SHORTLIST_K_HARD)
+                for description in descriptions
+            ]
+            prefix_ids = []
+            suffix_ids = [
+                self.tokenizer(self.tokenizer.apply_chat_template(
+                    [{"role": "user", "content": self._prepare_prompt(description, skill_type, shortlist)}],
+                    tokenize=False,
+                    add_generation_prompt=True,
+                    enable_thinking=False
+                ), add_special_tokens=False).input_ids
+                for description, shortlist in zip(descriptions, shortlists)
+            ]
+            grammars = None
+            if CONSTRAINED_DECODING_ENABLED:
+                grammars = [
+                    self._build_grammar(skill_type, shortlist["soft"], shortlist["hard"])
+                    for shortlist in shortlists
+                ]
+        else:
+            prefix_ids, suffix_text = self._get_prompt_parts(skill_type)
+            
+            # Описание и хвост шаблона чата токенизируем отдельно от префикса,
+            # чтобы токены префикса совпадали с закешированными
+            suffix_ids = [
+                self.tokenizer(description + suffix_text, add_special_tokens=False).input_ids
+                for description in descriptions
+            ]
+            grammars = None
+            if CONSTRAINED_DECODING_ENABLED:
+                grammars = [self._get_grammar(skill_type)] * len(descriptions)
+        
+        max_suffix = max(len(ids) for ids in suffix_ids)
+        
+        # Паддинг ставим между префиксом и описанием: позиции префикса не сдвигаются
+        input_ids = [prefix_ids + [pad_id] * (max_suffix - len(ids)) + ids for ids in suffix_ids]
+        attention_mask = [
+            [1] * len(prefix_ids) + [0] * (max_suffix - len(ids)) + [1] * len(ids)
+            for ids in suffix_ids
         ]
         
-        # Применяем шаблон чата
-        text = self.tokenizer.apply_chat_template(
-            messages,
-            tokenize=False,
-            add_generation_prompt=True,
-            enable_thinking=False  # Отключаем thinking mode для простоты
-        )
+        generate_kwargs = {}
+        if PREFIX_CACHE_ENABLED and prefix_ids:
+            prefix_kv = self.prefix_cache.get(skill_type or "both", prefix_ids, self.model)
+            generate_kwargs["past_key_values"] = self.prefix_cache.expand(prefix_kv, len(descriptions))
         
-        # Токенизируем
-        model_inputs = self.tokenizer([text], return_tensors="pt").to(self.model.device)
+        input_ids = torch.tensor(input_ids, device=self.model.device)
+        attention_mask = torch.tensor(attention_mask, device=self.model.device)
+        
+        if grammars is not None:
+            generate_kwargs["logits_processor"] = LogitsProcessorList([
+                CatalogJsonLogitsProcessor(grammars, input_ids.shape[1])
+            ])
+        
+        # Останавливаемся сразу после закрывающей скобки JSON-ответа
+        stopping_criteria = StoppingCriteriaList([
+            JsonCompleteStoppingCriteria(self.tokenizer, input_ids.shape[1], len(descriptions), self._token_text_cache)
+        ])
         
         # Генерируем ответ с параметрами для non-thinking mode
+        started = time.monotonic()
         with torch.no_grad():
             generated_ids = self.model.generate(
-                **model_inputs,
-                max_new_tokens=1000,
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                max_new_tokens=self._get_max_new_tokens(skill_type),
+                stopping_criteria=stopping_criteria,
                 temperature=0.7,
                 top_p=0.8,
                 top_k=20,
                 do_sample=True,
-                pad_token_id=self.tokenizer.eos_token_id
+                pad_token_id=pad_id,
+                **generate_kwargs
             )
         
-        # Декодируем только новую часть
-        output_ids = generated_ids[0][len(model_inputs.input_ids[0]):].tolist()
-        response = self.tokenizer.decode(output_ids, skip_special_tokens=True).strip()
-        
-        # Парсим результат
-        result = self._parse_model_response(response)
+        input_length = input_ids.shape[1]
+        
+        # Учитываем производительность (паддинг завершившихся строк не считаем)
+        self.generation_seconds += time.monotonic() - started
+        self.generated_tokens += int((generated_ids[:, input_length:] != pad_id).sum())
+        self.generated_requests += len(descriptions)
+        results = []
+        for sequence in generated_ids:
+            # Декодируем только новую часть
+            output_ids = sequence[input_length:].tolist()
+            response = self.tokenizer.decode(output_ids, skip_special_tokens=True).strip()
+            
+            # Парсим результат
+            result = self._parse_model_response(response)
+            
+            # Фильтруем результат в зависимости от типа навыков
+            if skill_type == "hard":
+                results.append({"soft": [], "hard": result.get("hard", [])})
+            elif skill_type == "soft":
+                results.append({"soft": result.get("soft", []), "hard": []})
+            else:
+                results.append(result)
         
-        # Фильтруем результат в зависимости от типа навыков
-        if skill_type == "hard":
-            return {"soft": [], "hard": result.get("hard", [])}
-        elif skill_type == "soft":
-            return {"soft": result.get("soft", []), "hard": []}
-        else:
-            return result
+        return results
 
 
 # Инициализируем экстрактор навыков
 skill_extractor = QwenSkillExtractor()
 
+# Планировщик, объединяющий параллельные запросы в один вызов generate
+batch_scheduler = BatchScheduler(
+    skill_extractor.extract_skills_batch,
+    window_ms=BATCH_WINDOW_MS,
+    max_batch_size=BATCH_MAX_SIZE,
+    max_queue_size=QUEUE_MAX_SIZE
+)
+
+# Кеш ответов: повторные и перепубликованные описания не требуют генерации
+result_cache = ResultCache(
+    RESULT_CACHE_PATH,
+    namespace=skill_extractor.cache_namespace(),
+    memory_size=RESULT_CACHE_MEMORY_SIZE
+)
+
+
+def parse_range(value: Optional[str], default: Tuple[int, int]) -> Tuple[int, int]:
+    """Разбирает диапазон вида "2-14" """
+    if not value:
+        return default
+    low, high = value.split("-", 1)
+    return int(low), int(high)
+
+
+# Каскадный маршрутизатор: дешевый матчер отвечает сам, если его результат правдоподобен
+cascade_router = None
+if CASCADE_ENABLED:
+    cascade_router = CascadeRouter(
+        SimpleSkillExtractor(),
+        skill_ranges={
+            "soft": parse_range(CASCADE_SOFT_RANGE, skill_extractor.skill_ranges["soft"]),
+            "hard": parse_range(CASCADE_HARD_RANGE, skill_extractor.skill_ranges["hard"])
+        },
+        min_confidence=CASCADE_MIN_CONFIDENCE
+    )
+
 # Создаем FastAPI приложение
 app = FastAPI(
     title="Vacancy Skills Extractor API",
-    description="API для извлечения навыков из описаний вакансий с помощью Qwen3-8B. Поддерживает селективный поиск hard/soft навыков.",
+    description=f"API для извлечения навыков из описаний вакансий с помощью {MODEL_NAME}. Поддерживает селективный поиск hard/soft навыков.",
     version="1.1.0"
 )
 
 
+async def extract_with_cache(description: str, skill_type: str = None, count_miss: bool = True) -> Dict[str, List[str]]:
+    """Отдает ответ из кеша или ставит описание в очередь генерации"""
+    cached = result_cache.get(description, skill_type, count_miss=count_miss)
+    if cached is not None:
+        return cached
+    
+    skills = await asyncio.wrap_future(batch_scheduler.submit(description, skill_type))
+    
+    # Пустой ответ не кешируем - это скорее сбой разбора, чем результат
+    if skills.get("soft") or skills.get("hard"):
+        result_cache.put(description, skill_type, skills)
+    
+    return skills
+
+
+async def extract_routed(description: str, skill_type: str = None) -> Dict[str, List[str]]:
+    """Извлекает навыки через каскад: кеш, матчер по ключевым словам, затем модель"""
+    if cascade_router is None:
+        return await extract_with_cache(description, skill_type)
+    
+    # Ответ модели из кеша точнее матчера - используем его, если он есть
+    cached = result_cache.get(description, skill_type)
+    if cached is not None:
+        return cached
+    
+    decision = cascade_router.route(description, skill_type)
+    if not decision.escalate:
+        return decision.skills
+    
+    # Модель извлекает только ненадежные типы навыков - промт и ответ короче
+    llm_skill_type = decision.escalate[0] if len(decision.escalate) == 1 else skill_type
+    # Промах кеша для этого запроса уже учтен выше
+    skills = await extract_with_cache(description, llm_skill_type, count_miss=False)
+    
+    return {
+        kind: skills.get(kind, []) if kind in decision.escalate else decision.skills[kind]
+        for kind in SKILL_KINDS
+    }
+
+
+@app.on_event("startup")
+async def load_model_on_startup():
+    """Запускает загрузку и прогрев модели в фоне, чтобы /health отвечал сразу"""
+    threading.Thread(target=skill_extractor.startup, name="qwen-startup", daemon=True).start()
+
+
 @app.get("/")
 async def root():
     """Проверка работоспособности API"""
@@ -465,19 +853,83 @@ async def extract_vacancy_skills(request: VacancyRequest):
         if request.skill and request.skill not in ["hard", "soft"]:
             raise HTTPException(status_code=400, detail="Параметр skill должен быть 'hard', 'soft' или не указан")
         
-        # Извлекаем навыки с учетом типа
-        skills = skill_extractor.extract_skills(request.body, request.skill)
+        # Пока модель не прогрета, трафик не принимаем
+        if not skill_extractor.ready:
+            raise HTTPException(
+                status_code=503,
+                detail="Модель еще загружается",
+                headers={"Retry-After": "30"}
+            )
+        
+        # Ставим запрос в очередь воркера генерации; event loop при этом не блокируется
+        try:
+            skills = await extract_routed(request.body, request.skill)
+        except QueueFullError as e:
+            raise HTTPException(
+                status_code=503,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)}
+            )
         
         return SkillsResponse(
             soft=skills.get("soft", []),
             hard=skills.get("hard", [])
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Ошибка при обработке вакансии: {e}")
         raise HTTPException(status_code=500, detail=f"Ошибка обработки: {str(e)}")
 
 
+async def extract_bulk_item(item: BulkVacancyItem) -> Dict:
+    """Обрабатывает один элемент bulk-запроса, дожидаясь места в очереди"""
+    if not item.body.strip():
+        return {"id": item.id, "error": "Описание вакансии не может быть пустым"}
+    if item.skill and item.skill not in ["hard", "soft"]:
+        return {"id": item.id, "error": "Параметр skill должен быть 'hard', 'soft' или не указан"}
+    
+    while True:
+        try:
+            skills = await extract_routed(item.body, item.skill)
+            return {"id": item.id, "soft": skills.get("soft", []), "hard": skills.get("hard", [])}
+        except QueueFullError as e:
+            # Элементы одного запроса не отклоняем, а ждем освобождения очереди
+            await asyncio.sleep(min(e.retry_after, BULK_QUEUE_RETRY_SECONDS))
+        except Exception as e:
+            print(f"Ошибка при обработке вакансии {item.id}: {e}")
+            return {"id": item.id, "error": f"Ошибка обработки: {str(e)}"}
+
+
+@app.post("/api/vacancies")
+async def extract_vacancies_skills(items: List[BulkVacancyItem]):
+    """
+    Извлекает навыки для списка вакансий
+    
+    Результаты отдаются потоком NDJSON по мере готовности (порядок не гарантирован):
+    {"id": ..., "soft": [...], "hard": [...]} или {"id": ..., "error": "..."}
+    """
+    if not skill_extractor.ready:
+        raise HTTPException(
+            status_code=503,
+            detail="Модель еще загружается",
+            headers={"Retry-After": "30"}
+        )
+    
+    async def stream_results():
+        tasks = [asyncio.create_task(extract_bulk_item(item)) for item in items]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield json.dumps(await task, ensure_ascii=False) + "\n"
+        finally:
+            # Клиент отключился - незапущенные генерации не нужны
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
 @app.get("/health")
 async def health_check():
     """Проверка состояния модели"""
@@ -486,13 +938,52 @@ async def health_check():
         return {
             "status": "healthy",
             "model_loaded": model_loaded,
+            "ready": skill_extractor.ready,
+            "throughput": skill_extractor.throughput(),
             "soft_skills_count": len(skill_extractor.soft_skills),
-            "hard_skills_count": len(skill_extractor.hard_skills)
+            "hard_skills_count": len(skill_extractor.hard_skills),
+            "batching": {
+                "window_ms": batch_scheduler.window_ms,
+                "max_batch_size": batch_scheduler.max_batch_size,
+                "queue_size": batch_scheduler.queue_size(),
+                "max_queue_size": batch_scheduler.max_queue_size,
+                "items_rejected": batch_scheduler.items_rejected,
+                "avg_batch_seconds": round(batch_scheduler.avg_batch_seconds, 3),
+                "batches_processed": batch_scheduler.batches_processed,
+                "items_processed": batch_scheduler.items_processed
+            },
+            "constrained_decoding": CONSTRAINED_DECODING_ENABLED,
+            "shortlist": {
+                "enabled": SHORTLIST_ENABLED,
+                "k_soft": SHORTLIST_K_SOFT,
+                "k_hard": SHORTLIST_K_HARD
+            },
+            "result_cache": result_cache.stats(),
+            "cascade": {
+                "enabled": CASCADE_ENABLED,
+                **(cascade_router.stats() if cascade_router is not None else {})
+            },
+            "prefix_cache": {
+                "enabled": PREFIX_CACHE_ENABLED,
+                **skill_extractor.prefix_cache.stats()
+            }
         }
     except Exception as e:
         return {"status": "unhealthy", "error": str(e)}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Готовность к трафику: модель загружена и прогрета"""
+    if skill_extractor.ready:
+        return {"status": "ready", "warmup_seconds": skill_extractor.warmup_seconds}
+    
+    if skill_extractor.startup_error:
+        return JSONResponse(status_code=503, content={"status": "error", "error": skill_extractor.startup_error})
+    
+    return JSONResponse(status_code=503, content={"status": "loading"})
+
+
 if __name__ == "__main__":
     # Запускаем сервер
     uvicorn.run(
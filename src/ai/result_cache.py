@@ -0,0 +1,130 @@
+"""
+Кеш результатов извлечения навыков по содержимому описания вакансии.
+Два уровня: LRU в памяти и SQLite на диске, переживающий перезапуски сервера.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class ResultCache:
+    def __init__(self, db_path: str, namespace: str, memory_size: int = 10000):
+        """
+        Args:
+            db_path: путь к файлу SQLite
+            namespace: версия каталога, промта и модели - входит в ключ,
+                поэтому смена любой из них автоматически инвалидирует кеш
+            memory_size: максимальное количество записей в памяти
+        """
+        self.namespace = namespace
+        self.memory_size = memory_size
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, Dict[str, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, soft TEXT NOT NULL, hard TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def normalize_description(description: str) -> str:
+        """Нормализует описание: регистр и пробельные символы не влияют на ключ"""
+        return " ".join(description.split()).lower()
+
+    def _key(self, description: str, variant: str) -> str:
+        digest = hashlib.sha256(self.normalize_description(description).encode("utf-8")).hexdigest()
+        return f"{self.namespace}:{variant}:{digest}"
+
+    def _lookup(self, key: str) -> Tuple[Optional[Dict[str, List[str]]], bool]:
+        """Ищет запись сначала в памяти, затем на диске; второй элемент - найдена ли она на диске"""
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                return result, False
+
+            row = self._db.execute("SELECT soft, hard FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None, False
+
+            result = {"soft": json.loads(row[0]), "hard": json.loads(row[1])}
+            self._remember(key, result)
+            return result, True
+
+    def _remember(self, key: str, result: Dict[str, List[str]]):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, description: str, skill_type: str = None, count_miss: bool = True) -> Optional[Dict[str, List[str]]]:
+        """
+        Возвращает сохраненный результат; ответ для обоих типов подходит и для hard/soft,
+        если в нем есть навыки запрошенного типа (пустой список - промах, а не ответ).
+
+        Args:
+            count_miss: учитывать промах в статистике; False для повторного поиска
+                в рамках одного запроса, промах которого уже учтен
+        """
+        variants = [skill_type or "both"]
+        if skill_type in ("hard", "soft"):
+            variants.append("both")
+
+        for variant in variants:
+            result, from_disk = self._lookup(self._key(description, variant))
+            if result is None:
+                continue
+            if skill_type == "hard":
+                result = {"soft": [], "hard": result["hard"]}
+            elif skill_type == "soft":
+                result = {"soft": result["soft"], "hard": []}
+            if result["soft"] or result["hard"]:
+                with self._lock:
+                    if from_disk:
+                        self.disk_hits += 1
+                    else:
+                        self.memory_hits += 1
+                return result
+
+        if count_miss:
+            with self._lock:
+                self.misses += 1
+        return None
+
+    def put(self, description: str, skill_type: str, result: Dict[str, List[str]]):
+        """Сохраняет результат в оба уровня кеша"""
+        key = self._key(description, skill_type or "both")
+        soft = result.get("soft", [])
+        hard = result.get("hard", [])
+
+        with self._lock:
+            self._remember(key, {"soft": soft, "hard": hard})
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, soft, hard, created_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(soft, ensure_ascii=False), json.dumps(hard, ensure_ascii=False), time.time())
+            )
+            self._db.commit()
+
+    def stats(self) -> Dict:
+        """Счетчики попаданий и промахов"""
+        with self._lock:
+            return {
+                "namespace": self.namespace,
+                "memory_entries": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses
+            }
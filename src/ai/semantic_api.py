@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+API извлечения навыков по семантической близости (эмбеддинги предложений на CPU).
+Находит навыки, сформулированные в описании своими словами, без запуска LLM.
+"""
+
+import json
+import os
+from typing import List, Dict
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+import torch
+import uvicorn
+
+from skill_catalog import SKILL_KINDS, load_catalog
+from skill_embeddings import SentenceEncoder, SkillEmbeddingIndex, split_chunks
+
+CACHE_DIR = os.getenv("SEMANTIC_CACHE_DIR", "/mnt/kernai_storage02/s.v.sharifulin/model_cache")
+
+# Небольшая многоязычная модель эмбеддингов, достаточно быстрая для CPU
+MODEL_NAME = os.getenv("SEMANTIC_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+CPU_THREADS = int(os.getenv("SEMANTIC_CPU_THREADS", str(os.cpu_count() or 1)))
+
+# Минимальная косинусная близость фрагмента описания и навыка
+SIMILARITY_THRESHOLD = float(os.getenv("SEMANTIC_THRESHOLD", "0.6"))
+TOP_K = int(os.getenv("SEMANTIC_TOP_K", "10"))
+# Сколько предложений описания учитывается (длинные описания обрезаются)
+MAX_CHUNKS = int(os.getenv("SEMANTIC_MAX_CHUNKS", "64"))
+
+
+# Pydantic модели
+class VacancyRequest(BaseModel):
+    body: str
+    skill: str = None  # 'hard', 'soft' или None для обоих
+
+
+class SkillsResponse(BaseModel):
+    soft: List[str]
+    hard: List[str]
+
+
+class BulkVacancyItem(BaseModel):
+    id: int
+    body: str
+    skill: str = None  # 'hard', 'soft' или None для обоих
+
+
+class SemanticSkillExtractor:
+    def __init__(self):
+        torch.set_num_threads(CPU_THREADS)
+        self.catalog = load_catalog()
+        self.soft_skills = self.catalog.soft_skills
+        self.hard_skills = self.catalog.hard_skills
+        self.encoder = SentenceEncoder(MODEL_NAME, cache_dir=CACHE_DIR)
+        self.index = SkillEmbeddingIndex.load(self.catalog, self.encoder)
+
+    def extract_skills_scored(self, description: str, skill_type: str = None) -> Dict[str, List[tuple]]:
+        """Навыки с оценкой близости (навык, score), по убыванию близости"""
+        chunk_vectors = self.encoder.encode(split_chunks(description, MAX_CHUNKS))
+
+        result = {"soft": [], "hard": []}
+        for kind in SKILL_KINDS:
+            if skill_type is not None and skill_type != kind:
+                continue
+            result[kind] = self.index.top_k(chunk_vectors, kind, TOP_K, SIMILARITY_THRESHOLD)
+
+        return result
+
+    def extract_skills(self, description: str, skill_type: str = None) -> Dict[str, List[str]]:
+        """Извлечение навыков по семантической близости к каталогу"""
+        scored = self.extract_skills_scored(description, skill_type)
+        return {kind: [skill for skill, _ in scored[kind]] for kind in SKILL_KINDS}
+
+
+# Инициализируем экстрактор
+skill_extractor = SemanticSkillExtractor()
+
+# Создаем FastAPI приложение
+app = FastAPI(
+    title="Semantic Vacancy Skills Extractor API",
+    description="API для извлечения навыков по эмбеддингам предложений. Поддерживает селективный поиск hard/soft навыков.",
+    version="1.0.0"
+)
+
+
+@app.get("/")
+async def root():
+    """Проверка работоспособности API"""
+    return {"message": "Semantic Vacancy Skills Extractor API работает"}
+
+
+@app.post("/api/vacancy", response_model=SkillsResponse)
+def extract_vacancy_skills(request: VacancyRequest):
+    """Извлекает навыки из описания вакансии"""
+    # Синхронный обработчик: инференс модели выполняется в пуле потоков FastAPI
+    if not request.body.strip():
+        raise HTTPException(status_code=400, detail="Описание вакансии не может быть пустым")
+
+    # Валидация параметра skill
+    if request.skill and request.skill not in ["hard", "soft"]:
+        raise HTTPException(status_code=400, detail="Параметр skill должен быть 'hard', 'soft' или не указан")
+
+    try:
+        skills = skill_extractor.extract_skills(request.body, request.skill)
+
+        return SkillsResponse(
+            soft=skills.get("soft", []),
+            hard=skills.get("hard", [])
+        )
+
+    except Exception as e:
+        print(f"Ошибка при обработке вакансии: {e}")
+        raise HTTPException(status_code=500, detail=f"Ошибка обработки: {str(e)}")
+
+
+@app.post("/api/vacancies")
+def extract_vacancies_skills(items: List[BulkVacancyItem]):
+    """Извлекает навыки для списка вакансий, результаты отдаются потоком NDJSON"""
+    def stream_results():
+        for item in items:
+            if not item.body.strip():
+                result = {"id": item.id, "error": "Описание вакансии не может быть пустым"}
+            elif item.skill and item.skill not in ["hard", "soft"]:
+                result = {"id": item.id, "error": "Параметр skill должен быть 'hard', 'soft' или не указан"}
+            else:
+                # Сбой одного элемента не обрывает поток - клиент видит, для каких ID нет навыков
+                try:
+                    skills = skill_extractor.extract_skills(item.body, item.skill)
+                    result = {"id": item.id, "soft": skills.get("soft", []), "hard": skills.get("hard", [])}
+                except Exception as e:
+                    print(f"Ошибка при обработке вакансии {item.id}: {e}")
+                    result = {"id": item.id, "error": f"Ошибка обработки: {str(e)}"}
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@app.get("/health")
+async def health_check():
+    """Проверка состояния API"""
+    return {
+        "status": "healthy",
+        "model_type": "semantic_embeddings",
+        "model_name": MODEL_NAME,
+        "catalog_version": skill_extractor.catalog.version,
+        "similarity_threshold": SIMILARITY_THRESHOLD,
+        "soft_skills_count": len(skill_extractor.soft_skills),
+        "hard_skills_count": len(skill_extractor.hard_skills)
+    }
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Готовность к обработке запросов: эмбеддинги каталога загружены до запуска сервера"""
+    return {"status": "ready"}
+
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "semantic_api:app",
+        host="0.0.0.0",
+        port=6381,
+        reload=True
+    )
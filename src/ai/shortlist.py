@@ -0,0 +1,96 @@
+"""
+Предварительный отбор навыков-кандидатов для промта.
+Лексический матчер по инвертированному индексу каталога выбирает top-K навыков,
+которые имеет смысл показывать модели для конкретного описания вакансии.
+"""
+
+import heapq
+import math
+import re
+from collections import defaultdict
+from typing import Dict, List
+
+from skill_catalog import SKILL_KINDS, SkillCatalog
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Длина псевдоосновы: грубо отбрасывает окончания русских словоформ
+STEM_LENGTH = 5
+
+STOP_WORDS = {
+    "и", "в", "во", "на", "с", "со", "к", "по", "о", "об", "от", "до", "для", "из", "за",
+    "не", "или", "а", "но", "при", "у", "the", "of", "and", "in", "to", "for"
+}
+
+
+def lexical_terms(text: str) -> List[str]:
+    """Разбивает текст на псевдоосновы слов без стоп-слов"""
+    terms = []
+    for word in WORD_RE.findall(text.lower()):
+        if word in STOP_WORDS:
+            continue
+        terms.append(word[:STEM_LENGTH])
+    return terms
+
+
+class CandidateShortlister:
+    def __init__(self, catalog: SkillCatalog):
+        self.catalog = catalog
+        self._postings: Dict[str, Dict[str, List[int]]] = {}
+        self._idf: Dict[str, Dict[str, float]] = {}
+        self._norms: Dict[str, List[float]] = {}
+
+        for kind in SKILL_KINDS:
+            skills = catalog.skills[kind]
+            skill_terms = [set(lexical_terms(skill)) for skill in skills]
+
+            postings = defaultdict(list)
+            for position, terms in enumerate(skill_terms):
+                for term in terms:
+                    postings[term].append(position)
+
+            # Редкие в каталоге слова важнее общих ("управление", "навыки")
+            idf = {term: math.log(1 + len(skills) / len(ids)) for term, ids in postings.items()}
+
+            self._postings[kind] = dict(postings)
+            self._idf[kind] = idf
+            self._norms[kind] = [sum(idf[term] for term in terms) or 1.0 for terms in skill_terms]
+
+    def top_k(self, description: str, kind: str, k: int) -> List[str]:
+        """Возвращает k навыков, лучше всего покрытых словами описания, дополняя их каталогом (k <= 0 - весь каталог)"""
+        if k <= 0:
+            return self.catalog.skills[kind]
+
+        postings = self._postings[kind]
+        idf = self._idf[kind]
+        norms = self._norms[kind]
+
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(lexical_terms(description)):
+            for position in postings.get(term, ()):
+                scores[position] += idf[term]
+
+        # Доля веса навыка, найденная в описании; при равенстве - порядок каталога
+        best = heapq.nlargest(
+            k,
+            scores.items(),
+            key=lambda item: (item[1] / norms[item[0]], -item[0])
+        )
+        selected = {position for position, _ in best}
+        skills = self.catalog.skills[kind]
+
+        # Описание без пересечений с каталогом не должно оставить модель без кандидатов:
+        # недостающие места заполняются навыками в порядке каталога
+        for position in range(len(skills)):
+            if len(selected) >= k:
+                break
+            selected.add(position)
+
+        return [skills[position] for position in sorted(selected)]
+
+    def shortlist(self, description: str, skill_type: str, k_soft: int, k_hard: int) -> Dict[str, List[str]]:
+        """Кандидаты для промта с учетом запрошенного типа навыков"""
+        return {
+            "soft": self.top_k(description, "soft", k_soft) if skill_type != "hard" else [],
+            "hard": self.top_k(description, "hard", k_hard) if skill_type != "soft" else []
+        }
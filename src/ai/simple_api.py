@@ -4,13 +4,15 @@
 """
 
 import json
-from pathlib import Path
-from typing import List, Dict
+from typing import List
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import uvicorn
 
+from keyword_extractor import SimpleSkillExtractor
+
 
 # Pydantic модели
 class VacancyRequest(BaseModel):
@@ -23,51 +25,21 @@ class SkillsResponse(BaseModel):
     hard: List[str]
 
 
-class SimpleSkillExtractor:
-    def __init__(self):
-        self.soft_skills = []
-        self.hard_skills = []
-        self._load_skills()
-        
-    def _load_skills(self):
-        """Загружает навыки из файлов"""
-        base_path = Path(__file__).parent.parent
-        
-        # Загружаем софт-скиллы
-        soft_path = base_path / "disco" / "skils" / "soft.txt"
-        if soft_path.exists():
-            with open(soft_path, 'r', encoding='utf-8') as f:
-                self.soft_skills = [line.strip() for line in f.readlines() if line.strip()]
-        
-        # Загружаем хард-скиллы
-        hard_path = base_path / "disco" / "skils" / "hard.txt"
-        if hard_path.exists():
-            with open(hard_path, 'r', encoding='utf-8') as f:
-                self.hard_skills = [line.strip() for line in f.readlines() if line.strip()]
-    
-    def extract_skills(self, description: str, skill_type: str = None) -> Dict[str, List[str]]:
-        """Простое извлечение навыков на основе ключевых слов"""
-        description_lower = description.lower()
-        
-        result = {"soft": [], "hard": []}
-        
-        # Ищем софт-навыки (если нужны или не указан тип)
-        if skill_type is None or skill_type == "soft":
-            found_soft = []
-            for skill in self.soft_skills:
-                if skill.lower() in description_lower:
-                    found_soft.append(skill)
-            result["soft"] = found_soft[:10]  # Ограничиваем количество
-        
-        # Ищем хард-навыки (если нужны или не указан тип)
-        if skill_type is None or skill_type == "hard":
-            found_hard = []
-            for skill in self.hard_skills:
-                if skill.lower() in description_lower:
-                    found_hard.append(skill)
-            result["hard"] = found_hard[:10]  # Ограничиваем количество
-        
-        return result
+class SkillMatch(BaseModel):
+    skill: str
+    start: int
+    end: int
+
+
+class SkillMatchesResponse(BaseModel):
+    soft: List[SkillMatch]
+    hard: List[SkillMatch]
+
+
+class BulkVacancyItem(BaseModel):
+    id: int
+    body: str
+    skill: str = None  # 'hard', 'soft' или None для обоих
 
 
 # Инициализируем экстрактор
@@ -110,17 +82,63 @@ async def extract_vacancy_skills(request: VacancyRequest):
         raise HTTPException(status_code=500, detail=f"Ошибка обработки: {str(e)}")
 
 
+@app.post("/api/vacancy/matches", response_model=SkillMatchesResponse)
+async def match_vacancy_skills(request: VacancyRequest):
+    """Возвращает все найденные вхождения навыков с позициями в описании"""
+    if not request.body.strip():
+        raise HTTPException(status_code=400, detail="Описание вакансии не может быть пустым")
+    
+    if request.skill and request.skill not in ["hard", "soft"]:
+        raise HTTPException(status_code=400, detail="Параметр skill должен быть 'hard', 'soft' или не указан")
+    
+    matches = skill_extractor.find_matches(request.body, request.skill)
+    
+    return SkillMatchesResponse(
+        soft=[SkillMatch(skill=skill, start=start, end=end) for skill, start, end in matches["soft"]],
+        hard=[SkillMatch(skill=skill, start=start, end=end) for skill, start, end in matches["hard"]]
+    )
+
+
+@app.post("/api/vacancies")
+async def extract_vacancies_skills(items: List[BulkVacancyItem]):
+    """Извлекает навыки для списка вакансий, результаты отдаются потоком NDJSON"""
+    def stream_results():
+        for item in items:
+            if not item.body.strip():
+                result = {"id": item.id, "error": "Описание вакансии не может быть пустым"}
+            elif item.skill and item.skill not in ["hard", "soft"]:
+                result = {"id": item.id, "error": "Параметр skill должен быть 'hard', 'soft' или не указан"}
+            else:
+                # Сбой одного элемента не обрывает поток - клиент видит, для каких ID нет навыков
+                try:
+                    skills = skill_extractor.extract_skills(item.body, item.skill)
+                    result = {"id": item.id, "soft": skills.get("soft", []), "hard": skills.get("hard", [])}
+                except Exception as e:
+                    print(f"Ошибка при обработке вакансии {item.id}: {e}")
+                    result = {"id": item.id, "error": f"Ошибка обработки: {str(e)}"}
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
 @app.get("/health")
 async def health_check():
     """Проверка состояния API"""
     return {
         "status": "healthy",
         "model_type": "simple_keyword_extraction",
+        "match_mode": skill_extractor.match_mode,
         "soft_skills_count": len(skill_extractor.soft_skills),
         "hard_skills_count": len(skill_extractor.hard_skills)
     }
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Готовность к обработке запросов: индексы навыков строятся до запуска сервера"""
+    return {"status": "ready"}
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "simple_api:app",
@@ -0,0 +1,118 @@
+"""
+Общий каталог навыков для всех экстракторов.
+Загружает soft.txt и hard.txt один раз, строит нормализованные индексы, стабильные
+числовые ID и готовые блоки для промта. Результат сохраняется в бинарный снимок,
+который переиспользуется, пока не изменились файлы навыков.
+"""
+
+import hashlib
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SKILLS_DIR = Path(__file__).parent.parent / "disco" / "skils"
+SNAPSHOT_PATH = SKILLS_DIR / "catalog.snapshot.pkl"
+SNAPSHOT_FORMAT = 1
+
+SKILL_KINDS = ("soft", "hard")
+
+
+def normalize_skill(skill: str) -> str:
+    """Нормализует навык для сравнения"""
+    return skill.strip().lower()
+
+
+class SkillCatalog:
+    def __init__(self, skills: Dict[str, List[str]], version: str):
+        self.version = version
+        self.skills = {kind: list(skills.get(kind, [])) for kind in SKILL_KINDS}
+
+        # Нормализованное название -> оригинальное (первое вхождение)
+        self.index: Dict[str, Dict[str, str]] = {}
+        for kind in SKILL_KINDS:
+            index = {}
+            for skill in self.skills[kind]:
+                index.setdefault(normalize_skill(skill), skill)
+            self.index[kind] = index
+
+        # Стабильные ID: сначала софт-скиллы, затем хард-скиллы в порядке файлов
+        self.entries = [(kind, skill) for kind in SKILL_KINDS for skill in self.skills[kind]]
+        self.ids: Dict[str, Dict[str, int]] = {kind: {} for kind in SKILL_KINDS}
+        for skill_id, (kind, skill) in enumerate(self.entries):
+            self.ids[kind].setdefault(skill, skill_id)
+
+        # Готовые блоки для промта
+        self.prompt_blocks = {
+            kind: "\n".join(f"- {skill}" for skill in self.skills[kind])
+            for kind in SKILL_KINDS
+        }
+
+    @property
+    def soft_skills(self) -> List[str]:
+        return self.skills["soft"]
+
+    @property
+    def hard_skills(self) -> List[str]:
+        return self.skills["hard"]
+
+    def find(self, kind: str, skill: str) -> Optional[str]:
+        """Находит точное название навыка в каталоге (без учета регистра и пробелов по краям)"""
+        return self.index[kind].get(normalize_skill(skill))
+
+    def skill_id(self, kind: str, skill: str) -> Optional[int]:
+        """Числовой ID навыка"""
+        return self.ids[kind].get(skill)
+
+    def prompt_block(self, kind: str) -> str:
+        """Список навыков, отформатированный для промта"""
+        return self.prompt_blocks[kind]
+
+    @classmethod
+    def load(cls, skills_dir: Path = SKILLS_DIR, snapshot_path: Path = SNAPSHOT_PATH) -> "SkillCatalog":
+        """Загружает каталог из снимка или собирает его из текстовых файлов"""
+        raw = {}
+        digest = hashlib.sha256()
+        for kind in SKILL_KINDS:
+            path = Path(skills_dir) / f"{kind}.txt"
+            raw[kind] = path.read_bytes() if path.exists() else b""
+            digest.update(raw[kind])
+            digest.update(b"\0")
+        version = digest.hexdigest()[:16]
+
+        snapshot_path = Path(snapshot_path)
+        if snapshot_path.exists():
+            try:
+                with open(snapshot_path, 'rb') as f:
+                    snapshot = pickle.load(f)
+                if snapshot.get("format") == SNAPSHOT_FORMAT and snapshot.get("version") == version:
+                    return snapshot["catalog"]
+            except Exception as e:
+                print(f"⚠️  Снимок каталога поврежден, пересобираем: {e}")
+
+        skills = {
+            kind: [line.strip() for line in raw[kind].decode('utf-8').splitlines() if line.strip()]
+            for kind in SKILL_KINDS
+        }
+        catalog = cls(skills, version)
+
+        # Пишем во временный файл процесса и атомарно подменяем: одновременный запуск серверов
+        # или сбой посреди записи не оставят обрезанный снимок
+        tmp_path = snapshot_path.with_suffix(f".pkl.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({"format": SNAPSHOT_FORMAT, "version": version, "catalog": catalog}, f)
+            os.replace(tmp_path, snapshot_path)
+        except OSError as e:
+            print(f"⚠️  Не удалось сохранить снимок каталога: {e}")
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        return catalog
+
+
+@lru_cache(maxsize=None)
+def load_catalog() -> SkillCatalog:
+    """Каталог навыков, общий для всех экстракторов процесса"""
+    return SkillCatalog.load()
@@ -0,0 +1,176 @@
+"""
+Многометочный классификатор навыков, обученный на ответах Qwen (дистилляция).
+TF-IDF по основам слов и их биграммам + логистическая регрессия one-vs-rest
+по навыкам каталога. Работает на CPU на порядки быстрее генерации.
+"""
+
+import pickle
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.multiclass import OneVsRestClassifier
+
+from morphology import tokenize
+from skill_catalog import SKILL_KINDS, SkillCatalog
+
+MODEL_PATH = Path(__file__).parent / "models" / "skill_classifier.pkl"
+MODEL_FORMAT = 1
+
+# Пороги, среди которых выбирается лучший по micro-F1 на отложенной выборке
+THRESHOLD_GRID = [round(value, 2) for value in np.arange(0.1, 0.8, 0.05)]
+
+Label = Tuple[str, str]  # (тип навыка, навык)
+
+
+def stem_terms(text: str) -> List[str]:
+    """Признаки описания: основы слов и биграммы основ"""
+    stems = [token.stem for token in tokenize(text)]
+    return stems + [f"{first} {second}" for first, second in zip(stems, stems[1:])]
+
+
+def micro_scores(predicted: List[Set[Label]], expected: List[Set[Label]]) -> Dict[str, float]:
+    """Micro precision / recall / F1 и доля полных совпадений"""
+    true_positive = sum(len(p & e) for p, e in zip(predicted, expected))
+    predicted_total = sum(len(p) for p in predicted)
+    expected_total = sum(len(e) for e in expected)
+    precision = true_positive / predicted_total if predicted_total else 0.0
+    recall = true_positive / expected_total if expected_total else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    exact = sum(p == e for p, e in zip(predicted, expected)) / len(expected) if expected else 0.0
+    return {"precision": precision, "recall": recall, "f1": f1, "exact_match": exact}
+
+
+class SkillClassifier:
+    def __init__(
+        self,
+        catalog_version: str,
+        labels: List[Label],
+        vectorizer: TfidfVectorizer,
+        estimator: OneVsRestClassifier,
+        skill_ranges: Dict[str, Tuple[int, int]],
+        threshold: float = 0.5
+    ):
+        self.catalog_version = catalog_version
+        self.labels = labels
+        self.vectorizer = vectorizer
+        self.estimator = estimator
+        self.skill_ranges = dict(skill_ranges)
+        self.threshold = threshold
+        self.label_kinds = np.array([kind for kind, _ in labels])
+
+    @classmethod
+    def fit(
+        cls,
+        catalog: SkillCatalog,
+        descriptions: List[str],
+        label_sets: List[Set[Label]],
+        skill_ranges: Dict[str, Tuple[int, int]],
+        min_count: int = 5,
+        max_features: int = 200000,
+        n_jobs: int = -1
+    ) -> "SkillClassifier":
+        """Обучает классификатор; навыки с числом примеров меньше min_count не учитываются"""
+        counts: Dict[Label, int] = {}
+        for label_set in label_sets:
+            for label in label_set:
+                counts[label] = counts.get(label, 0) + 1
+
+        # Порядок меток - порядок каталога, как у остальных экстракторов
+        labels = [
+            entry for entry in dict.fromkeys(catalog.entries)
+            if min_count <= counts.get(entry, 0) < len(label_sets)
+        ]
+        label_index = {label: position for position, label in enumerate(labels)}
+        if not labels:
+            raise ValueError("Недостаточно размеченных данных: ни один навык не встречается достаточно часто")
+
+        # Разреженная матрица меток: у вакансии лишь десятки навыков из всего каталога
+        rows, cols = [], []
+        for row, label_set in enumerate(label_sets):
+            for label in label_set:
+                if label in label_index:
+                    rows.append(row)
+                    cols.append(label_index[label])
+        targets = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(descriptions), len(labels))
+        )
+
+        vectorizer = TfidfVectorizer(
+            analyzer=stem_terms,
+            min_df=2,
+            max_df=0.9,
+            max_features=max_features,
+            sublinear_tf=True,
+            dtype=np.float32
+        )
+        features = vectorizer.fit_transform(descriptions)
+
+        estimator = OneVsRestClassifier(
+            LogisticRegression(solver="liblinear", C=4.0, class_weight="balanced"),
+            n_jobs=n_jobs
+        )
+        estimator.fit(features, targets)
+
+        return cls(catalog.version, labels, vectorizer, estimator, skill_ranges)
+
+    def predict_scores(self, descriptions: List[str]) -> np.ndarray:
+        """Вероятности навыков, shape (len(descriptions), len(labels))"""
+        return self.estimator.predict_proba(self.vectorizer.transform(descriptions))
+
+    def _select(self, scores: np.ndarray, threshold: float, skill_type: Optional[str]) -> Dict[str, List[str]]:
+        """Навыки выше порога по убыванию вероятности, не больше верхней границы диапазона"""
+        result = {"soft": [], "hard": []}
+        for kind in SKILL_KINDS:
+            if skill_type is not None and skill_type != kind:
+                continue
+            _, high = self.skill_ranges[kind]
+            candidates = np.flatnonzero((scores >= threshold) & (self.label_kinds == kind))
+            best = candidates[np.argsort(-scores[candidates])][:high]
+            result[kind] = [self.labels[position][1] for position in best]
+        return result
+
+    def predict(self, descriptions: List[str], skill_type: str = None, threshold: float = None) -> List[Dict[str, List[str]]]:
+        """Навыки для каждого описания в формате ответа /api/vacancy"""
+        if not descriptions:
+            return []
+        threshold = self.threshold if threshold is None else threshold
+        scores = self.predict_scores(descriptions)
+        return [self._select(row, threshold, skill_type) for row in scores]
+
+    def tune_threshold(self, descriptions: List[str], label_sets: List[Set[Label]]) -> Dict[str, float]:
+        """Подбирает порог по micro-F1 на отложенной выборке"""
+        scores = self.predict_scores(descriptions)
+        best_threshold, best = self.threshold, None
+        for threshold in THRESHOLD_GRID:
+            predicted = [as_label_set(self._select(row, threshold, None)) for row in scores]
+            metrics = micro_scores(predicted, label_sets)
+            if best is None or metrics["f1"] > best["f1"]:
+                best_threshold, best = threshold, metrics
+        self.threshold = best_threshold
+        return {"threshold": best_threshold, **best}
+
+    def save(self, path: Path = MODEL_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"format": MODEL_FORMAT, "classifier": self}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path = MODEL_PATH) -> "SkillClassifier":
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        if data.get("format") != MODEL_FORMAT:
+            raise ValueError(f"Неподдерживаемый формат модели: {data.get('format')}")
+        return data["classifier"]
+
+
+def as_label_set(skills: Dict[str, Iterable[str]]) -> Set[Label]:
+    """Ответ экстрактора -> множество меток (тип, навык)"""
+    return {(kind, skill) for kind in SKILL_KINDS for skill in skills.get(kind, [])}
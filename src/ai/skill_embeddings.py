@@ -0,0 +1,151 @@
+"""
+Семантическое сопоставление навыков по эмбеддингам предложений.
+Эмбеддинги навыков каталога считаются один раз и хранятся в .npy файле,
+который открывается через memory map; пересчет происходит только при изменении
+soft.txt / hard.txt (версии каталога) или модели эмбеддингов.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import torch
+from transformers import AutoModel, AutoTokenizer
+
+from skill_catalog import SKILL_KINDS, SKILLS_DIR, SkillCatalog
+
+EMBEDDINGS_FORMAT = 1
+
+# Границы предложений и пунктов списков в очищенном описании
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?;])\s+|\s*[•●▪·]\s*|\n+")
+
+
+class SentenceEncoder:
+    """Небольшая модель эмбеддингов предложений на CPU (mean pooling + L2-нормализация)"""
+
+    def __init__(self, model_name: str, cache_dir: str = None, batch_size: int = 64, max_length: int = 128):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, cache_dir=cache_dir)
+        self.model = AutoModel.from_pretrained(model_name, cache_dir=cache_dir)
+        self.model.eval()
+
+    @torch.no_grad()
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Нормализованные эмбеддинги текстов, shape (len(texts), dim)"""
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + self.batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="pt"
+            )
+            hidden = self.model(**inputs).last_hidden_state
+            mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            vectors.append(torch.nn.functional.normalize(pooled, dim=-1).numpy())
+
+        if not vectors:
+            return np.zeros((0, self.model.config.hidden_size), dtype=np.float32)
+        return np.concatenate(vectors).astype(np.float32)
+
+
+def split_chunks(description: str, max_chunks: int, min_chars: int = 20) -> List[str]:
+    """Разбивает описание на предложения, короткие фрагменты склеиваются с соседними"""
+    chunks: List[str] = []
+    buffer = ""
+    for part in SENTENCE_SPLIT_RE.split(description):
+        part = part.strip()
+        if not part:
+            continue
+        buffer = f"{buffer} {part}" if buffer else part
+        if len(buffer) >= min_chars:
+            chunks.append(buffer)
+            buffer = ""
+    if buffer:
+        chunks.append(buffer)
+    return chunks[:max_chunks]
+
+
+class SkillEmbeddingIndex:
+    """Матрица эмбеддингов навыков каталога (строки в порядке catalog.entries)"""
+
+    def __init__(self, catalog: SkillCatalog, matrix: np.ndarray):
+        self.catalog = catalog
+        self.matrix = matrix
+
+        # Строки матрицы, относящиеся к каждому типу навыков
+        self.kind_ranges: Dict[str, Tuple[int, int]] = {}
+        start = 0
+        for kind in SKILL_KINDS:
+            self.kind_ranges[kind] = (start, start + len(catalog.skills[kind]))
+            start += len(catalog.skills[kind])
+
+    @staticmethod
+    def paths(model_name: str, directory: Path = SKILLS_DIR) -> Tuple[Path, Path]:
+        slug = re.sub(r"[^0-9A-Za-z_.-]+", "_", model_name)
+        return directory / f"embeddings.{slug}.npy", directory / f"embeddings.{slug}.json"
+
+    @classmethod
+    def load(cls, catalog: SkillCatalog, encoder: SentenceEncoder, directory: Path = SKILLS_DIR) -> "SkillEmbeddingIndex":
+        """Открывает матрицу через memory map, пересчитывая ее только при смене каталога или модели"""
+        matrix_path, meta_path = cls.paths(encoder.model_name, directory)
+        expected = {"format": EMBEDDINGS_FORMAT, "catalog_version": catalog.version, "model": encoder.model_name}
+
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta == expected and matrix_path.exists():
+                print(f"📂 Эмбеддинги навыков загружены из {matrix_path}")
+                return cls(catalog, np.load(matrix_path, mmap_mode="r"))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Эмбеддинги навыков будут пересчитаны: {e}")
+
+        print(f"🔄 Расчет эмбеддингов для {len(catalog.entries)} навыков...")
+        matrix = encoder.encode([skill for _, skill in catalog.entries])
+
+        # Пишем во временные файлы и атомарно подменяем, чтобы не оставить половину матрицы
+        try:
+            tmp_matrix = matrix_path.with_suffix(".npy.tmp")
+            with open(tmp_matrix, "wb") as f:
+                np.save(f, matrix)
+            os.replace(tmp_matrix, matrix_path)
+            tmp_meta = meta_path.with_suffix(".json.tmp")
+            with open(tmp_meta, "w", encoding="utf-8") as f:
+                json.dump(expected, f)
+            os.replace(tmp_meta, meta_path)
+            matrix = np.load(matrix_path, mmap_mode="r")
+            print(f"💾 Эмбеддинги навыков сохранены в {matrix_path}")
+        except OSError as e:
+            print(f"⚠️ Не удалось сохранить эмбеддинги навыков: {e}")
+
+        return cls(catalog, matrix)
+
+    def top_k(self, chunk_vectors: np.ndarray, kind: str, k: int, threshold: float) -> List[Tuple[str, float]]:
+        """Лучшие навыки типа kind без повторов: максимум косинусной близости по фрагментам описания"""
+        start, end = self.kind_ranges[kind]
+        if k <= 0 or end == start or len(chunk_vectors) == 0:
+            return []
+
+        # (фрагменты x навыки) одним произведением, затем максимум по фрагментам
+        scores = (chunk_vectors @ self.matrix[start:end].T).max(axis=0)
+
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+
+        skills = self.catalog.skills[kind]
+        # В каталоге встречаются повторы названий - навык отдается один раз, с лучшей оценкой
+        found: Dict[str, float] = {}
+        for index in best:
+            if scores[index] >= threshold:
+                found.setdefault(skills[index], float(scores[index]))
+        return list(found.items())
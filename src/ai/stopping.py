@@ -0,0 +1,75 @@
+"""
+Критерий остановки генерации по завершенному JSON-ответу.
+Отслеживает баланс фигурных и квадратных скобок (без учета строк) и останавливает
+строку батча в момент, когда закрывается корневой объект.
+"""
+
+from typing import Dict, List
+
+import torch
+from transformers import StoppingCriteria
+
+
+class JsonBalanceState:
+    __slots__ = ("depth", "in_string", "escaped", "started", "done")
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.started = False
+        self.done = False
+
+    def feed(self, text: str):
+        """Учитывает очередной фрагмент сгенерированного текста"""
+        for char in text:
+            if self.done:
+                return
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+
+            if char == '"' and self.started:
+                self.in_string = True
+            elif char in "{[":
+                if char == "{" or self.started:
+                    self.depth += 1
+                    self.started = True
+            elif char in "}]" and self.started:
+                self.depth -= 1
+                if self.depth <= 0:
+                    self.done = True
+
+
+class JsonCompleteStoppingCriteria(StoppingCriteria):
+    """Останавливает строки батча, как только корневой JSON-объект закрыт"""
+
+    def __init__(self, tokenizer, prompt_length: int, batch_size: int, token_text_cache: Dict[int, str] = None):
+        self.tokenizer = tokenizer
+        self.consumed = prompt_length
+        self.states = [JsonBalanceState() for _ in range(batch_size)]
+        # Текст отдельных токенов не меняется - кешируем между запросами
+        self.token_text_cache = token_text_cache if token_text_cache is not None else {}
+
+    def _token_text(self, token_id: int) -> str:
+        text = self.token_text_cache.get(token_id)
+        if text is None:
+            text = self.tokenizer.decode([token_id], skip_special_tokens=True)
+            self.token_text_cache[token_id] = text
+        return text
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        new_tokens: List[List[int]] = input_ids[:, self.consumed:].tolist()
+        self.consumed = input_ids.shape[1]
+
+        for state, tokens in zip(self.states, new_tokens):
+            for token_id in tokens:
+                state.feed(self._token_text(token_id))
+
+        return torch.tensor([state.done for state in self.states], dtype=torch.bool, device=input_ids.device)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк классификатора навыков против Qwen: пропускная способность
+и согласие с ответами LLM на отложенной выборке. При --llm-samples часть
+описаний дополнительно отправляется в работающий API Qwen для замера его скорости.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+from labeled_corpus import is_holdout, load_corpus
+from skill_catalog import SKILL_KINDS, load_catalog
+from skill_classifier import MODEL_PATH, SkillClassifier, as_label_set, micro_scores
+from vacancy_processor import VacancyProcessor
+
+
+def print_agreement(title: str, predicted, expected):
+    """Печатает согласие в целом и по типам навыков"""
+    metrics = micro_scores(predicted, expected)
+    print(f"\n{title}")
+    print(
+        f"  все навыки: precision={metrics['precision']:.3f} recall={metrics['recall']:.3f} "
+        f"F1={metrics['f1']:.3f} exact={metrics['exact_match']:.3f}"
+    )
+    for kind in SKILL_KINDS:
+        kind_metrics = micro_scores(
+            [{label for label in labels if label[0] == kind} for labels in predicted],
+            [{label for label in labels if label[0] == kind} for labels in expected]
+        )
+        print(
+            f"  {kind}: precision={kind_metrics['precision']:.3f} "
+            f"recall={kind_metrics['recall']:.3f} F1={kind_metrics['f1']:.3f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Сравнение классификатора навыков с Qwen')
+    parser.add_argument('--excel-file', type=str, default='merged_vacs.xlsx',
+                       help='Путь к Excel файлу с вакансиями')
+    parser.add_argument('--labels-dir', type=str, default='process_vacs',
+                       help='Директория с CSV файлами ответов Qwen')
+    parser.add_argument('--model-path', type=str, default=str(MODEL_PATH),
+                       help='Путь к обученной модели')
+    parser.add_argument('--holdout-percent', type=int, default=10,
+                       help='Доля отложенной выборки в процентах (как при обучении)')
+    parser.add_argument('--block-size', type=int, default=512,
+                       help='Размер блока описаний для классификатора (по умолчанию: 512)')
+    parser.add_argument('--llm-samples', type=int, default=0,
+                       help='Сколько описаний отправить в API Qwen для замера скорости (по умолчанию: 0)')
+    parser.add_argument('--ready-timeout', type=float, default=900,
+                       help='Сколько секунд ждать готовности сервера Qwen (по умолчанию: 900)')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.model_path):
+        print(f"Ошибка: модель {args.model_path} не найдена, запустите train_classifier.py")
+        sys.exit(1)
+
+    classifier = SkillClassifier.load(args.model_path)
+    catalog = load_catalog()
+    if classifier.catalog_version != catalog.version:
+        print("⚠️  Каталог навыков изменился после обучения модели")
+
+    corpus = load_corpus(args.excel_file, args.labels_dir, catalog)
+    holdout = [item for item in corpus if is_holdout(item[0], args.holdout_percent)]
+    if not holdout:
+        print("Отложенная выборка пуста")
+        sys.exit(1)
+
+    descriptions = [description for _, description, _ in holdout]
+    expected = [labels for _, _, labels in holdout]
+
+    # Пропускная способность классификатора
+    started = time.time()
+    predictions = []
+    for start in range(0, len(descriptions), args.block_size):
+        predictions.extend(classifier.predict(descriptions[start:start + args.block_size]))
+    classifier_seconds = time.time() - started
+    classifier_rate = len(descriptions) / classifier_seconds if classifier_seconds else float("inf")
+
+    print(f"\nКлассификатор: {len(descriptions)} вакансий за {classifier_seconds:.2f} с ({classifier_rate:.1f} вакансий/с)")
+    print_agreement("Согласие классификатора с сохраненными ответами Qwen:", [as_label_set(p) for p in predictions], expected)
+
+    if args.llm_samples > 0:
+        processor = VacancyProcessor(args.excel_file)
+        print("\nОжидаем готовности сервера Qwen...")
+        if not processor.wait_until_ready(timeout=args.ready_timeout):
+            print(f"Ошибка: сервер Qwen не готов спустя {args.ready_timeout:.0f} с")
+            sys.exit(1)
+
+        samples = holdout[:args.llm_samples]
+        started = time.time()
+        llm_answers = [processor.send_api_request(description) for _, description, _ in samples]
+        llm_seconds = time.time() - started
+        llm_rate = len(samples) / llm_seconds if llm_seconds else float("inf")
+
+        print(f"\nQwen: {len(samples)} вакансий за {llm_seconds:.1f} с ({llm_rate:.2f} вакансий/с)")
+        print(f"Ускорение классификатора: x{classifier_rate / llm_rate:.0f}")
+        print_agreement(
+            "Согласие классификатора со свежими ответами Qwen:",
+            [as_label_set(p) for p in predictions[:len(samples)]],
+            [as_label_set(answer) for answer in llm_answers]
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк очистки описаний вакансий от HTML: прежний путь через BeautifulSoup
+против быстрой очистки html_cleaner (в одном процессе и в пуле процессов),
+с проверкой совпадения результатов.
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+from multiprocessing import Pool
+
+from bs4 import BeautifulSoup
+
+from excel_reader import VacancyExcelReader
+from html_cleaner import clean_html
+
+
+def clean_html_bs4(text) -> str:
+    """Прежняя очистка: дерево BeautifulSoup(html.parser) и регулярное выражение"""
+    if text is None or text != text:
+        return ""
+    cleaned_text = BeautifulSoup(str(text), 'html.parser').get_text(separator=' ', strip=True)
+    return re.sub(r'\s+', ' ', cleaned_text).strip()
+
+
+def measure(title: str, clean, descriptions):
+    """Запускает очистку и печатает скорость"""
+    started = time.time()
+    results = clean(descriptions)
+    seconds = time.time() - started
+    rate = len(descriptions) / seconds if seconds else float("inf")
+    print(f"{title}: {len(descriptions)} описаний за {seconds:.2f} с ({rate:.0f} описаний/с)")
+    return results, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Сравнение скорости очистки описаний от HTML')
+    parser.add_argument('--excel-file', type=str, default='merged_vacs.xlsx',
+                       help='Путь к Excel файлу с вакансиями')
+    parser.add_argument('--limit', type=int, default=None,
+                       help='Сколько описаний взять из файла (по умолчанию: все)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                       help='Количество процессов (по умолчанию: все ядра)')
+    parser.add_argument('--chunk-size', type=int, default=256,
+                       help='Описаний в одном задании пула (по умолчанию: 256)')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.excel_file):
+        print(f"Ошибка: файл {args.excel_file} не найден")
+        sys.exit(1)
+
+    descriptions = []
+    with VacancyExcelReader(args.excel_file, columns=("description",)) as reader:
+        for _, (description,) in reader.iter_rows():
+            descriptions.append(description)
+            if args.limit is not None and len(descriptions) >= args.limit:
+                break
+    print(f"Прочитано описаний: {len(descriptions)}\n")
+
+    expected, bs4_seconds = measure("BeautifulSoup", lambda items: [clean_html_bs4(item) for item in items], descriptions)
+    fast, fast_seconds = measure("html_cleaner", lambda items: [clean_html(item) for item in items], descriptions)
+
+    with Pool(args.workers) as pool:
+        parallel, parallel_seconds = measure(
+            f"html_cleaner, {args.workers} процессов",
+            lambda items: pool.map(clean_html, items, chunksize=args.chunk_size),
+            descriptions
+        )
+
+    print(f"\nУскорение в одном процессе: x{bs4_seconds / max(fast_seconds, 1e-9):.1f}")
+    print(f"Ускорение в пуле процессов: x{bs4_seconds / max(parallel_seconds, 1e-9):.1f}")
+
+    mismatches = [i for i, (old, new) in enumerate(zip(expected, parallel)) if old != new]
+    print(f"Совпадает с BeautifulSoup: {len(expected) - len(mismatches)}/{len(expected)}")
+    for i in mismatches[:5]:
+        print(f"\nСтрока {i}:\n  BeautifulSoup: {expected[i][:200]!r}\n  html_cleaner:  {parallel[i][:200]!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Потоковое чтение вакансий из Excel файла за один проход.
+Книга открывается в режиме openpyxl read_only: строки разбираются по мере чтения,
+без повторного разбора XML с начала листа для каждого батча.
+"""
+
+from typing import Any, Iterator, List, Optional, Tuple
+
+from openpyxl import load_workbook
+
+
+def parse_id(value: Any) -> Optional[int]:
+    """ID вакансии из ячейки Excel (число, строка или пусто)"""
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class VacancyExcelReader:
+    def __init__(self, excel_file_path: str, columns: Optional[Tuple[str, ...]] = ("id", "description")):
+        """
+        Args:
+            excel_file_path: путь к Excel файлу
+            columns: колонки, значения которых возвращаются для каждой строки (None - все колонки)
+        """
+        self.excel_file_path = excel_file_path
+        self.workbook = load_workbook(excel_file_path, read_only=True, data_only=True)
+        self.sheet = self.workbook.active
+
+        # Позиции нужных колонок по заголовку
+        header = next(self.sheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        names = [str(value).strip() if value is not None else "" for value in header]
+        if columns is None:
+            columns = tuple(name for name in names if name)
+        self.columns = tuple(columns)
+        missing = [column for column in columns if column not in names]
+        if missing:
+            self.close()
+            raise ValueError(f"В файле {excel_file_path} нет колонок: {missing}")
+        self._positions = [names.index(column) for column in columns]
+        self._total_rows: Optional[int] = None
+
+    def __enter__(self) -> "VacancyExcelReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.workbook.close()
+
+    @property
+    def total_rows(self) -> int:
+        """Количество строк данных (без заголовка)"""
+        if self._total_rows is None:
+            # Размер листа берется из его заголовка; если его нет - один проход по строкам
+            max_row = self.sheet.max_row
+            if max_row is None:
+                max_row = sum(1 for _ in self.sheet.iter_rows(values_only=True))
+            self._total_rows = max(max_row - 1, 0)
+        return self._total_rows
+
+    def iter_rows(self, start_row: int = 0) -> Iterator[Tuple[int, Tuple[Any, ...]]]:
+        """Строки данных начиная с start_row (0 - первая строка после заголовка): (номер строки, значения)"""
+        positions = self._positions
+        for row_index, row in enumerate(self.sheet.iter_rows(min_row=start_row + 2, values_only=True), start=start_row):
+            yield row_index, tuple(row[position] if position < len(row) else None for position in positions)
+
+    def iter_batches(self, batch_size: int, start_row: int = 0) -> Iterator[Tuple[int, List[Tuple[Any, ...]]]]:
+        """Батчи по batch_size строк: (номер строки после батча, значения строк)"""
+        batch: List[Tuple[Any, ...]] = []
+        end_row = start_row
+        for row_index, values in self.iter_rows(start_row):
+            batch.append(values)
+            end_row = row_index + 1
+            if len(batch) >= batch_size:
+                yield end_row, batch
+                batch = []
+        if batch:
+            yield end_row, batch
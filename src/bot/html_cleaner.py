@@ -0,0 +1,47 @@
+"""
+Быстрая очистка описаний вакансий от HTML без построения дерева документа.
+Теги вырезаются одним проходом скомпилированных регулярных выражений, сущности
+раскрываются html.unescape. Для корректной разметки результат совпадает с
+BeautifulSoup(html.parser).get_text(separator=' ', strip=True) с последующим
+схлопыванием пробелов; одиночный "<" вплотную перед другим тегом разбирается иначе.
+"""
+
+import html
+import re
+from typing import Any
+
+# Меняется при любом изменении результата очистки - хранилище вакансий очищает описания заново
+CLEANER_VERSION = "2"
+
+# Содержимое этих элементов не является текстом вакансии
+_HIDDEN_RE = re.compile(r"<(script|style)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_COMMENT_RE = re.compile(r"<!--.*?(?:-->|$)", re.DOTALL)
+# Содержимое CDATA - текст, как и в BeautifulSoup
+_CDATA_RE = re.compile(r"<!\[CDATA\[(.*?)\]\]>", re.DOTALL)
+# Тег начинается с буквы, "/", "!" или "?" и заканчивается ">" вне кавычек значений атрибутов:
+# одиночный "<" в тексте ("a < b", "x<y") остается текстом. Кавычки разобраны развернутым циклом,
+# чтобы регулярное выражение не откатывалось экспоненциально
+_TAG_RE = re.compile(r"""</?[a-zA-Z][^>"']*(?:(?:"[^"]*"|'[^']*')[^>"']*)*>|<[!?][^>]*>""")
+
+
+def clean_html(text: Any) -> str:
+    """Удаляет HTML теги и лишние пробелы из текста"""
+    if text is None or text != text:  # None и NaN из pandas
+        return ""
+    text = str(text)
+
+    if "<" in text:
+        # Редкие конструкции проверяются подстрокой - это дешевле прохода регулярным выражением
+        lowered = text.lower()
+        if "<script" in lowered or "<style" in lowered:
+            text = _HIDDEN_RE.sub(" ", text)
+        if "<!--" in text:
+            text = _COMMENT_RE.sub(" ", text)
+        if "<![CDATA[" in text:
+            text = _CDATA_RE.sub(r" \1 ", text)
+        text = _TAG_RE.sub(" ", text)
+    if "&" in text:
+        text = html.unescape(text)
+
+    # str.split() делит по тем же Unicode-пробелам, что и \s, но без регулярного выражения
+    return " ".join(text.split())
@@ -0,0 +1,94 @@
+"""
+Размеченный корпус для дистилляции: ответы Qwen из хранилища результатов process_vacs
+и merged_results.csv, объединенные с очищенными описаниями из Excel файла.
+"""
+
+import os
+import sys
+import zlib
+from typing import Dict, List, Set, Tuple
+
+import pandas as pd
+
+# Каталог навыков лежит рядом с сервером извлечения навыков
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ai"))
+
+from progress_journal import ProgressJournal
+from skill_catalog import SkillCatalog
+from vacancy_processor import open_vacancy_store
+
+Label = Tuple[str, str]
+
+
+def split_skills(value) -> List[str]:
+    """Строка навыков через запятую из CSV -> список"""
+    if pd.isna(value):
+        return []
+    return [skill.strip() for skill in str(value).split(",") if skill.strip() and skill.strip() != "nan"]
+
+
+def to_label_set(row, catalog: SkillCatalog) -> Set[Label]:
+    """Навыки строки результатов -> метки каталога"""
+    label_set = set()
+    for kind, column in (("hard", "hard_skills"), ("soft", "soft_skills")):
+        for skill in split_skills(row.get(column)):
+            # Навыки вне каталога не обучаются - их нельзя выдать в ответе
+            found = catalog.find(kind, skill)
+            if found is not None:
+                label_set.add((kind, found))
+    return label_set
+
+
+def load_labels(labels_dir: str, catalog: SkillCatalog) -> Dict[int, Set[Label]]:
+    """
+    Метки по ID вакансии; merged_results.csv (с дозаполненными навыками) важнее хранилища
+    результатов, а оно - файлов {offset}.csv. Журнал прогресса открывается только для чтения.
+    """
+    rows = []
+    # Результаты, сохраненные до появления хранилища, лежат в файлах {offset}.csv
+    for filename in sorted(os.listdir(labels_dir)):
+        if filename.endswith(".csv") and filename[:-4].isdigit():
+            rows.extend(row for _, row in pd.read_csv(os.path.join(labels_dir, filename)).iterrows())
+
+    journal_path = os.path.join(labels_dir, "progress.sqlite3")
+    if os.path.exists(journal_path):
+        rows.extend(ProgressJournal(journal_path, read_only=True).iter_results())
+
+    merged_file = os.path.join(labels_dir, "merged_results.csv")
+    if os.path.exists(merged_file):
+        rows.extend(row for _, row in pd.read_csv(merged_file).iterrows())
+
+    labels: Dict[int, Set[Label]] = {}
+    for row in rows:
+        if pd.isna(row["id"]):
+            continue
+        label_set = to_label_set(row, catalog)
+        # Пустой ответ - скорее сбой генерации, чем отсутствие навыков
+        if label_set:
+            labels[int(row["id"])] = label_set
+
+    return labels
+
+
+def load_descriptions(excel_file: str, ids: Set[int]) -> Dict[int, str]:
+    """Очищенные описания вакансий с заданными ID из индексированного хранилища"""
+    descriptions = open_vacancy_store(excel_file).get_descriptions(ids)
+    return {vacancy_id: description for vacancy_id, description in descriptions.items() if description}
+
+
+def is_holdout(vacancy_id: int, holdout_percent: int) -> bool:
+    """Стабильное разбиение: вакансия всегда попадает в одну и ту же часть выборки"""
+    return zlib.crc32(str(vacancy_id).encode("utf-8")) % 100 < holdout_percent
+
+
+def load_corpus(
+    excel_file: str,
+    labels_dir: str,
+    catalog: SkillCatalog
+) -> List[Tuple[int, str, Set[Label]]]:
+    """Список (ID, описание, метки) для всех размеченных вакансий"""
+    labels = load_labels(labels_dir, catalog)
+    print(f"Размечено вакансий: {len(labels)}")
+    descriptions = load_descriptions(excel_file, set(labels))
+    print(f"Найдено описаний: {len(descriptions)}")
+    return [(vacancy_id, descriptions[vacancy_id], labels[vacancy_id]) for vacancy_id in sorted(descriptions)]
@@ -13,6 +13,7 @@ import time
 from telegram import Update
 from telegram.ext import Application, CommandHandler, ContextTypes, MessageHandler, filters, ConversationHandler
 from vacancy_processor import VacancyProcessor
+from request_policy import CircuitOpenError, ExtractionError
 from meta import BOT_TOKEN
 
 # Настройка логирования
@@ -22,8 +23,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Количество одновременных запросов к API извлечения навыков (1 - последовательно)
+VACANCY_CONCURRENCY = int(os.getenv("VACANCY_CONCURRENCY", "1"))
+
+# Адреса /api/vacancy реплик сервера извлечения навыков через запятую (по умолчанию API_URL из meta.py)
+API_URLS = [url.strip() for url in os.getenv("API_URLS", "").split(",") if url.strip()]
+
 # Глобальный процессор вакансий
-processor = VacancyProcessor("merged_vacs.xlsx")
+processor = VacancyProcessor("merged_vacs.xlsx", concurrency=VACANCY_CONCURRENCY, api_urls=API_URLS or None)
 
 # Флаг для отслеживания состояния обработки
 processing_active = False
@@ -53,55 +60,50 @@ def process_vacancies_background():
             processing_active = False
             return
         
-        # Определяем с какой строки начинать (проверяем уже обработанные файлы)
-        process_dir = processor.output_dir
-        csv_files = []
-        max_offset = 0
-        
-        if os.path.exists(process_dir):
-            csv_files = [f for f in os.listdir(process_dir) if f.endswith('.csv')]
-            if csv_files:
-                # Находим максимальный offset из имен файлов
-                offsets = []
-                for file in csv_files:
-                    try:
-                        offset = int(file.replace('.csv', ''))
-                        offsets.append(offset)
-                    except ValueError:
-                        continue
-                if offsets:
-                    max_offset = max(offsets)
-        
-        start_row = max_offset
-        processed_count = len(csv_files) * 100
-        
-        logger.info(f"Найдено {len(csv_files)} обработанных файлов")
-        logger.info(f"Максимальный offset: {max_offset}")
+        # Точка продолжения из журнала прогресса; обработанные после нее вакансии пропускаются по ID
+        start_row = processor.get_resume_row()
+        
+        logger.info(f"Обработано вакансий: {processor.get_processed_count()}, со сбоями: {processor.get_failed_count()}")
         logger.info(f"Начинаю с строки: {start_row}")
         
+        # Ждем, пока сервер загрузит и прогреет модель
+        logger.info("Ожидаю готовности сервера извлечения навыков...")
+        while processing_active and not processor.wait_until_ready(timeout=0):
+            time.sleep(10)
+        
         batch_size = 100
         current_row = start_row
         batch_count = 0
         
-        while current_row < total_rows and processing_active:
-            logger.info(f"--- Батч {batch_count + 1} ---")
-            logger.info(f"Обработка строк {current_row} - {min(current_row + batch_size, total_rows)}")
+        # Файл читается за один проход: батчи выдаются по мере чтения строк
+        for offset, vacancies in processor.iter_vacancy_batches(batch_size, start_row):
+            if not processing_active:
+                break
             
-            # Читаем батч вакансий
-            vacancies = processor.read_vacancies_batch(batch_size, current_row)
+            logger.info(f"--- Батч {batch_count + 1} ---")
+            logger.info(f"Обработка строк {current_row} - {offset}")
             
             if not vacancies:
                 logger.info("Нет данных для обработки в этом батче")
-                break
+                processor.journal.advance(current_row, offset)
+                current_row = offset
+                continue
             
             logger.info(f"Загружено {len(vacancies)} вакансий из батча")
             
             # Обрабатываем батч
-            offset = current_row + len(vacancies)
-            success = processor.process_batch(vacancies, offset)
+            success = processor.process_batch(vacancies, offset, current_row)
+            
+            # Выключатель разомкнут после серии сбоев: ждем восстановления сервера и повторяем батч
+            while not success and processing_active and processor.circuit_breaker.state != "closed":
+                logger.warning("Сервер извлечения навыков недоступен, ожидаю восстановления...")
+                time.sleep(processor.circuit_breaker.reset_timeout)
+                while processing_active and not processor.wait_until_ready(timeout=0):
+                    time.sleep(10)
+                success = processor.process_batch(vacancies, offset, current_row)
             
             if success:
-                logger.info(f"Батч успешно обработан и сохранен как {offset}.csv")
+                logger.info(f"Батч до {offset} успешно обработан")
                 new_processed_count = processor.get_processed_count()
                 logger.info(f"Всего обработано вакансий: {new_processed_count}")
             else:
@@ -109,7 +111,7 @@ def process_vacancies_background():
                 break
             
             # Переходим к следующему батчу
-            current_row += len(vacancies)
+            current_row = offset
             batch_count += 1
             
             # Показываем прогресс
@@ -136,7 +138,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
 Доступные команды:
 /get_process - показать количество обработанных вакансий
 /get_by_offset - получить CSV файл по offset
-/merge_vacs - объединить все CSV файлы в один
+/merge_vacs - выгрузить все результаты в один CSV файл
 /merge_by_id - объединить обработанные данные с оригинальным файлом (только обработанные)
 /fill_empty - заполнить пустые навыки в merged_results.csv
 /stop_fill_empty - остановить заполнение пустых навыков
@@ -154,12 +156,12 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 📋 Доступные команды:
 
 /get_process - Показывает количество обработанных вакансий
-Считается как: количество файлов в папке process_vacs × 100
+Считается по журналу прогресса: каждая вакансия учитывается после ответа API
 
-/get_by_offset - Возвращает CSV файл по offset
-Введите offset (4 = 100.csv, 150 = 200.csv и т.д.)
+/get_by_offset - Возвращает CSV файл батча по offset
+Введите offset (4 = 100.csv, 150 = 200.csv и т.д.), файл выгружается из хранилища результатов
 
-/merge_vacs - Объединяет все CSV файлы в один merged_results.csv
+/merge_vacs - Выгружает все результаты из хранилища в merged_results.csv
 Полезно для создания единого файла со всеми обработанными данными
 
 /merge_by_id - Объединяет все обработанные вакансии с исходным файлом
@@ -191,12 +193,6 @@ async def get_process(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
         processed_count = processor.get_processed_count()
         total_rows = processor.get_total_rows()
         
-        # Получаем список файлов для детальной информации
-        process_dir = processor.output_dir
-        csv_files = []
-        if os.path.exists(process_dir):
-            csv_files = sorted([f for f in os.listdir(process_dir) if f.endswith('.csv')])
-        
         status_icon = "🔄" if processing_active else "⏸️"
         status_text = "активна" if processing_active else "остановлена"
         
@@ -212,8 +208,9 @@ async def get_process(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
 {status_icon} Обработка: {status_text}
 {fill_status_icon} Заполнение пустых: {fill_status_text}
 ✅ Обработано вакансий: {processed_count}
-📁 Количество CSV файлов: {len(csv_files)}
+⚠️ Не получено из-за сбоев: {processor.get_failed_count()}
 📄 Общее количество вакансий: {total_rows}
+⏭ Продолжение со строки: {processor.get_resume_row()}
 🔍 Пустых навыков: {empty_skills_count}
 
 """
@@ -222,11 +219,22 @@ async def get_process(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
             progress = (processed_count / total_rows) * 100
             message += f"📈 Прогресс: {progress:.1f}%\n"
         
-        if csv_files:
-            message += f"\n📂 Последние файлы:\n"
-            # Показываем последние 5 файлов
-            for file in csv_files[-5:]:
-                message += f"• {file}\n"
+        message += "\n🖥 Реплики сервера:\n"
+        for replica in processor.replicas.stats():
+            replica_icon = "🟢" if replica["active"] else f"🔴 ({replica['eject_reason']})"
+            latency = f"{replica['avg_latency']:.1f} с" if replica["avg_latency"] is not None else "-"
+            message += (
+                f"{replica_icon} {replica['url']}: {replica['throughput'] * 60:.0f} вакансий/мин, "
+                f"в работе {replica['outstanding']}, успешно {replica['completed']}, "
+                f"сбоев {replica['failed']}, задержка {latency}\n"
+            )
+        
+        # Последние 5 батчей из хранилища результатов (CSV выгружается через /get_by_offset)
+        batch_offsets = processor.journal.batch_offsets()
+        if batch_offsets:
+            message += f"\n📂 Последние батчи:\n"
+            for batch_offset in batch_offsets[-5:]:
+                message += f"• {batch_offset}.csv\n"
         
         await update.message.reply_text(message)
         
@@ -312,20 +320,15 @@ async def get_by_offset_handle(update: Update, context: ContextTypes.DEFAULT_TYP
             await update.message.reply_text("❌ Offset должен быть положительным числом")
             return GET_OFFSET
         
-        # Определяем имя файла на основе offset
-        # offset 4 → 100.csv, offset 150 → 200.csv
-        file_offset = ((offset - 1) // 100 + 1) * 100
-        filename = f"{file_offset}.csv"
-        filepath = os.path.join(processor.output_dir, filename)
-        
-        # Проверяем существование файла
-        if not os.path.exists(filepath):
-            await update.message.reply_text(
-                f"❌ Файл {filename} не найден!\n"
-                f"Offset {offset} соответствует файлу {filename}, который еще не обработан."
-            )
+        # Выгружаем батч, в который попала строка offset (offset 4 → 100.csv, offset 150 → 200.csv)
+        filepath = processor.export_batch_csv(offset - 1)
+        
+        if filepath is None:
+            await update.message.reply_text(f"❌ Батч со строкой {offset} еще не обработан!")
             return ConversationHandler.END
         
+        filename = os.path.basename(filepath)
+        
         # Отправляем файл
         await update.message.reply_text(f"📄 Отправляю файл {filename}...")
         
@@ -354,7 +357,7 @@ async def cancel_conversation(update: Update, context: ContextTypes.DEFAULT_TYPE
 async def merge_vacs(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Объединяет все CSV файлы в один и отправляет файл."""
     try:
-        await update.message.reply_text("🔄 Начинаю объединение CSV файлов...")
+        await update.message.reply_text("🔄 Выгружаю результаты из хранилища...")
         
         result = processor.merge_all_csv_files()
         
@@ -384,9 +387,9 @@ async def merge_by_id(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     """Объединяет обработанные данные с оригинальным файлом (только обработанные строки)."""
     try:
         await update.message.reply_text("🔄 Начинаю объединение с оригинальным файлом...")
-        await update.message.reply_text("📊 Этап 1: Объединяю все CSV файлы...")
+        await update.message.reply_text("📊 Этап 1: Выгружаю результаты в merged_results.csv...")
         
-        # Сначала мержим все CSV
+        # Сначала выгружаем все результаты в merged_results.csv
         merge_result = processor.merge_all_csv_files()
         
         await update.message.reply_text("📋 Этап 2: Объединяю с оригинальным файлом...")
@@ -426,6 +429,10 @@ def fill_empty_skills_background():
         total_processed = 0
         batch_size = 10  # Обрабатываем по 10 вакансий за раз
         
+        # Ждем, пока сервер загрузит и прогреет модель
+        while filling_empty_active and not processor.wait_until_ready(timeout=0):
+            time.sleep(10)
+        
         while filling_empty_active:
             # Получаем следующую партию вакансий с пустыми навыками
             empty_vacancies = processor.get_empty_skills_from_merged(limit=batch_size)
@@ -462,7 +469,7 @@ def fill_empty_skills_background():
                 
                 logger.info(f"Тип запроса к API: {skill_type if skill_type else 'both'}")
                 
-                # Повторяем запросы до получения результата
+                # Сбои сети и сервера повторяются внутри request_skills; здесь - повторы при пустом ответе
                 max_attempts = 5
                 attempt = 0
                 skills = None
@@ -471,7 +478,17 @@ def fill_empty_skills_background():
                     attempt += 1
                     logger.info(f"Попытка {attempt}/{max_attempts} для вакансии {vacancy_id}")
                     
-                    skills = processor.send_api_request(description, skill_type)
+                    try:
+                        skills = processor.request_skills(description, skill_type)
+                    except CircuitOpenError as e:
+                        logger.warning(f"Сервер извлечения навыков недоступен: {e}")
+                        skills = None
+                        time.sleep(e.retry_after)
+                        break
+                    except ExtractionError as e:
+                        logger.warning(f"Навыки для вакансии {vacancy_id} не получены: {e}")
+                        skills = None
+                        break
                     
                     # Проверяем, получили ли мы нужные навыки
                     got_needed_skills = False
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Скрипт для офлайн-разметки всего файла вакансий без API.
+Очищенные описания из хранилища вакансий обрабатываются блоками векторизованным матчером навыков
+параллельно на всех ядрах процессора.
+"""
+
+import os
+import sys
+import csv
+import time
+import argparse
+from multiprocessing import Pool
+from typing import Dict, List, Tuple
+
+# Матчер и каталог навыков лежат рядом с сервером извлечения навыков
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ai"))
+
+from batch_matcher import BatchSkillMatcher
+from skill_catalog import load_catalog
+from vacancy_processor import open_vacancy_store
+from vacancy_store import VacancyStore
+
+# Состояние процесса-воркера: создается один раз в initializer
+_matcher = None
+
+
+def init_worker(limit: int):
+    """Загружает каталог и строит матрицу навыков в каждом процессе"""
+    global _matcher
+    _matcher = BatchSkillMatcher(load_catalog(), limit=limit)
+
+
+def match_block(args: Tuple[List[Tuple[int, str]], str]) -> List[Dict[str, str]]:
+    """Находит навыки для блока вакансий с уже очищенными описаниями"""
+    vacancies, skill_type = args
+
+    skills = _matcher.match_block([description for _, description in vacancies], skill_type)
+
+    return [
+        {
+            "id": vacancy_id,
+            "hard_skills": ",".join(result["hard"]),
+            "soft_skills": ",".join(result["soft"])
+        }
+        for (vacancy_id, _), result in zip(vacancies, skills)
+    ]
+
+
+def read_blocks(store: VacancyStore, block_size: int, skill_type: str):
+    """Читает очищенные описания из хранилища вакансий блоками"""
+    for _, vacancies in store.iter_batches(block_size):
+        if vacancies:
+            yield vacancies, skill_type
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Офлайн-разметка вакансий векторизованным матчером навыков')
+    parser.add_argument('--excel-file', type=str, default='merged_vacs.xlsx',
+                       help='Путь к Excel файлу с вакансиями')
+    parser.add_argument('--output', type=str, default=os.path.join('process_vacs', 'matched_results.csv'),
+                       help='Путь к итоговому CSV файлу')
+    parser.add_argument('--block-size', type=int, default=2000,
+                       help='Количество описаний в одном блоке (по умолчанию: 2000)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                       help='Количество процессов (по умолчанию: все ядра)')
+    parser.add_argument('--skill', type=str, choices=['soft', 'hard'], default=None,
+                       help='Извлекать только один тип навыков')
+    parser.add_argument('--limit', type=int, default=10,
+                       help='Максимальное число навыков каждого типа (по умолчанию: 10)')
+
+    args = parser.parse_args()
+
+    # Проверяем существование файла
+    if not os.path.exists(args.excel_file):
+        print(f"Ошибка: файл {args.excel_file} не найден")
+        sys.exit(1)
+
+    output_dir = os.path.dirname(args.output) or "."
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Хранилище загружается из Excel (с очисткой HTML на всех ядрах) только при изменении файла;
+    # журнал прогресса краулера не открывается
+    store = open_vacancy_store(args.excel_file)
+    print(f"Всего строк в файле: {store.count()}")
+    blocks = read_blocks(store, args.block_size, args.skill)
+
+    print(f"Запуск {args.workers} процессов, размер блока: {args.block_size}")
+    started = time.time()
+    processed = 0
+
+    with open(args.output, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=['id', 'hard_skills', 'soft_skills'])
+        writer.writeheader()
+
+        with Pool(args.workers, initializer=init_worker, initargs=(args.limit,)) as pool:
+            # imap сохраняет порядок блоков - результат идет в порядке файла
+            for results in pool.imap(match_block, blocks):
+                writer.writerows(results)
+                processed += len(results)
+                elapsed = time.time() - started
+                print(f"Обработано {processed} вакансий ({processed / elapsed:.0f} вакансий/с)")
+
+    print(f"\nГотово: {processed} вакансий за {time.time() - started:.1f} с, результат в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
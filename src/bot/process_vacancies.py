@@ -14,12 +14,22 @@ def main():
     parser = argparse.ArgumentParser(description='Обработка вакансий по батчам')
     parser.add_argument('--batch-size', type=int, default=100, 
                        help='Размер батча для обработки (по умолчанию: 100)')
-    parser.add_argument('--start-from', type=int, default=0,
-                       help='Номер строки для начала обработки (по умолчанию: 0)')
+    parser.add_argument('--start-from', type=int, default=None,
+                       help='Номер строки для начала обработки (по умолчанию: продолжить по журналу прогресса)')
     parser.add_argument('--max-batches', type=int, default=None,
                        help='Максимальное количество батчей для обработки')
     parser.add_argument('--excel-file', type=str, default='merged_vacs.xlsx',
                        help='Путь к Excel файлу с вакансиями')
+    parser.add_argument('--bulk', action='store_true',
+                       help='Отправлять батч одним запросом к /api/vacancies')
+    parser.add_argument('--concurrency', type=int, default=1,
+                       help='Количество одновременных запросов к API (по умолчанию: 1 - последовательно)')
+    parser.add_argument('--api-url', type=str, action='append', default=None,
+                       help='Адрес /api/vacancy реплики сервера; можно указать несколько раз (по умолчанию: API_URL из meta.py)')
+    parser.add_argument('--ready-timeout', type=float, default=900,
+                       help='Сколько секунд ждать готовности сервера извлечения навыков (по умолчанию: 900)')
+    parser.add_argument('--export-csv', action='store_true',
+                       help='Выгрузить результаты из хранилища в файлы {offset}.csv и merged_results.csv и выйти')
     
     args = parser.parse_args()
     
@@ -29,7 +39,17 @@ def main():
         sys.exit(1)
     
     # Создаем процессор вакансий
-    processor = VacancyProcessor(args.excel_file)
+    processor = VacancyProcessor(
+        args.excel_file,
+        use_bulk_api=args.bulk,
+        concurrency=args.concurrency,
+        api_urls=args.api_url
+    )
+    
+    if args.export_csv:
+        print(f"Выгружено файлов батчей: {processor.export_batch_csvs()}")
+        print(processor.merge_all_csv_files())
+        return
     
     # Получаем общее количество вакансий
     total_rows = processor.get_total_rows()
@@ -41,37 +61,36 @@ def main():
     
     # Вычисляем параметры обработки
     batch_size = args.batch_size
-    start_row = args.start_from
+    start_row = args.start_from if args.start_from is not None else processor.get_resume_row()
     current_row = start_row
     batch_count = 0
     
+    print("Ожидаем готовности сервера извлечения навыков...")
+    if not processor.wait_until_ready(timeout=args.ready_timeout):
+        print(f"Ошибка: сервер извлечения навыков не готов спустя {args.ready_timeout:.0f} с")
+        sys.exit(1)
+    
     print(f"Начинаем обработку с строки {start_row}")
     print(f"Размер батча: {batch_size}")
     
-    while current_row < total_rows:
-        # Проверяем лимит на количество батчей
-        if args.max_batches and batch_count >= args.max_batches:
-            print(f"Достигнут лимит батчей: {args.max_batches}")
-            break
-        
+    # Файл читается за один проход: батчи выдаются по мере чтения строк
+    for offset, vacancies in processor.iter_vacancy_batches(batch_size, start_row):
         print(f"\n--- Батч {batch_count + 1} ---")
-        print(f"Обработка строк {current_row} - {min(current_row + batch_size, total_rows)}")
-        
-        # Читаем батч вакансий
-        vacancies = processor.read_vacancies_batch(batch_size, current_row)
+        print(f"Обработка строк {current_row} - {offset}")
         
         if not vacancies:
             print("Нет данных для обработки в этом батче")
-            break
+            processor.journal.advance(current_row, offset)
+            current_row = offset
+            continue
         
         print(f"Загружено {len(vacancies)} вакансий из батча")
         
         # Обрабатываем батч
-        offset = current_row + len(vacancies)
-        success = processor.process_batch(vacancies, offset)
+        success = processor.process_batch(vacancies, offset, current_row)
         
         if success:
-            print(f"Батч успешно обработан и сохранен как {offset}.csv")
+            print(f"Батч до {offset} успешно обработан")
             processed_count = processor.get_processed_count()
             print(f"Всего обработано вакансий: {processed_count}")
         else:
@@ -79,16 +98,24 @@ def main():
             break
         
         # Переходим к следующему батчу
-        current_row += len(vacancies)
+        current_row = offset
         batch_count += 1
         
         # Показываем прогресс
         progress = (current_row / total_rows) * 100
         print(f"Прогресс: {progress:.1f}% ({current_row}/{total_rows})")
+        
+        # Проверяем лимит на количество батчей
+        if args.max_batches and batch_count >= args.max_batches:
+            print(f"Достигнут лимит батчей: {args.max_batches}")
+            break
     
     print(f"\nОбработка завершена!")
     final_count = processor.get_processed_count()
     print(f"Итого обработано вакансий: {final_count}")
+    
+    for replica in processor.replicas.stats():
+        print(f"Реплика {replica['url']}: успешно {replica['completed']}, сбоев {replica['failed']}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,269 @@
+"""
+Журнал прогресса и хранилище результатов обработки вакансий в SQLite (WAL).
+Для каждой вакансии хранится статус, результат, число попыток и последняя ошибка;
+запись делается сразу после ответа API, поэтому сбой посреди батча теряет не больше
+одной вакансии. Счетчики по статусам поддерживаются триггерами и читаются за O(1).
+CSV файлы (по батчам и общий) выгружаются из хранилища по запросу.
+"""
+
+import csv
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# Размер пачки ID в запросах вида "WHERE id IN (...)"
+LOOKUP_CHUNK_SIZE = 500
+
+# Сколько строк выгрузки читается за один запрос (блокировка между запросами отпускается)
+EXPORT_PAGE_SIZE = 10000
+
+
+class ProgressJournal:
+    def __init__(self, db_path: str, read_only: bool = False):
+        """
+        Args:
+            db_path: путь к файлу SQLite
+            read_only: только чтение существующего журнала (обучение, бенчмарки) - схема
+                не создается, точка продолжения и результаты не меняются
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        if read_only:
+            uri = Path(os.path.abspath(db_path)).as_uri() + "?mode=ro"
+            self._db = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            return
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # В WAL-режиме NORMAL не теряет согласованность при сбое процесса и не делает fsync на каждую запись
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS vacancies (
+                id INTEGER PRIMARY KEY,
+                status TEXT NOT NULL,
+                hard_skills TEXT NOT NULL DEFAULT '',
+                soft_skills TEXT NOT NULL DEFAULT '',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                batch_offset INTEGER NOT NULL,
+                batch_start INTEGER,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS vacancies_batch ON vacancies (batch_offset);
+            CREATE TABLE IF NOT EXISTS counters (status TEXT PRIMARY KEY, count INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+
+            -- Триггеры пересоздаются при открытии, чтобы журналы старых версий получили исправления.
+            -- Внутри триггера, вызванного upsert, OR IGNORE заменяется политикой конфликта внешнего
+            -- запроса (ABORT), поэтому счетчик создается через NOT EXISTS
+            DROP TRIGGER IF EXISTS vacancies_insert;
+            DROP TRIGGER IF EXISTS vacancies_status;
+            CREATE TRIGGER vacancies_insert AFTER INSERT ON vacancies BEGIN
+                INSERT INTO counters (status, count)
+                SELECT NEW.status, 0 WHERE NOT EXISTS (SELECT 1 FROM counters WHERE status = NEW.status);
+                UPDATE counters SET count = count + 1 WHERE status = NEW.status;
+            END;
+            CREATE TRIGGER vacancies_status AFTER UPDATE OF status ON vacancies
+            WHEN OLD.status != NEW.status BEGIN
+                UPDATE counters SET count = count - 1 WHERE status = OLD.status;
+                INSERT INTO counters (status, count)
+                SELECT NEW.status, 0 WHERE NOT EXISTS (SELECT 1 FROM counters WHERE status = NEW.status);
+                UPDATE counters SET count = count + 1 WHERE status = NEW.status;
+            END;
+
+            INSERT OR IGNORE INTO meta (key, value) VALUES ('resume_row', '0');
+            """
+        )
+        # Журналы, созданные до появления batch_start: строка начала их батчей неизвестна
+        columns = {column for _, column, *_ in self._db.execute("PRAGMA table_info(vacancies)")}
+        if "batch_start" not in columns:
+            self._db.execute("ALTER TABLE vacancies ADD COLUMN batch_start INTEGER")
+        self._db.commit()
+
+    def record(
+        self,
+        vacancy_id: int,
+        batch_offset: int,
+        hard_skills: List[str] = None,
+        soft_skills: List[str] = None,
+        error: str = None,
+        batch_start: int = None
+    ):
+        """Записывает результат вакансии (error - навыки не получены из-за сбоя, batch_start - строка начала батча)"""
+        status = STATUS_FAILED if error is not None else STATUS_DONE
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO vacancies (id, status, hard_skills, soft_skills, attempts, error, batch_offset, batch_start, updated_at) "
+                "VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET status = excluded.status, "
+                # Результат успешной попытки не затирается последующим сбоем
+                "hard_skills = CASE WHEN excluded.status = 'done' THEN excluded.hard_skills ELSE hard_skills END, "
+                "soft_skills = CASE WHEN excluded.status = 'done' THEN excluded.soft_skills ELSE soft_skills END, "
+                "attempts = attempts + 1, error = excluded.error, "
+                "batch_offset = excluded.batch_offset, batch_start = excluded.batch_start, updated_at = excluded.updated_at "
+                "WHERE status != 'done'",
+                (
+                    vacancy_id, status,
+                    ",".join(hard_skills or []), ",".join(soft_skills or []),
+                    error, batch_offset, batch_start, time.time()
+                )
+            )
+            self._db.commit()
+
+    def done_ids(self, ids: Iterable[int]) -> Set[int]:
+        """ID из списка, для которых навыки уже получены"""
+        ids = list(dict.fromkeys(ids))
+        done = set()
+        with self._lock:
+            for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+                chunk = ids[start:start + LOOKUP_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                done.update(
+                    vacancy_id for (vacancy_id,) in self._db.execute(
+                        f"SELECT id FROM vacancies WHERE status = 'done' AND id IN ({placeholders})", chunk
+                    )
+                )
+        return done
+
+    def results(self, ids: Iterable[int]) -> List[Dict[str, str]]:
+        """Навыки обработанных вакансий в порядке ids (как строки для CSV)"""
+        ids = list(dict.fromkeys(ids))
+        found = {}
+        with self._lock:
+            for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+                chunk = ids[start:start + LOOKUP_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                for vacancy_id, hard_skills, soft_skills in self._db.execute(
+                    f"SELECT id, hard_skills, soft_skills FROM vacancies WHERE status = 'done' AND id IN ({placeholders})",
+                    chunk
+                ):
+                    found[vacancy_id] = {"id": vacancy_id, "hard_skills": hard_skills, "soft_skills": soft_skills}
+        return [found[vacancy_id] for vacancy_id in ids if vacancy_id in found]
+
+    def get_result(self, vacancy_id: int) -> Optional[Dict[str, str]]:
+        """Навыки обработанной вакансии по ID"""
+        results = self.results([vacancy_id])
+        return results[0] if results else None
+
+    def update_skills(self, vacancy_id: int, hard_skills: List[str], soft_skills: List[str]):
+        """Заменяет навыки обработанной вакансии (дозаполнение пустых навыков)"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE vacancies SET hard_skills = ?, soft_skills = ?, updated_at = ? WHERE id = ? AND status = 'done'",
+                (",".join(hard_skills or []), ",".join(soft_skills or []), time.time(), vacancy_id)
+            )
+            self._db.commit()
+
+    def iter_results(self, batch_offset: int = None) -> Iterator[Dict[str, str]]:
+        """Навыки всех обработанных вакансий (или одного батча) в порядке батчей, постранично"""
+        condition = "status = 'done'" if batch_offset is None else "status = 'done' AND batch_offset = ?"
+        bounds = () if batch_offset is None else (batch_offset,)
+        last = (-1, -1)
+        while True:
+            with self._lock:
+                page = self._db.execute(
+                    f"SELECT batch_offset, id, hard_skills, soft_skills FROM vacancies "
+                    f"WHERE {condition} AND (batch_offset, id) > (?, ?) ORDER BY batch_offset, id LIMIT ?",
+                    (*bounds, *last, EXPORT_PAGE_SIZE)
+                ).fetchall()
+            for _, vacancy_id, hard_skills, soft_skills in page:
+                yield {"id": vacancy_id, "hard_skills": hard_skills, "soft_skills": soft_skills}
+            if len(page) < EXPORT_PAGE_SIZE:
+                return
+            last = page[-1][:2]
+
+    def batch_offsets(self) -> List[int]:
+        """Offset всех батчей с обработанными вакансиями"""
+        with self._lock:
+            return [offset for (offset,) in self._db.execute("SELECT DISTINCT batch_offset FROM vacancies ORDER BY batch_offset")]
+
+    def batch_offset_for_row(self, row: int) -> Optional[int]:
+        """
+        Offset батча, в который попала строка файла row (offset - номер строки после батча);
+        None, если батч [начало, offset) со строкой row не обрабатывался (например, пропуск между батчами)
+        """
+        with self._lock:
+            found = self._db.execute(
+                "SELECT batch_offset, MIN(batch_start), COUNT(batch_start) = COUNT(*) FROM vacancies "
+                "WHERE batch_offset > ? GROUP BY batch_offset ORDER BY batch_offset LIMIT 1",
+                (row,)
+            ).fetchone()
+        if found is None:
+            return None
+        batch_offset, batch_start, start_known = found
+        # Начало батча неизвестно только для записей журналов старых версий - доверяем offset
+        if start_known and batch_start > row:
+            return None
+        return batch_offset
+
+    def count(self, status: str = STATUS_DONE) -> int:
+        """Количество вакансий со статусом (из счетчика, без подсчета строк)"""
+        with self._lock:
+            row = self._db.execute("SELECT count FROM counters WHERE status = ?", (status,)).fetchone()
+        return row[0] if row else 0
+
+    def resume_row(self) -> int:
+        """Строка файла, до которой все вакансии обработаны; дальше уже обработанные пропускаются по ID"""
+        return int(self._get_meta("resume_row", "0"))
+
+    def advance(self, start_row: int, end_row: int):
+        """Сдвигает точку продолжения, если батч [start_row, end_row) продолжает обработанную часть файла"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE meta SET value = ? WHERE key = 'resume_row' AND CAST(value AS INTEGER) = ?",
+                (str(end_row), start_row)
+            )
+            self._db.commit()
+
+    def _get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def import_csv_results(self, output_dir: str) -> int:
+        """Один раз переносит результаты из файлов {offset}.csv, созданных до появления журнала, и сдвигает точку продолжения"""
+        if self._get_meta("csv_imported") is not None:
+            return 0
+
+        imported = 0
+        # Старый скрипт сдвигал строку начала на число вакансий батча: батч {offset}.csv из n строк
+        # начинался со строки offset - n. Конец батча -> его начало
+        batch_starts: Dict[int, int] = {}
+        with self._lock:
+            for filename in os.listdir(output_dir):
+                if not filename.endswith(".csv") or not filename[:-4].isdigit():
+                    continue
+                offset = int(filename[:-4])
+                with open(os.path.join(output_dir, filename), newline="", encoding="utf-8") as csvfile:
+                    rows = [
+                        (int(float(row["id"])), row.get("hard_skills") or "", row.get("soft_skills") or "")
+                        for row in csv.DictReader(csvfile) if row.get("id")
+                    ]
+                batch_starts[offset] = offset - len(rows)
+                cursor = self._db.executemany(
+                    "INSERT OR IGNORE INTO vacancies (id, status, hard_skills, soft_skills, attempts, batch_offset, batch_start, updated_at) "
+                    "VALUES (?, 'done', ?, ?, 1, ?, ?, ?)",
+                    [(*row, offset, batch_starts[offset], time.time()) for row in rows]
+                )
+                imported += cursor.rowcount
+
+            # Точка продолжения - конец непрерывной цепочки батчей от текущей точки
+            resume_row = int(self._db.execute("SELECT value FROM meta WHERE key = 'resume_row'").fetchone()[0])
+            next_batch = {start: offset for offset, start in sorted(batch_starts.items()) if offset > start}
+            while resume_row in next_batch:
+                resume_row = next_batch[resume_row]
+            self._db.execute("UPDATE meta SET value = ? WHERE key = 'resume_row'", (str(resume_row),))
+
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('csv_imported', '1')")
+            self._db.commit()
+        return imported
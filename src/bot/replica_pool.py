@@ -0,0 +1,182 @@
+"""
+Балансировка запросов между репликами сервера извлечения навыков на стороне клиента.
+Запрос уходит на реплику с наименьшим числом запросов в работе; фоновый поток опрашивает
+/ready (или /health у серверов без /ready), исключает недоступные и медленные реплики
+и возвращает их после восстановления.
+"""
+
+import collections
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+# Окно, за которое считается пропускная способность реплики
+THROUGHPUT_WINDOW_SECONDS = 60
+
+
+class Replica:
+    def __init__(self, api_url: str):
+        self.api_url = api_url
+        # Корень сервера для служебных эндпоинтов (/ready, /health)
+        self.base_url = api_url.rsplit("/api/", 1)[0]
+        self.outstanding = 0
+        self.completed = 0
+        self.failed = 0
+        self.consecutive_failures = 0
+        self.avg_latency: Optional[float] = None
+        self.ejected_until: Optional[float] = None
+        self.eject_reason: Optional[str] = None
+        self.completions = collections.deque()
+
+    @property
+    def ejected(self) -> bool:
+        return self.ejected_until is not None
+
+    def throughput(self, now: float) -> float:
+        """Успешных ответов в секунду за последнее окно"""
+        while self.completions and now - self.completions[0] > THROUGHPUT_WINDOW_SECONDS:
+            self.completions.popleft()
+        return len(self.completions) / THROUGHPUT_WINDOW_SECONDS
+
+
+class ReplicaPool:
+    def __init__(
+        self,
+        api_urls: List[str],
+        health_interval: float = 10.0,
+        eject_seconds: float = 30.0,
+        max_consecutive_failures: int = 3,
+        slow_factor: float = 3.0
+    ):
+        """
+        Args:
+            api_urls: адреса эндпоинта /api/vacancy всех реплик
+            health_interval: период опроса /ready (секунды)
+            eject_seconds: минимальное время исключения реплики
+            max_consecutive_failures: сколько сбоев подряд исключают реплику
+            slow_factor: во сколько раз средняя задержка реплики может превышать лучшую среди реплик
+        """
+        if not api_urls:
+            raise ValueError("Не указан ни один адрес сервера извлечения навыков")
+        self.replicas = [Replica(url) for url in dict.fromkeys(api_urls)]
+        self.health_interval = health_interval
+        self.eject_seconds = eject_seconds
+        self.max_consecutive_failures = max_consecutive_failures
+        self.slow_factor = slow_factor
+        self._lock = threading.Lock()
+        self._health_thread: Optional[threading.Thread] = None
+        self._session = requests.Session()
+
+    def acquire(self) -> Replica:
+        """Реплика с наименьшим числом запросов в работе; если исключены все - та, что исключена раньше"""
+        self._start_health_checks()
+        with self._lock:
+            candidates = [replica for replica in self.replicas if not replica.ejected] or [
+                min(self.replicas, key=lambda replica: replica.ejected_until)
+            ]
+            fewest = min(replica.outstanding for replica in candidates)
+            # Случайный выбор среди равных, чтобы не нагружать всегда первую реплику
+            replica = random.choice([replica for replica in candidates if replica.outstanding == fewest])
+            replica.outstanding += 1
+            return replica
+
+    def release(self, replica: Replica, success: bool, latency: Optional[float] = None, overloaded: bool = False):
+        """
+        Учитывает результат запроса; сбои подряд и медленные ответы исключают реплику.
+        Ответ перегруженной реплики (429/503) не сбой и не замер задержки: реплика исправна,
+        а при загрузке всего парка ее исключение только перенесло бы нагрузку на остальные.
+        """
+        with self._lock:
+            replica.outstanding -= 1
+            if overloaded:
+                return
+            now = time.monotonic()
+            if not success:
+                replica.failed += 1
+                replica.consecutive_failures += 1
+                if replica.consecutive_failures >= self.max_consecutive_failures:
+                    self._eject(replica, f"{replica.consecutive_failures} сбоев подряд", now)
+                return
+
+            replica.completed += 1
+            replica.consecutive_failures = 0
+            replica.completions.append(now)
+            if latency is None:
+                return
+            replica.avg_latency = latency if replica.avg_latency is None else 0.8 * replica.avg_latency + 0.2 * latency
+
+            active = [r for r in self.replicas if not r.ejected and r.avg_latency is not None]
+            if len(active) > 1 and replica in active:
+                best = min(r.avg_latency for r in active)
+                if replica.avg_latency > self.slow_factor * best:
+                    self._eject(replica, f"средняя задержка {replica.avg_latency:.1f} с", now)
+
+    def _eject(self, replica: Replica, reason: str, now: float):
+        if not replica.ejected:
+            print(f"Реплика {replica.base_url} исключена: {reason}")
+        replica.ejected_until = now + self.eject_seconds
+        replica.eject_reason = reason
+
+    def _start_health_checks(self):
+        # Поток опроса создается при первом запросе - процессоры, которые только читают вакансии, его не запускают
+        with self._lock:
+            if self._health_thread is None:
+                self._health_thread = threading.Thread(target=self._run_health_checks, name="replica-health", daemon=True)
+                self._health_thread.start()
+
+    def _run_health_checks(self):
+        while True:
+            for replica in self.replicas:
+                try:
+                    status = self.probe(replica).status_code
+                except requests.RequestException:
+                    status = None
+                with self._lock:
+                    now = time.monotonic()
+                    # Исключают только недоступность и 5xx; прочие ответы не говорят о сбое реплики
+                    if status is None:
+                        self._eject(replica, "не отвечает на проверку готовности", now)
+                    elif status >= 500:
+                        self._eject(replica, f"проверка готовности вернула {status}", now)
+                    elif status == 200 and replica.ejected and now >= replica.ejected_until:
+                        # Статистика задержки начинается заново, чтобы реплику сразу не исключить снова
+                        replica.ejected_until = None
+                        replica.eject_reason = None
+                        replica.consecutive_failures = 0
+                        replica.avg_latency = None
+                        print(f"Реплика {replica.base_url} возвращена в работу")
+            time.sleep(self.health_interval)
+
+    def probe(self, replica: Replica, timeout: float = 5) -> requests.Response:
+        """Ответ проверки готовности; серверы без /ready (404) проверяются по /health"""
+        response = self._session.get(f"{replica.base_url}/ready", timeout=timeout)
+        if response.status_code == 404:
+            response = self._session.get(f"{replica.base_url}/health", timeout=timeout)
+        return response
+
+    def is_ready(self, replica: Replica) -> bool:
+        try:
+            return self.probe(replica).status_code == 200
+        except requests.RequestException:
+            return False
+
+    def stats(self) -> List[Dict]:
+        """Состояние и пропускная способность каждой реплики"""
+        with self._lock:
+            now = time.monotonic()
+            return [
+                {
+                    "url": replica.base_url,
+                    "active": not replica.ejected,
+                    "eject_reason": replica.eject_reason,
+                    "outstanding": replica.outstanding,
+                    "completed": replica.completed,
+                    "failed": replica.failed,
+                    "avg_latency": replica.avg_latency,
+                    "throughput": replica.throughput(now)
+                }
+                for replica in self.replicas
+            ]
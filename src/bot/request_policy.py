@@ -0,0 +1,156 @@
+"""
+Политика запросов к серверу извлечения навыков: повторы с экспоненциальной
+задержкой и джиттером, автоматический выключатель (circuit breaker) при серии сбоев
+и AIMD-регулировка числа одновременных запросов по задержке и ответам 429/503.
+"""
+
+import random
+import threading
+import time
+from typing import Optional
+
+# Ответы перегруженного сервера: запрос стоит повторить позже с меньшей нагрузкой
+OVERLOAD_STATUSES = {429, 503}
+
+
+class ExtractionError(Exception):
+    """Навыки не получены: запрос не удался после всех повторов"""
+
+    def __init__(self, message: str, attempts: int):
+        super().__init__(message)
+        self.attempts = attempts
+
+
+class CircuitOpenError(ExtractionError):
+    """Выключатель разомкнут после серии сбоев, запросы временно не отправляются"""
+
+    def __init__(self, retry_after: float, attempts: int = 0):
+        super().__init__(f"Сервер недоступен, повтор через {retry_after:.0f} с", attempts)
+        self.retry_after = retry_after
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+        """
+        Args:
+            max_attempts: максимум попыток на один запрос
+            base_delay: задержка перед первым повтором (секунды)
+            max_delay: верхняя граница задержки
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Задержка перед повтором после попытки attempt (с 1): full jitter, не меньше Retry-After"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if retry_after is not None:
+            # Джиттер сверху, чтобы клиенты не вернулись к серверу одновременно
+            delay = max(delay, retry_after + random.uniform(0, self.base_delay))
+        return delay
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            failure_threshold: сколько сбоев подряд размыкают выключатель
+            reset_timeout: через сколько секунд пропустить пробный запрос
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return "open"
+            return "half-open"
+
+    def before_request(self):
+        """Пропускает запрос или бросает CircuitOpenError; в полуоткрытом состоянии - один пробный"""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+            if remaining > 0:
+                raise CircuitOpenError(remaining)
+            if self._probe_in_flight:
+                raise CircuitOpenError(self.reset_timeout)
+            self._probe_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            # Неудачный пробный запрос снова размыкает выключатель на полный таймаут
+            if self._probe_in_flight or self.consecutive_failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def release_probe(self):
+        """Пробный запрос завершился без вердикта о здоровье сервера (например, 503 при перегрузке)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+
+class AdaptiveConcurrency:
+    def __init__(self, max_limit: int, min_limit: int = 1, target_latency: float = 30.0, backoff: float = 0.5):
+        """
+        AIMD-лимит одновременных запросов: +1 за каждые limit быстрых ответов,
+        умножение на backoff при перегрузке, таймауте или задержке выше целевой.
+
+        Args:
+            max_limit: верхняя граница (настроенное число одновременных запросов)
+            min_limit: нижняя граница
+            target_latency: задержка ответа (секунды), выше которой нагрузка снижается
+            backoff: множитель снижения лимита
+        """
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Ждет, пока число запросов в работе станет меньше текущего лимита"""
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self, latency: float):
+        if latency > self.target_latency:
+            self.on_overload(latency)
+            return
+        with self._condition:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+    def on_overload(self, latency: float = 0.0):
+        with self._condition:
+            now = time.monotonic()
+            # Ответы на запросы, отправленные до прошлого снижения, лимит повторно не режут
+            if now - self._last_decrease < max(latency, 1.0):
+                return
+            self._last_decrease = now
+            self.limit = max(self.min_limit, self.limit * self.backoff)
@@ -18,6 +18,9 @@ REQUIRED_PACKAGES = [
     'python-telegram-bot',
     'openpyxl',
     'xlrd',
+    'numpy',
+    'scipy',
+    'scikit-learn',
     'telegram'
 ]
 
@@ -94,6 +97,8 @@ def install_dependencies():
             package_import_name = 'telegram'
         elif package == 'beautifulsoup4':
             package_import_name = 'bs4'
+        elif package == 'scikit-learn':
+            package_import_name = 'sklearn'
         
         if check_package_installed(package_import_name):
             print(f"✅ {package} уже установлен")
@@ -232,6 +237,8 @@ def main():
         print("\nДля запуска:")
         print("• Обработка вакансий: python process_vacancies.py")
         print("• Telegram бот: python main.py")
+        print("• Офлайн-разметка без API: python match_vacancies.py")
+        print("• Обучение классификатора на ответах Qwen: python train_classifier.py")
     else:
         print("⚠️  Установка завершена с предупреждениями")
         print("Необходимо настроить Telegram API в файле meta.py")
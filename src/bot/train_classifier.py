@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Скрипт для обучения классификатора навыков на накопленных ответах Qwen.
+Размеченные вакансии делятся на обучающую и отложенную выборки; на отложенной
+подбирается порог и считается согласие с LLM.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+from labeled_corpus import is_holdout, load_corpus
+from skill_catalog import load_catalog
+from skill_classifier import MODEL_PATH, SkillClassifier
+
+# Ожидаемое число навыков из промта Qwen
+SKILL_RANGES = {"soft": (2, 14), "hard": (10, 30)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Обучение классификатора навыков на ответах Qwen')
+    parser.add_argument('--excel-file', type=str, default='merged_vacs.xlsx',
+                       help='Путь к Excel файлу с вакансиями')
+    parser.add_argument('--labels-dir', type=str, default='process_vacs',
+                       help='Директория с CSV файлами ответов Qwen')
+    parser.add_argument('--model-path', type=str, default=str(MODEL_PATH),
+                       help='Куда сохранить обученную модель')
+    parser.add_argument('--holdout-percent', type=int, default=10,
+                       help='Доля отложенной выборки в процентах (по умолчанию: 10)')
+    parser.add_argument('--min-count', type=int, default=5,
+                       help='Минимальное число примеров навыка для обучения (по умолчанию: 5)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                       help='Количество процессов (по умолчанию: все ядра)')
+
+    args = parser.parse_args()
+
+    # Проверяем существование файлов
+    for path in (args.excel_file, args.labels_dir):
+        if not os.path.exists(path):
+            print(f"Ошибка: {path} не найден")
+            sys.exit(1)
+
+    catalog = load_catalog()
+    corpus = load_corpus(args.excel_file, args.labels_dir, catalog)
+
+    train = [item for item in corpus if not is_holdout(item[0], args.holdout_percent)]
+    holdout = [item for item in corpus if is_holdout(item[0], args.holdout_percent)]
+    print(f"Обучающая выборка: {len(train)}, отложенная: {len(holdout)}")
+
+    if not train or not holdout:
+        print("Недостаточно размеченных вакансий для обучения")
+        sys.exit(1)
+
+    started = time.time()
+    classifier = SkillClassifier.fit(
+        catalog,
+        [description for _, description, _ in train],
+        [labels for _, _, labels in train],
+        skill_ranges=SKILL_RANGES,
+        min_count=args.min_count,
+        n_jobs=args.workers
+    )
+    print(f"Обучено {len(classifier.labels)} навыков за {time.time() - started:.1f} с")
+
+    metrics = classifier.tune_threshold(
+        [description for _, description, _ in holdout],
+        [labels for _, _, labels in holdout]
+    )
+    print(
+        f"Порог: {metrics['threshold']}, согласие с Qwen на отложенной выборке: "
+        f"precision={metrics['precision']:.3f} recall={metrics['recall']:.3f} "
+        f"F1={metrics['f1']:.3f} exact={metrics['exact_match']:.3f}"
+    )
+
+    classifier.save(args.model_path)
+    print(f"Модель сохранена в {args.model_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,169 +1,486 @@
 import pandas as pd
 import requests
-import re
 import csv
+import json
 import os
-from typing import Dict, List, Tuple
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import time
+from requests.adapters import HTTPAdapter
 
+from excel_reader import parse_id
+from html_cleaner import CLEANER_VERSION, clean_html
 from meta import API_URL
+from progress_journal import STATUS_DONE, STATUS_FAILED, ProgressJournal
+from replica_pool import ReplicaPool
+from request_policy import (
+    OVERLOAD_STATUSES,
+    AdaptiveConcurrency,
+    CircuitBreaker,
+    CircuitOpenError,
+    ExtractionError,
+    RetryPolicy
+)
+from vacancy_store import VacancyStore
+
+
+def parse_retry_after(value: str):
+    """Значение заголовка Retry-After в секундах (формат даты не используется сервером)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def open_vacancy_store(excel_file_path: str, store_path: str = None) -> VacancyStore:
+    """Индексированная копия Excel файла с описаниями, очищенными от HTML (рядом с файлом по умолчанию)"""
+    return VacancyStore(
+        store_path or os.path.splitext(excel_file_path)[0] + ".sqlite3",
+        excel_file_path,
+        cleaner=clean_html,
+        cleaner_version=CLEANER_VERSION
+    )
 
 
 class VacancyProcessor:
-    def __init__(self, excel_file_path: str, output_dir: str = "process_vacs"):
+    def __init__(
+        self,
+        excel_file_path: str,
+        output_dir: str = "process_vacs",
+        use_bulk_api: bool = False,
+        store_path: str = None,
+        concurrency: int = 1,
+        retry_policy: RetryPolicy = None,
+        circuit_breaker: CircuitBreaker = None,
+        api_urls: List[str] = None
+    ):
         self.excel_file_path = excel_file_path
         self.output_dir = output_dir
-        self.api_url = API_URL
+        # Реплики сервера извлечения навыков; запрос уходит на наименее загруженную
+        self.replicas = ReplicaPool(api_urls or [API_URL])
+        # Отправлять батч одним запросом к /api/vacancies вместо запроса на каждую вакансию
+        self.use_bulk_api = use_bulk_api
+        # Сколько запросов к API держать одновременно (1 - последовательная обработка)
+        self.concurrency = max(1, concurrency)
+        # Общий пул соединений с keep-alive; размер пула не меньше числа одновременных запросов
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self.replicas.replicas), pool_maxsize=self.concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Повторы, выключатель при серии сбоев и AIMD-лимит запросов в работе
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.limiter = AdaptiveConcurrency(self.concurrency)
+        # Индексированная копия Excel файла; загружается при первом обращении и при изменении файла
+        self.store = open_vacancy_store(excel_file_path, store_path)
         
         # Создаем директорию для выходных файлов
         os.makedirs(output_dir, exist_ok=True)
+        
+        # Журнал прогресса: статус, результат и число попыток каждой вакансии
+        self.journal = ProgressJournal(os.path.join(output_dir, "progress.sqlite3"))
+        imported = self.journal.import_csv_results(output_dir)
+        if imported:
+            print(f"В журнал прогресса перенесено {imported} вакансий из CSV файлов")
     
-    def clean_html(self, text: str) -> str:
-        """Удаляет HTML теги из текста"""
-        if pd.isna(text) or text is None:
-            return ""
+    @staticmethod
+    def clean_html(text: str) -> str:
+        """Удаляет HTML теги из текста (описания в хранилище уже очищены этой функцией)"""
+        return clean_html(text)
+    
+    def wait_until_ready(self, timeout: float = None, poll_interval: float = 10) -> bool:
+        """Ждет, пока хотя бы одна реплика сервера извлечения навыков загрузит и прогреет модель"""
+        started = time.time()
+        while True:
+            for replica in self.replicas.replicas:
+                try:
+                    response = self.replicas.probe(replica, timeout=10)
+                    if response.status_code == 200:
+                        return True
+                    print(f"Сервер {replica.base_url} еще не готов: {response.text}")
+                except requests.RequestException as e:
+                    print(f"Сервер {replica.base_url} недоступен: {e}")
+            
+            if timeout is not None and time.time() - started >= timeout:
+                return False
+            time.sleep(poll_interval)
+    
+    def request_skills(self, description: str, skill_type: str = None) -> Dict[str, List[str]]:
+        """
+        Отправляет POST запрос к API для анализа навыков с повторами по политике запросов
         
-        # Используем BeautifulSoup для более качественной очистки HTML
-        soup = BeautifulSoup(str(text), 'html.parser')
-        cleaned_text = soup.get_text(separator=' ', strip=True)
+        Raises:
+            CircuitOpenError: выключатель разомкнут после серии сбоев
+            ExtractionError: навыки не получены после всех попыток
+        """
+        payload = {"body": description}
         
-        # Дополнительная очистка от лишних пробелов
-        cleaned_text = re.sub(r'\s+', ' ', cleaned_text)
+        # Добавляем параметр skill в body если указан
+        if skill_type:
+            payload["skill"] = skill_type
         
-        return cleaned_text.strip()
+        headers = {"Content-Type": "application/json"}
+        last_error = None
+        
+        for attempt in range(1, self.retry_policy.max_attempts + 1):
+            try:
+                self.circuit_breaker.before_request()
+            except CircuitOpenError as e:
+                e.attempts = attempt - 1
+                raise
+            
+            retry_after = None
+            succeeded = False
+            overloaded = False
+            self.limiter.acquire()
+            replica = self.replicas.acquire()
+            started = time.monotonic()
+            try:
+                response = self.session.post(replica.api_url, json=payload, headers=headers, timeout=60)
+                latency = time.monotonic() - started
+                
+                if response.status_code in OVERLOAD_STATUSES:
+                    # Сервер жив, но перегружен: снижаем нагрузку и ждем не меньше Retry-After
+                    overloaded = True
+                    self.limiter.on_overload(latency)
+                    self.circuit_breaker.release_probe()
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    last_error = f"HTTP {response.status_code}"
+                elif response.status_code >= 500:
+                    self.circuit_breaker.record_failure()
+                    last_error = f"HTTP {response.status_code}: {response.text[:200]}"
+                elif response.status_code >= 400:
+                    # Запрос некорректен - повтор ничего не изменит, реплика при этом исправна
+                    succeeded = True
+                    self.circuit_breaker.record_success()
+                    raise ExtractionError(f"Запрос отклонен: HTTP {response.status_code}: {response.text[:200]}", attempt)
+                else:
+                    result = response.json()
+                    succeeded = True
+                    self.circuit_breaker.record_success()
+                    self.limiter.on_success(latency)
+                    return {
+                        "soft": result.get("soft", []),
+                        "hard": result.get("hard", [])
+                    }
+            except (requests.RequestException, ValueError) as e:
+                if isinstance(e, requests.Timeout):
+                    self.limiter.on_overload(time.monotonic() - started)
+                self.circuit_breaker.record_failure()
+                last_error = str(e)
+            finally:
+                self.replicas.release(replica, succeeded, time.monotonic() - started, overloaded=overloaded)
+                self.limiter.release()
+            
+            if attempt < self.retry_policy.max_attempts:
+                delay = self.retry_policy.delay(attempt, retry_after)
+                print(f"Ошибка API запроса ({last_error}), попытка {attempt}, повтор через {delay:.1f} с")
+                time.sleep(delay)
+        
+        raise ExtractionError(f"Навыки не получены после {self.retry_policy.max_attempts} попыток: {last_error}", self.retry_policy.max_attempts)
     
     def send_api_request(self, description: str, skill_type: str = None) -> Dict[str, List[str]]:
-        """Отправляет POST запрос к API для анализа навыков"""
+        """Отправляет POST запрос к API для анализа навыков (при сбое - пустой результат)"""
         try:
-            payload = {"body": description}
-            
-            # Добавляем параметр skill в body если указан
-            if skill_type:
-                payload["skill"] = skill_type
-                
-            headers = {"Content-Type": "application/json"}
-            
-            response = requests.post(self.api_url, json=payload, headers=headers, timeout=60)
-            response.raise_for_status()
-            
-            result = response.json()
-            return {
-                "soft": result.get("soft", []),
-                "hard": result.get("hard", [])
-            }
-        except requests.RequestException as e:
+            return self.request_skills(description, skill_type)
+        except ExtractionError as e:
             print(f"Ошибка API запроса: {e}")
             return {"soft": [], "hard": []}
-        except Exception as e:
-            print(f"Неожиданная ошибка: {e}")
-            return {"soft": [], "hard": []}
+    
+    def send_bulk_api_request(
+        self,
+        vacancies: List[Tuple[int, str]],
+        skill_type: str = None
+    ) -> Dict[int, Union[Dict[str, List[str]], ExtractionError]]:
+        """
+        Отправляет батч вакансий одним запросом и читает NDJSON-ответ по мере готовности.
+        Повторы, выключатель и лимит запросов - те же, что у request_skills; при повторе
+        отправляются только вакансии, для которых навыки еще не получены.
+        
+        Returns:
+            ID вакансии -> навыки или ошибка (CircuitOpenError - запрос не отправлялся)
+        """
+        results: Dict[int, Union[Dict[str, List[str]], ExtractionError]] = {}
+        # Ошибка последней попытки по каждой вакансии без ответа
+        errors: Dict[int, str] = {}
+        
+        for attempt in range(1, self.retry_policy.max_attempts + 1):
+            pending = [(vacancy_id, description) for vacancy_id, description in vacancies if vacancy_id not in results]
+            if not pending:
+                break
+            
+            try:
+                self.circuit_breaker.before_request()
+            except CircuitOpenError as e:
+                e.attempts = attempt - 1
+                for vacancy_id, _ in pending:
+                    results[vacancy_id] = e
+                return results
+            
+            payload = [{"id": vacancy_id, "body": description} for vacancy_id, description in pending]
+            # Добавляем параметр skill для каждого элемента если указан
+            if skill_type:
+                for item in payload:
+                    item["skill"] = skill_type
+            
+            retry_after = None
+            succeeded = False
+            overloaded = False
+            item_errors: Dict[int, str] = {}
+            self.limiter.acquire()
+            # Реплика считается занятой, пока читается весь потоковый ответ
+            replica = self.replicas.acquire()
+            started = time.monotonic()
+            try:
+                # Таймаут чтения - между соседними строками ответа, а не на весь батч
+                with self.session.post(f"{replica.base_url}/api/vacancies", json=payload, stream=True, timeout=(10, 300)) as response:
+                    if response.status_code in OVERLOAD_STATUSES:
+                        # Очередь реплики заполнена - она исправна, но занята
+                        overloaded = True
+                        self.limiter.on_overload(time.monotonic() - started)
+                        self.circuit_breaker.release_probe()
+                        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                        error = f"HTTP {response.status_code}"
+                    elif response.status_code >= 500:
+                        self.circuit_breaker.record_failure()
+                        error = f"HTTP {response.status_code}: {response.text[:200]}"
+                    elif response.status_code >= 400:
+                        # Запрос некорректен - повтор ничего не изменит, реплика при этом исправна
+                        succeeded = True
+                        self.circuit_breaker.record_success()
+                        rejected = ExtractionError(f"Запрос отклонен: HTTP {response.status_code}: {response.text[:200]}", attempt)
+                        for vacancy_id, _ in pending:
+                            results[vacancy_id] = rejected
+                        return results
+                    else:
+                        for line in response.iter_lines(decode_unicode=True):
+                            if not line:
+                                continue
+                            item = json.loads(line)
+                            if item.get("error"):
+                                print(f"Ошибка обработки вакансии ID={item.get('id')}: {item['error']}")
+                                item_errors[item.get("id")] = item["error"]
+                                continue
+                            results[item["id"]] = {
+                                "soft": item.get("soft", []),
+                                "hard": item.get("hard", [])
+                            }
+                            print(f"Обработана вакансия ID={item['id']} ({len(results)}/{len(vacancies)})")
+                        succeeded = True
+                        self.circuit_breaker.record_success()
+                        error = "нет ответа в bulk API"
+            except (requests.RequestException, ValueError) as e:
+                # Обрыв посреди потока: полученные ответы сохранены, остальные вакансии отправятся повторно
+                if isinstance(e, requests.Timeout):
+                    self.limiter.on_overload(time.monotonic() - started)
+                self.circuit_breaker.record_failure()
+                error = str(e)
+            finally:
+                # Длительность bulk-запроса несравнима с одиночными: в среднюю задержку реплики
+                # и в AIMD-лимит не входит
+                self.replicas.release(replica, succeeded, overloaded=overloaded)
+                self.limiter.release()
+            
+            remaining = [vacancy_id for vacancy_id, _ in pending if vacancy_id not in results]
+            for vacancy_id in remaining:
+                errors[vacancy_id] = item_errors.get(vacancy_id, error)
+            if remaining and attempt < self.retry_policy.max_attempts:
+                delay = self.retry_policy.delay(attempt, retry_after)
+                print(f"Ошибка bulk API запроса ({error}), без ответа {len(remaining)} вакансий, попытка {attempt}, повтор через {delay:.1f} с")
+                time.sleep(delay)
+        
+        attempts = self.retry_policy.max_attempts
+        for vacancy_id, _ in vacancies:
+            if vacancy_id not in results:
+                results[vacancy_id] = ExtractionError(f"Навыки не получены после {attempts} попыток: {errors.get(vacancy_id)}", attempts)
+        return results
+    
+    def iter_vacancy_batches(self, batch_size: int = 100, start_row: int = 0) -> Iterator[Tuple[int, List[Tuple[int, str]]]]:
+        """
+        Читает вакансии батчами за один проход по файлу
+        
+        Yields:
+            (offset, вакансии): offset - номер строки данных после батча, вакансии - (id, очищенное описание)
+        """
+        # Описания очищены при загрузке в хранилище; строки без ID и описания отфильтрованы
+        yield from self.store.iter_batches(batch_size, start_row)
     
     def read_vacancies_batch(self, batch_size: int = 100, start_row: int = 0) -> List[Tuple[int, str]]:
-        """Читает батч вакансий из Excel файла"""
+        """Читает один батч вакансий из Excel файла (для последовательной обработки - iter_vacancy_batches)"""
         try:
-            # Читаем файл, всегда начиная с нужной строки данных (не заголовка)
             # start_row=0 означает первую строку данных (после заголовка)
-            df = pd.read_excel(
-                self.excel_file_path,
-                skiprows=range(1, start_row + 1) if start_row > 0 else None,
-                nrows=batch_size,
-                usecols=['id', 'description'],
-                engine='openpyxl'
-            )
-            
-            vacancies = []
-            for _, row in df.iterrows():
-                vacancy_id = int(row['id']) if pd.notna(row['id']) else None
-                description = self.clean_html(row['description'])
-                
-                if vacancy_id is not None and description:
-                    vacancies.append((vacancy_id, description))
-            
-            return vacancies
+            for _, vacancies in self.iter_vacancy_batches(batch_size, start_row):
+                return vacancies
+            return []
         except Exception as e:
             print(f"Ошибка чтения Excel файла: {e}")
             return []
     
-    def process_batch(self, vacancies: List[Tuple[int, str]], offset: int) -> bool:
-        """Обрабатывает батч вакансий и сохраняет результат в CSV"""
-        results = []
+    def _request_or_error(self, description: str, skill_type: str = None) -> Union[Dict[str, List[str]], ExtractionError]:
+        """Навыки или ошибка, из-за которой они не получены"""
+        try:
+            return self.request_skills(description, skill_type)
+        except ExtractionError as e:
+            return e
+    
+    def send_concurrent_api_requests(
+        self,
+        vacancies: List[Tuple[int, str]],
+        skill_type: str = None,
+        on_result: Callable[[int, Union[Dict[str, List[str]], ExtractionError]], None] = None
+    ) -> List[Union[Dict[str, List[str]], ExtractionError]]:
+        """
+        Отправляет запросы по вакансиям, держа в работе до concurrency запросов; ответы в порядке вакансий
         
-        print(f"Обработка батча до {offset}...")
+        Args:
+            on_result: вызывается с (ID вакансии, результат) сразу по готовности ответа
+        """
+        results = [None] * len(vacancies)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {
+                executor.submit(self._request_or_error, description, skill_type): i
+                for i, (_, description) in enumerate(vacancies)
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                i = futures[future]
+                results[i] = future.result()
+                if on_result is not None:
+                    on_result(vacancies[i][0], results[i])
+                print(f"Обработана вакансия ID={vacancies[i][0]} ({done}/{len(vacancies)})")
+        return results
+    
+    def _record_result(
+        self,
+        vacancy_id: int,
+        skills: Union[Dict[str, List[str]], ExtractionError],
+        offset: int,
+        start_row: int = None
+    ):
+        """Записывает ответ в журнал прогресса; разомкнутый выключатель попыткой не считается"""
+        if isinstance(skills, CircuitOpenError):
+            return
+        if isinstance(skills, ExtractionError):
+            # Сбой не записывается как пустой результат
+            self.journal.record(vacancy_id, offset, error=str(skills), batch_start=start_row)
+        else:
+            self.journal.record(vacancy_id, offset, skills["hard"], skills["soft"], batch_start=start_row)
+    
+    def process_batch(self, vacancies: List[Tuple[int, str]], offset: int, start_row: int = None) -> bool:
+        """
+        Обрабатывает батч вакансий и сохраняет результат в CSV
         
-        for i, (vacancy_id, description) in enumerate(vacancies):
-            print(f"Обработка вакансии ID={vacancy_id} ({i+1}/{len(vacancies)})")
-            
-            # Отправляем запрос к API
-            skills = self.send_api_request(description)
-            
-            # Форматируем навыки как строки, разделенные запятыми
-            hard_skills_str = ",".join(skills["hard"]) if skills["hard"] else ""
-            soft_skills_str = ",".join(skills["soft"]) if skills["soft"] else ""
-            
-            results.append({
-                "id": vacancy_id,
-                "hard_skills": hard_skills_str,
-                "soft_skills": soft_skills_str
-            })
-            
-            # Небольшая пауза между запросами
-            time.sleep(0.1)
+        Каждая вакансия записывается в журнал прогресса сразу после ответа API; уже обработанные
+        (например, до сбоя посреди батча) повторно не отправляются. Если батч [start_row, offset)
+        обработан целиком, точка продолжения сдвигается на offset.
+        """
+        done_ids = self.journal.done_ids(vacancy_id for vacancy_id, _ in vacancies)
+        pending = [(vacancy_id, description) for vacancy_id, description in vacancies if vacancy_id not in done_ids]
         
-        # Сохраняем результаты в CSV
-        output_file = os.path.join(self.output_dir, f"{offset}.csv")
-        try:
-            with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['id', 'hard_skills', 'soft_skills']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(results)
-            
-            print(f"Батч сохранен в {output_file}")
-            return True
-        except Exception as e:
-            print(f"Ошибка сохранения файла {output_file}: {e}")
+        print(f"Обработка батча до {offset}: новых вакансий {len(pending)}, обработано ранее {len(vacancies) - len(pending)}")
+        
+        # В bulk-режиме весь батч уходит одним запросом, в параллельном - несколькими одновременно
+        if pending and self.use_bulk_api:
+            bulk_results = self.send_bulk_api_request(pending)
+            outcomes = [bulk_results[vacancy_id] for vacancy_id, _ in pending]
+            for (vacancy_id, _), skills in zip(pending, outcomes):
+                self._record_result(vacancy_id, skills, offset, start_row)
+        elif pending and self.concurrency > 1:
+            outcomes = self.send_concurrent_api_requests(
+                pending,
+                on_result=lambda vacancy_id, skills: self._record_result(vacancy_id, skills, offset, start_row)
+            )
+        else:
+            outcomes = []
+            for i, (vacancy_id, description) in enumerate(pending):
+                print(f"Обработка вакансии ID={vacancy_id} ({i+1}/{len(pending)})")
+                
+                # Отправляем запрос к API
+                skills = self._request_or_error(description)
+                self._record_result(vacancy_id, skills, offset, start_row)
+                outcomes.append(skills)
+                if isinstance(skills, CircuitOpenError):
+                    break
+                
+                # Небольшая пауза между последовательными запросами
+                time.sleep(0.1)
+        
+        circuit_open = next((skills for skills in outcomes if isinstance(skills, CircuitOpenError)), None)
+        if circuit_open is not None:
+            # Сервер недоступен: полученные ответы уже в журнале, остальные вакансии батча будут обработаны заново
+            print(f"Батч до {offset} прерван: {circuit_open}")
             return False
+        
+        failed = sum(1 for skills in outcomes if isinstance(skills, ExtractionError))
+        if failed:
+            print(f"Навыки не получены для {failed} вакансий, они будут повторены при следующем запуске")
+        elif start_row is not None:
+            self.journal.advance(start_row, offset)
+        
+        print(f"Батч до {offset} сохранен в хранилище результатов")
+        return True
+    
+    def _write_results_csv(self, output_path: str, results: Iterable[Dict[str, str]]) -> int:
+        """Построчно записывает навыки в CSV; возвращает число строк"""
+        written = 0
+        with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=['id', 'hard_skills', 'soft_skills'])
+            writer.writeheader()
+            for row in results:
+                writer.writerow(row)
+                written += 1
+        return written
+    
+    def export_batch_csv(self, row: int) -> Optional[str]:
+        """Выгружает батч, в который попала строка файла row, в {offset}.csv; None - батч еще не обработан"""
+        batch_offset = self.journal.batch_offset_for_row(row)
+        if batch_offset is None:
+            return None
+        output_path = os.path.join(self.output_dir, f"{batch_offset}.csv")
+        self._write_results_csv(output_path, self.journal.iter_results(batch_offset))
+        return output_path
+    
+    def export_batch_csvs(self) -> int:
+        """Выгружает все батчи в прежнем формате {offset}.csv; возвращает число файлов"""
+        batch_offsets = self.journal.batch_offsets()
+        for batch_offset in batch_offsets:
+            self._write_results_csv(
+                os.path.join(self.output_dir, f"{batch_offset}.csv"),
+                self.journal.iter_results(batch_offset)
+            )
+        return len(batch_offsets)
     
     def get_total_rows(self) -> int:
         """Получает общее количество строк в Excel файле"""
         try:
-            # Читаем только колонку id для подсчета строк (экономия памяти)
-            df = pd.read_excel(self.excel_file_path, usecols=['id'], engine='openpyxl')
-            return len(df)
+            return self.store.count()
         except Exception as e:
             print(f"Ошибка получения количества строк: {e}")
             return 0
     
     def get_processed_count(self) -> int:
-        """Возвращает количество обработанных вакансий"""
-        try:
-            csv_files = [f for f in os.listdir(self.output_dir) if f.endswith('.csv')]
-            return len(csv_files) * 100
-        except Exception:
-            return 0
+        """Возвращает количество обработанных вакансий (счетчик журнала прогресса)"""
+        return self.journal.count(STATUS_DONE)
+    
+    def get_failed_count(self) -> int:
+        """Возвращает количество вакансий, навыки для которых не получены из-за сбоев"""
+        return self.journal.count(STATUS_FAILED)
+    
+    def get_resume_row(self) -> int:
+        """Строка файла, с которой продолжать обработку"""
+        return self.journal.resume_row()
     
     def merge_all_csv_files(self, output_filename: str = "merged_results.csv") -> str:
-        """Объединяет все CSV файлы в один"""
+        """Выгружает все результаты из хранилища в один CSV файл"""
         try:
-            csv_files = sorted([f for f in os.listdir(self.output_dir) if f.endswith('.csv')])
-            
-            if not csv_files:
-                return "Нет CSV файлов для объединения"
-            
-            all_data = []
-            for csv_file in csv_files:
-                file_path = os.path.join(self.output_dir, csv_file)
-                df = pd.read_csv(file_path)
-                all_data.append(df)
+            if self.get_processed_count() == 0:
+                return "Нет обработанных вакансий для выгрузки"
             
-            merged_df = pd.concat(all_data, ignore_index=True)
             output_path = os.path.join(self.output_dir, output_filename)
-            merged_df.to_csv(output_path, index=False, encoding='utf-8')
+            written = self._write_results_csv(output_path, self.journal.iter_results())
             
-            return f"Объединено {len(csv_files)} файлов в {output_path}"
+            return f"Выгружено {written} вакансий в {output_path}"
         except Exception as e:
-            return f"Ошибка объединения файлов: {e}"
+            return f"Ошибка выгрузки результатов: {e}"
     
     def merge_with_original(self, original_file: str = None) -> str:
         """Объединяет обработанные данные с оригинальным файлом (только обработанные строки)"""
@@ -171,28 +488,29 @@ class VacancyProcessor:
             if original_file is None:
                 original_file = self.excel_file_path
             
-            # Читаем все обработанные файлы
-            csv_files = [f for f in os.listdir(self.output_dir) if f.endswith('.csv') and not f.startswith('merged')]
-            
-            if not csv_files:
-                return "Нет обработанных файлов для объединения"
-            
-            all_processed = []
-            for csv_file in csv_files:
-                file_path = os.path.join(self.output_dir, csv_file)
-                df = pd.read_csv(file_path)
-                all_processed.append(df)
+            # Все обработанные вакансии из хранилища результатов
+            processed_df = pd.DataFrame(list(self.journal.iter_results()), columns=['id', 'hard_skills', 'soft_skills'])
             
-            processed_df = pd.concat(all_processed, ignore_index=True)
+            if processed_df.empty:
+                return "Нет обработанных вакансий для объединения"
             
             # Получаем уникальные ID обработанных вакансий
             processed_ids = set(processed_df['id'].tolist())
             
-            # Читаем оригинальный файл только для обработанных ID
-            original_df = pd.read_excel(original_file, engine='openpyxl')
-            
-            # Фильтруем оригинальный файл - только обработанные вакансии
-            filtered_original = original_df[original_df['id'].isin(processed_ids)].copy()
+            if original_file == self.excel_file_path:
+                # Только обработанные вакансии - выборка по индексу хранилища
+                original_rows = self.store.get_rows(
+                    vacancy_id for vacancy_id in map(parse_id, processed_ids) if vacancy_id is not None
+                )
+                for row in original_rows:
+                    row['id'] = parse_id(row['id'])
+                filtered_original = pd.DataFrame(original_rows, columns=self.store.columns())
+            else:
+                # Читаем оригинальный файл только для обработанных ID
+                original_df = pd.read_excel(original_file, engine='openpyxl')
+                
+                # Фильтруем оригинальный файл - только обработанные вакансии
+                filtered_original = original_df[original_df['id'].isin(processed_ids)].copy()
             
             # Объединяем по ID
             merged_df = filtered_original.merge(processed_df, on='id', how='inner')
@@ -232,18 +550,16 @@ class VacancyProcessor:
             if empty_rows.empty:
                 return []
             
-            empty_ids = empty_rows['id'].tolist()
-            original_df = pd.read_excel(self.excel_file_path, engine='openpyxl')
-            original_filtered = original_df[original_df['id'].isin(empty_ids)]
+            empty_ids = [int(vacancy_id) for vacancy_id in empty_rows['id'].tolist()]
+            descriptions = self.store.get_descriptions(empty_ids)
             
             result = []
             for _, row in empty_rows.iterrows():
                 vacancy_id = int(row['id'])
                 
-                # Находим описание в оригинальном файле
-                original_row = original_filtered[original_filtered['id'] == vacancy_id]
-                if not original_row.empty:
-                    description = self.clean_html(original_row.iloc[0]['description'])
+                # Находим очищенное описание в хранилище
+                description = descriptions.get(vacancy_id)
+                if description is not None:
                     # Добавляем индекс строки в merged_results.csv для обновления
                     csv_index = df[df['id'] == vacancy_id].index[0]
                     
@@ -267,7 +583,8 @@ class VacancyProcessor:
             if not os.path.exists(merged_file):
                 return False
             
-            df = pd.read_csv(merged_file)
+            # Колонка без единого навыка иначе читается как float и не принимает строку
+            df = pd.read_csv(merged_file, dtype={'hard_skills': str, 'soft_skills': str})
             
             # Обновляем навыки
             hard_skills_str = ",".join(hard_skills) if hard_skills else ""
@@ -279,6 +596,9 @@ class VacancyProcessor:
             # Сохраняем файл
             df.to_csv(merged_file, index=False, encoding='utf-8')
             
+            # Хранилище результатов тоже обновляется, чтобы повторная выгрузка не потеряла дозаполненные навыки
+            self.journal.update_skills(int(df.at[csv_index, 'id']), hard_skills, soft_skills)
+            
             return True
             
         except Exception as e:
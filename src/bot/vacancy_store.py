@@ -0,0 +1,256 @@
+"""
+Локальное хранилище вакансий в SQLite с индексом по ID.
+Excel файл загружается один раз: для каждой строки хранятся исходные значения колонок,
+сырое и уже очищенное от HTML описание. Повторная загрузка выполняется только
+при изменении файла (mtime/размер, затем sha256 содержимого); при смене версии
+очистки описания очищаются заново из сохраненных сырых значений.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from multiprocessing import Pool
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from excel_reader import VacancyExcelReader, parse_id
+
+STORE_FORMAT = "1"
+
+# Размер пачки ID в запросах вида "WHERE id IN (...)"
+LOOKUP_CHUNK_SIZE = 500
+
+# Сколько описаний воркер очищает за одно задание пула
+CLEAN_CHUNK_SIZE = 256
+
+# Функция очистки описания в процессах-воркерах загрузки
+_cleaner: Optional[Callable[[Any], str]] = None
+
+
+def _init_ingest_worker(cleaner: Callable[[Any], str]):
+    global _cleaner
+    _cleaner = cleaner
+
+
+def _prepare_row(args: Tuple[int, Tuple[Any, ...], int, int, Tuple[str, ...]]) -> Tuple[int, Optional[int], Optional[str], str, str]:
+    """Строка Excel -> запись хранилища (очистка HTML выполняется в воркере)"""
+    row_index, values, id_position, description_position, columns = args
+    raw_description = values[description_position]
+    raw_description = str(raw_description) if raw_description is not None else None
+    row_data = json.dumps(dict(zip(columns, values)), ensure_ascii=False, default=str)
+    return row_index, parse_id(values[id_position]), raw_description, _cleaner(raw_description), row_data
+
+
+def _clean_row(args: Tuple[int, Optional[str]]) -> Tuple[str, int]:
+    """(номер строки, сырое описание) -> (очищенное описание, номер строки) для UPDATE"""
+    row_index, raw_description = args
+    return _cleaner(raw_description), row_index
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class VacancyStore:
+    def __init__(
+        self,
+        db_path: str,
+        excel_file_path: str,
+        cleaner: Callable[[Any], str],
+        cleaner_version: str = "1",
+        workers: int = None
+    ):
+        """
+        Args:
+            db_path: путь к файлу SQLite
+            excel_file_path: исходный Excel файл с вакансиями
+            cleaner: функция очистки описания от HTML (должна сериализоваться для multiprocessing)
+            cleaner_version: версия очистки; при ее смене описания очищаются заново
+            workers: число процессов для очистки описаний
+        """
+        self.db_path = db_path
+        self.excel_file_path = excel_file_path
+        self.cleaner = cleaner
+        self.cleaner_version = cleaner_version
+        self.workers = workers or os.cpu_count()
+        self._lock = threading.Lock()
+        self._ingest_lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS vacancies ("
+            "row_index INTEGER PRIMARY KEY, id INTEGER, description TEXT, "
+            "cleaned TEXT NOT NULL, row_data TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS vacancies_id ON vacancies (id)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._db.commit()
+
+    def _meta(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._db.execute("SELECT key, value FROM meta").fetchall())
+
+    def _write_meta(self, values: Dict[str, str]):
+        self._db.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", list(values.items()))
+
+    def ensure_current(self):
+        """Загружает Excel файл в хранилище, если он изменился с прошлой загрузки"""
+        with self._ingest_lock:
+            stat = os.stat(self.excel_file_path)
+            signature = f"{stat.st_mtime_ns}:{stat.st_size}"
+            meta = self._meta()
+            if meta.get("format") != STORE_FORMAT or meta.get("signature") != signature:
+                # Файл тронут, но содержимое то же (копирование, touch) - загружать заново не нужно
+                digest = file_sha256(self.excel_file_path)
+                if meta.get("format") != STORE_FORMAT or meta.get("sha256") != digest:
+                    self._ingest(signature, digest)
+                    return
+                with self._lock:
+                    self._write_meta({"signature": signature})
+                    self._db.commit()
+
+            if meta.get("cleaner") != self.cleaner_version:
+                self._reclean()
+
+    def _ingest(self, signature: str, digest: str):
+        print(f"Загрузка {self.excel_file_path} в хранилище {self.db_path}...")
+        started = time.time()
+
+        with VacancyExcelReader(self.excel_file_path, columns=None) as reader:
+            columns = reader.columns
+            if "id" not in columns or "description" not in columns:
+                raise ValueError(f"В файле {self.excel_file_path} нет колонок id и description")
+            id_position = columns.index("id")
+            description_position = columns.index("description")
+            tasks = (
+                (row_index, values, id_position, description_position, columns)
+                for row_index, values in reader.iter_rows()
+            )
+
+            total_rows = 0
+            with Pool(self.workers, initializer=_init_ingest_worker, initargs=(self.cleaner,)) as pool, self._lock:
+                try:
+                    self._db.execute("DELETE FROM vacancies")
+                    batch = []
+                    for record in pool.imap(_prepare_row, tasks, chunksize=CLEAN_CHUNK_SIZE):
+                        batch.append(record)
+                        if len(batch) >= 1000:
+                            self._insert(batch)
+                            total_rows += len(batch)
+                            batch = []
+                            print(f"Загружено строк: {total_rows}")
+                    self._insert(batch)
+                    total_rows += len(batch)
+
+                    self._write_meta({
+                        "format": STORE_FORMAT,
+                        "signature": signature,
+                        "sha256": digest,
+                        "cleaner": self.cleaner_version,
+                        "total_rows": str(total_rows),
+                        "columns": json.dumps(list(columns), ensure_ascii=False)
+                    })
+                    self._db.commit()
+                except Exception:
+                    # Неполная загрузка не должна выглядеть актуальной
+                    self._db.rollback()
+                    raise
+
+        print(f"Загружено {total_rows} строк за {time.time() - started:.1f} с")
+
+    def _reclean(self):
+        """Очищает сохраненные сырые описания новой версией очистки без повторного чтения Excel"""
+        print(f"Очистка описаний в хранилище {self.db_path} (версия {self.cleaner_version})...")
+        started = time.time()
+
+        with self._lock:
+            rows = self._db.execute("SELECT row_index, description FROM vacancies ORDER BY row_index").fetchall()
+
+        with Pool(self.workers, initializer=_init_ingest_worker, initargs=(self.cleaner,)) as pool, self._lock:
+            try:
+                self._db.executemany(
+                    "UPDATE vacancies SET cleaned = ? WHERE row_index = ?",
+                    pool.imap(_clean_row, rows, chunksize=CLEAN_CHUNK_SIZE)
+                )
+                self._write_meta({"cleaner": self.cleaner_version})
+                self._db.commit()
+            except Exception:
+                self._db.rollback()
+                raise
+
+        print(f"Очищено {len(rows)} описаний за {time.time() - started:.1f} с")
+
+    def _insert(self, records: List[Tuple]):
+        self._db.executemany(
+            "INSERT INTO vacancies (row_index, id, description, cleaned, row_data) VALUES (?, ?, ?, ?, ?)",
+            records
+        )
+
+    def count(self) -> int:
+        """Количество строк данных в файле"""
+        self.ensure_current()
+        return int(self._meta().get("total_rows", 0))
+
+    def columns(self) -> List[str]:
+        """Колонки исходного файла в исходном порядке"""
+        self.ensure_current()
+        return json.loads(self._meta().get("columns", "[]"))
+
+    def iter_batches(self, batch_size: int, start_row: int = 0) -> Iterator[Tuple[int, List[Tuple[int, str]]]]:
+        """
+        Батчи строк [start, start + batch_size) по номеру строки файла
+
+        Yields:
+            (offset, вакансии): offset - номер строки данных после батча, вакансии - (id, очищенное описание)
+        """
+        total_rows = self.count()
+        start = start_row
+        while start < total_rows:
+            end = min(start + batch_size, total_rows)
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT id, cleaned FROM vacancies "
+                    "WHERE row_index >= ? AND row_index < ? AND id IS NOT NULL AND cleaned != '' "
+                    "ORDER BY row_index",
+                    (start, end)
+                ).fetchall()
+            yield end, rows
+            start = end
+
+    def _lookup(self, query: str, ids: Iterable[int]) -> List[Tuple]:
+        ids = list(dict.fromkeys(int(vacancy_id) for vacancy_id in ids))
+        rows = []
+        with self._lock:
+            for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+                chunk = ids[start:start + LOOKUP_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows.extend(self._db.execute(query.format(placeholders=placeholders), chunk).fetchall())
+        return rows
+
+    def get_descriptions(self, ids: Iterable[int]) -> Dict[int, str]:
+        """Очищенные описания по ID (при повторе ID берется первая строка файла)"""
+        self.ensure_current()
+        rows = self._lookup(
+            "SELECT id, cleaned FROM vacancies WHERE id IN ({placeholders}) ORDER BY row_index DESC",
+            ids
+        )
+        return {vacancy_id: cleaned for vacancy_id, cleaned in rows}
+
+    def get_rows(self, ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Исходные строки файла с заданными ID в порядке файла"""
+        self.ensure_current()
+        rows = self._lookup(
+            "SELECT row_index, row_data FROM vacancies WHERE id IN ({placeholders})",
+            ids
+        )
+        rows.sort()
+        return [json.loads(row_data) for _, row_data in rows]
@@ -43,7 +43,7 @@ def main():
     print(f"📂 Переходим в: {api_dir}")
     print("🌐 Запускаем сервер на http://localhost:6381")
     print("📖 Документация доступна на http://localhost:6381/docs")
-    print("⚠️  Первый запрос может занять время (загрузка модели)")
+    print("⚠️  Модель загружается и прогревается при старте, готовность: http://localhost:6381/ready")
     print("\n" + "="*60 + "\n")
     
     try:
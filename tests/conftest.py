@@ -0,0 +1,14 @@
+"""
+Модули src/ai и src/bot импортируют соседей плоско (как при запуске из своей папки),
+поэтому обе папки добавляются в sys.path.
+"""
+
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+for directory in ("ai", "bot"):
+    path = str(SRC_DIR / directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,52 @@
+import random
+
+from aho_corasick import AhoCorasick
+
+
+def naive_matches(patterns, text):
+    """Все вхождения перебором - эталон для автомата"""
+    found = set()
+    for index, pattern in enumerate(patterns):
+        if not pattern:
+            continue
+        for start in range(len(text) - len(pattern) + 1):
+            if text[start:start + len(pattern)] == pattern:
+                found.add((index, start, start + len(pattern)))
+    return found
+
+
+def test_finds_overlapping_and_nested_patterns():
+    patterns = ["he", "she", "his", "hers"]
+    automaton = AhoCorasick(patterns)
+
+    assert set(automaton.iter_matches("ushers")) == {(1, 1, 4), (0, 2, 4), (3, 2, 6)}
+
+
+def test_matches_brute_force_on_random_texts():
+    rng = random.Random(0)
+    patterns = ["".join(rng.choice("ab") for _ in range(rng.randint(1, 4))) for _ in range(20)]
+    automaton = AhoCorasick(patterns)
+
+    for _ in range(200):
+        text = "".join(rng.choice("abc") for _ in range(rng.randint(0, 30)))
+        assert set(automaton.iter_matches(text)) == naive_matches(patterns, text)
+
+
+def test_duplicate_patterns_report_every_index():
+    automaton = AhoCorasick(["sql", "sql"])
+
+    assert sorted(automaton.iter_matches("t-sql")) == [(0, 2, 5), (1, 2, 5)]
+
+
+def test_token_tuples_and_empty_patterns():
+    patterns = [("управлен", "проект"), (), ("проект",)]
+    automaton = AhoCorasick(patterns)
+
+    matches = list(automaton.iter_matches(("опыт", "управлен", "проект")))
+
+    assert sorted(matches) == [(0, 1, 3), (2, 2, 3)]
+    assert len(automaton) == 3
+
+
+def test_no_patterns():
+    assert list(AhoCorasick([]).iter_matches("text")) == []
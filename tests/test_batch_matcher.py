@@ -0,0 +1,54 @@
+import pytest
+
+from batch_matcher import BatchSkillMatcher
+from keyword_extractor import SimpleSkillExtractor
+from skill_catalog import SkillCatalog
+
+DESCRIPTIONS = [
+    "Опыт работы с Python и SQL, работа в команде, коммуникабельность",
+    "Требуется водитель категории D, ответственность и пунктуальность",
+    "Управление проектами, ведение переговоров с клиентами",
+    "",
+]
+
+
+@pytest.fixture
+def catalog():
+    return SkillCatalog(
+        {
+            "soft": ["работа в команде", "работать в команде", "ответственность", "ведение переговоров"],
+            "hard": ["Python", "SQL", "управление проектами", "Java"]
+        },
+        version="test"
+    )
+
+
+def test_matches_word_forms_in_catalog_order(catalog):
+    results = BatchSkillMatcher(catalog).match_block(DESCRIPTIONS)
+
+    assert results == [
+        {"soft": ["работа в команде", "работать в команде"], "hard": ["Python", "SQL"]},
+        {"soft": ["ответственность"], "hard": []},
+        {"soft": ["ведение переговоров"], "hard": ["управление проектами"]},
+        {"soft": [], "hard": []},
+    ]
+
+
+def test_skill_type_and_limit(catalog):
+    matcher = BatchSkillMatcher(catalog, limit=1)
+
+    assert matcher.match_block(DESCRIPTIONS[:1], "hard") == [{"soft": [], "hard": ["Python"]}]
+    assert matcher.match_block(DESCRIPTIONS[:1], "soft") == [{"soft": ["работа в команде"], "hard": []}]
+
+
+def test_repeated_mentions_count_once(catalog):
+    results = BatchSkillMatcher(catalog).match_block(["Python, Python и снова Python"])
+
+    assert results == [{"soft": [], "hard": ["Python"]}]
+
+
+def test_same_result_as_keyword_extractor():
+    extractor = SimpleSkillExtractor(match_mode="morph")
+    matcher = BatchSkillMatcher(extractor.catalog)
+
+    assert matcher.match_block(DESCRIPTIONS) == [extractor.extract_skills(description) for description in DESCRIPTIONS]
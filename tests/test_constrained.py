@@ -0,0 +1,95 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from constrained import CatalogGrammar  # noqa: E402
+
+EOS = 0
+
+
+class CharTokenizer:
+    """Токен - код символа: путь по дереву совпадает с текстом ответа"""
+
+    eos_token_id = EOS
+
+    def __call__(self, text, add_special_tokens=False):
+        if isinstance(text, list):
+            return SimpleNamespace(input_ids=[[ord(char) for char in item] for item in text])
+        return SimpleNamespace(input_ids=[ord(char) for char in text])
+
+
+def make_grammar(soft=("Коммуникабельность",), hard=("SQL", "SQL Server", "Python"), max_soft=3, max_hard=3):
+    return CatalogGrammar(CharTokenizer(), list(soft), list(hard), max_soft, max_hard)
+
+
+def feed(grammar, state, text):
+    """Продвигает состояние по тексту, проверяя, что каждый токен разрешен"""
+    for char in text:
+        assert ord(char) in grammar.allowed_tokens(state), f"токен {char!r} запрещен"
+        grammar.advance(state, ord(char))
+
+
+def test_accepts_catalog_answer_and_ends_with_eos():
+    grammar = make_grammar()
+    state = grammar.initial_state()
+
+    feed(grammar, state, '{"soft": ["Коммуникабельность"], "hard": ["SQL Server", "Python"]}')
+
+    assert grammar.allowed_tokens(state) == [EOS]
+
+
+def test_accepts_empty_lists():
+    grammar = make_grammar()
+    state = grammar.initial_state()
+
+    feed(grammar, state, '{"soft": [], "hard": []}')
+
+    assert grammar.allowed_tokens(state) == [EOS]
+
+
+def test_only_catalog_skills_are_allowed():
+    grammar = make_grammar()
+    state = grammar.initial_state()
+    feed(grammar, state, '{"soft": [], "hard": ["SQ')
+
+    assert grammar.allowed_tokens(state) == [ord("L")]
+
+    # Навык, которого нет в каталоге, обрывает ответ
+    grammar.advance(state, ord("X"))
+    assert grammar.allowed_tokens(state) == [EOS]
+
+
+def test_prefix_skill_can_be_finished_or_extended():
+    grammar = make_grammar()
+    state = grammar.initial_state()
+    feed(grammar, state, '{"soft": [], "hard": ["SQL')
+
+    assert set(grammar.allowed_tokens(state)) == {ord('"'), ord(" ")}
+
+
+def test_repeated_skill_in_dead_end_is_closed():
+    grammar = make_grammar()
+    state = grammar.initial_state()
+    feed(grammar, state, '{"soft": [], "hard": ["Python", "Python"')
+
+    # Тупиковый повтор не блокирует ответ - дубликат уберет валидация
+    assert set(grammar.allowed_tokens(state)) == {ord(","), ord("]")}
+
+
+def test_item_limit_closes_the_list():
+    grammar = make_grammar(max_hard=2)
+    state = grammar.initial_state()
+    feed(grammar, state, '{"soft": [], "hard": ["SQL", "Python"')
+
+    assert grammar.allowed_tokens(state) == [ord("]")]
+
+
+def test_empty_kind_allows_only_an_empty_list():
+    grammar = make_grammar(soft=())
+    state = grammar.initial_state()
+    feed(grammar, state, '{"soft": [')
+
+    assert grammar.allowed_tokens(state) == [ord("]")]
@@ -0,0 +1,53 @@
+import pytest
+
+from html_cleaner import clean_html
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("<p>Опыт <b>Python</b></p><ul><li>SQL</li></ul>", "Опыт Python SQL"),
+        ("a<br/>b", "a b"),
+        ("<p>a</p\n>b", "a b"),
+        ("<a href=x>link</a> &amp; more", "link & more"),
+        ("<!DOCTYPE html><p>q</p>", "q"),
+        ("<?xml version='1.0'?>z", "z"),
+        ("до<!-- комментарий -->после", "до после"),
+        ("<script>var a = '<p>';</script>текст<style>p {}</style>", "текст"),
+    ]
+)
+def test_strips_markup(text, expected):
+    assert clean_html(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        # Одиночный "<" без закрывающего ">" - текст, а не начало тега
+        ("x<y", "x<y"),
+        ("a <b c", "a <b c"),
+        ("1 < 2 > 0", "1 < 2 > 0"),
+        # ">" внутри значения атрибута не закрывает тег
+        ('<p title="a>b">t</p>', "t"),
+        ("<p title='a>b'>t</p>", "t"),
+        # Содержимое CDATA - текст
+        ("<![CDATA[x]]>y", "x y"),
+    ]
+)
+def test_matches_html_parser_on_edge_cases(text, expected):
+    assert clean_html(text) == expected
+
+
+@pytest.mark.parametrize("value", [None, float("nan"), ""])
+def test_empty_values(value):
+    assert clean_html(value) == ""
+
+
+def test_collapses_whitespace_and_unescapes_entities():
+    assert clean_html("  a\n\t&nbsp;b&lt;c  ") == "a b<c"
+
+
+def test_unterminated_quote_does_not_backtrack():
+    # Незакрытая кавычка в длинном теге не должна приводить к экспоненциальному перебору
+    text = "<p " + '"a' * 20000
+    assert clean_html(text).startswith("<p")
@@ -0,0 +1,54 @@
+import pytest
+
+from morphology import MorphologyIndex, normalize_word, stem_russian, tokenize
+
+
+@pytest.mark.parametrize(
+    "word, stem",
+    [
+        ("переговоров", "переговор"),
+        ("аналитического", "аналитическ"),
+        ("управлением", "управлен"),
+        ("ответственность", "ответствен"),
+        ("красивейший", "красив"),
+        ("ёлка", "елк"),
+    ]
+)
+def test_stem_russian(word, stem):
+    assert stem_russian(word) == stem
+
+
+@pytest.mark.parametrize(
+    "forms",
+    [
+        ("работа", "работы", "работе", "работать"),
+        ("управление", "управления", "управлением"),
+        ("ответственность", "ответственный"),
+    ]
+)
+def test_word_forms_share_normal_form(forms):
+    assert len({normalize_word(form) for form in forms}) == 1
+
+
+def test_latin_and_digits_are_kept():
+    assert normalize_word("python") == "python"
+    assert normalize_word("c++") == "c++"
+    assert normalize_word("2024") == "2024"
+
+
+def test_tokenize_drops_stop_words_and_keeps_positions():
+    text = "Опыт работы с Python и C++"
+    tokens = tokenize(text)
+
+    assert [token.stem for token in tokens][1:] == ["работ", "python", "c++"]
+    assert [text[token.start:token.end] for token in tokens] == ["Опыт", "работы", "Python", "C++"]
+
+
+def test_index_matches_word_forms_on_word_boundaries():
+    index = MorphologyIndex(["управление проектами", "Python", "работа в команде", "SQL"])
+
+    matches = index.match("Опыт управления проектом и работы в команде на Python, знание MySQL")
+
+    assert sorted(skill for skill, _, _ in matches) == [0, 1, 2]
+    start, end = next((start, end) for skill, start, end in matches if skill == 0)
+    assert "Опыт управления проектом и работы в команде на Python, знание MySQL"[start:end] == "управления проектом"
@@ -0,0 +1,126 @@
+import csv
+import sqlite3
+
+import pytest
+
+from progress_journal import STATUS_DONE, STATUS_FAILED, ProgressJournal
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return ProgressJournal(str(tmp_path / "progress.sqlite3"))
+
+
+def write_batch_csv(directory, offset, ids):
+    with open(directory / f"{offset}.csv", "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=["id", "hard_skills", "soft_skills"])
+        writer.writeheader()
+        writer.writerows({"id": vacancy_id, "hard_skills": "SQL", "soft_skills": ""} for vacancy_id in ids)
+
+
+def test_counters_follow_status_changes(journal):
+    journal.record(1, 100, ["SQL"], [])
+    journal.record(2, 100, error="timeout")
+    journal.record(3, 100, error="timeout")
+    assert (journal.count(STATUS_DONE), journal.count(STATUS_FAILED)) == (1, 2)
+
+    # Повтор сбойной вакансии переводит ее в done
+    journal.record(2, 100, ["Python"], ["коммуникабельность"])
+    assert (journal.count(STATUS_DONE), journal.count(STATUS_FAILED)) == (2, 1)
+
+    # Повторный сбой той же вакансии не меняет счетчиков
+    journal.record(3, 100, error="timeout")
+    assert (journal.count(STATUS_DONE), journal.count(STATUS_FAILED)) == (2, 1)
+
+
+def test_done_result_is_not_overwritten(journal):
+    journal.record(1, 100, ["SQL"], ["ответственность"])
+    journal.record(1, 200, error="timeout")
+    journal.record(1, 200, ["Java"], [])
+
+    assert journal.get_result(1) == {"id": 1, "hard_skills": "SQL", "soft_skills": "ответственность"}
+    assert journal.count(STATUS_FAILED) == 0
+    assert journal.batch_offsets() == [100]
+
+
+def test_done_ids_and_results_keep_order(journal):
+    journal.record(5, 100, ["SQL"], [])
+    journal.record(3, 100, ["Python"], [])
+    journal.record(4, 100, error="timeout")
+
+    assert journal.done_ids([3, 4, 5, 6]) == {3, 5}
+    assert [row["id"] for row in journal.results([5, 4, 3])] == [5, 3]
+
+
+def test_advance_only_extends_contiguous_progress(journal):
+    journal.advance(0, 100)
+    journal.advance(200, 300)  # батч [100, 200) еще не обработан
+    assert journal.resume_row() == 100
+
+    journal.advance(100, 200)
+    journal.advance(200, 300)
+    assert journal.resume_row() == 300
+
+
+def test_resume_survives_reopen(tmp_path):
+    path = str(tmp_path / "progress.sqlite3")
+    journal = ProgressJournal(path)
+    journal.record(1, 100, ["SQL"], [])
+    journal.advance(0, 100)
+
+    reopened = ProgressJournal(path)
+    assert reopened.resume_row() == 100
+    assert reopened.count() == 1
+    assert reopened.done_ids([1]) == {1}
+
+
+def test_iter_results_pages_in_batch_order(journal, monkeypatch):
+    monkeypatch.setattr("progress_journal.EXPORT_PAGE_SIZE", 2)
+    for vacancy_id, offset in [(7, 200), (2, 100), (9, 100), (1, 200), (4, 100)]:
+        journal.record(vacancy_id, offset, ["SQL"], [])
+
+    assert [row["id"] for row in journal.iter_results()] == [2, 4, 9, 1, 7]
+    assert [row["id"] for row in journal.iter_results(200)] == [1, 7]
+
+
+def test_batch_offset_for_row_skips_gaps(journal):
+    journal.record(1, 100, ["SQL"], [], batch_start=0)
+    # Батч [100, 200) не обрабатывался, следующий запуск продолжил со строки 200
+    journal.record(2, 300, ["SQL"], [], batch_start=200)
+
+    assert journal.batch_offset_for_row(0) == 100
+    assert journal.batch_offset_for_row(99) == 100
+    assert journal.batch_offset_for_row(150) is None
+    assert journal.batch_offset_for_row(250) == 300
+    assert journal.batch_offset_for_row(300) is None
+
+
+def test_import_csv_sets_contiguous_resume_row(journal, tmp_path):
+    output_dir = tmp_path / "process_vacs"
+    output_dir.mkdir()
+    # Старый скрипт: батч {offset}.csv из n вакансий начинался со строки offset - n
+    write_batch_csv(output_dir, 100, range(0, 100))
+    write_batch_csv(output_dir, 198, range(100, 198))
+    write_batch_csv(output_dir, 400, range(300, 400))  # перед ним пропуск
+
+    assert journal.import_csv_results(str(output_dir)) == 298
+    assert journal.resume_row() == 198
+    assert journal.batch_offset_for_row(250) is None
+    assert journal.batch_offset_for_row(350) == 400
+    assert journal.count() == 298
+
+    # Импорт выполняется один раз
+    assert journal.import_csv_results(str(output_dir)) == 0
+
+
+def test_read_only_journal_does_not_write(tmp_path):
+    path = str(tmp_path / "progress.sqlite3")
+    journal = ProgressJournal(path)
+    journal.record(1, 100, ["SQL"], [], batch_start=0)
+    journal.advance(0, 100)
+
+    reader = ProgressJournal(path, read_only=True)
+    assert [row["id"] for row in reader.iter_results()] == [1]
+    assert reader.resume_row() == 100
+    with pytest.raises(sqlite3.OperationalError):
+        reader.advance(100, 200)
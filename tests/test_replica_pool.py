@@ -0,0 +1,44 @@
+from replica_pool import ReplicaPool
+
+
+def release(pool, replica, *args, **kwargs):
+    # acquire не вызывается, чтобы не запускать фоновый опрос реплик
+    replica.outstanding += 1
+    pool.release(replica, *args, **kwargs)
+
+
+def test_overload_does_not_eject():
+    pool = ReplicaPool(["http://replica-1/api/vacancy"], max_consecutive_failures=3)
+    replica = pool.replicas[0]
+
+    for _ in range(10):
+        release(pool, replica, False, 0.5, overloaded=True)
+
+    assert not replica.ejected
+    assert (replica.failed, replica.consecutive_failures, replica.avg_latency) == (0, 0, None)
+    assert replica.outstanding == 0
+
+
+def test_consecutive_failures_eject():
+    pool = ReplicaPool(["http://replica-1/api/vacancy"], max_consecutive_failures=3)
+    replica = pool.replicas[0]
+
+    release(pool, replica, False)
+    release(pool, replica, False)
+    release(pool, replica, True, 1.0)
+    release(pool, replica, False)
+    release(pool, replica, False)
+    assert not replica.ejected
+
+    release(pool, replica, False)
+    assert replica.ejected
+
+
+def test_slow_replica_is_ejected():
+    pool = ReplicaPool(["http://replica-1/api/vacancy", "http://replica-2/api/vacancy"], slow_factor=3.0)
+    fast, slow = pool.replicas
+
+    release(pool, fast, True, 1.0)
+    release(pool, slow, True, 10.0)
+
+    assert slow.ejected and not fast.ejected
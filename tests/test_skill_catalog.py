@@ -0,0 +1,22 @@
+from skill_catalog import SKILLS_DIR, SkillCatalog
+
+
+def test_snapshot_is_reused_and_written_atomically(tmp_path):
+    snapshot = tmp_path / "catalog.snapshot.pkl"
+
+    built = SkillCatalog.load(SKILLS_DIR, snapshot)
+    loaded = SkillCatalog.load(SKILLS_DIR, snapshot)
+
+    assert loaded.version == built.version
+    assert loaded.skills == built.skills
+    # Временный файл записи подменен снимком
+    assert [path.name for path in tmp_path.iterdir()] == ["catalog.snapshot.pkl"]
+
+
+def test_truncated_snapshot_is_rebuilt(tmp_path):
+    snapshot = tmp_path / "catalog.snapshot.pkl"
+    version = SkillCatalog.load(SKILLS_DIR, snapshot).version
+    snapshot.write_bytes(snapshot.read_bytes()[:20])
+
+    assert SkillCatalog.load(SKILLS_DIR, snapshot).version == version
+    assert SkillCatalog.load(SKILLS_DIR, snapshot).version == version
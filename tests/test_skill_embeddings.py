@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from skill_catalog import SkillCatalog  # noqa: E402
+from skill_embeddings import SkillEmbeddingIndex  # noqa: E402
+
+
+@pytest.fixture
+def index():
+    # Повтор "лидерство" в каталоге - как в реальном soft.txt
+    catalog = SkillCatalog({"soft": ["лидерство", "общение", "лидерство"], "hard": ["SQL"]}, version="test")
+    matrix = np.array([[1.0, 0.0], [0.0, 1.0], [0.9, 0.1], [0.6, 0.8]])
+    return SkillEmbeddingIndex(catalog, matrix)
+
+
+def test_top_k_orders_by_best_chunk_and_skips_duplicates(index):
+    chunks = np.array([[1.0, 0.0], [0.0, 0.7]])
+
+    assert index.top_k(chunks, "soft", 3, 0.0) == [("лидерство", 1.0), ("общение", 0.7)]
+
+
+def test_top_k_threshold_and_kind_range(index):
+    chunks = np.array([[0.0, 1.0]])
+
+    assert index.top_k(chunks, "soft", 3, 0.5) == [("общение", 1.0)]
+    assert index.top_k(chunks, "hard", 3, 0.0) == [("SQL", 0.8)]
+    assert index.top_k(np.zeros((0, 2)), "soft", 3, 0.0) == []